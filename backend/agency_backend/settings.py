@@ -67,13 +67,19 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'api.seo_files_middleware.SEOFilesMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'api.redirect_middleware.RedirectMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
+    'api.cache_middleware.ResponseCacheMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.seo_middleware.SEOMiddleware',
 ]
 
 ROOT_URLCONF = 'agency_backend.urls'
@@ -122,6 +128,86 @@ if 'test' in sys.argv:
     }
 
 
+# Cache
+# Process-local by default. Point CACHE_BACKEND/CACHE_LOCATION at a shared backend
+# (e.g. django.core.cache.backends.redis.RedisCache) when running several workers,
+# so that invalidations made by one worker are seen by the others.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='agency-backend'),
+    }
+}
+
+# Response cache for anonymous API GETs (see api/cache_middleware.py)
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+RESPONSE_CACHE_PREFIXES = ['/api/']
+RESPONSE_CACHE_EXCLUDE = [
+    '/api/health/',
+    '/api/auth/',
+    '/api/meetings/',
+    '/api/dashboard/',
+]
+
+# Rendered JSON of list rows, reused until the row changes (see api/fragments.py)
+FRAGMENT_CACHE_ENABLED = config('FRAGMENT_CACHE_ENABLED', default=True, cast=bool)
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+# Brotli/gzip encoding of API JSON responses of at least COMPRESSION_MIN_SIZE bytes
+# (see api/compression.py; brotli needs the optional brotli package)
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CONTENT_TYPES = ['application/json']
+
+# Cache-Control policies for content endpoints, keyed by URL name (see api/conditional.py).
+# Responses carry ETag/Last-Modified, so clients revalidate cheaply once max-age expires.
+API_CACHE_CONTROL = {
+    'default': {'public': True, 'max_age': 60},
+    'homepage_data': {'public': True, 'max_age': 300, 'stale_while_revalidate': 600},
+    'frontend_content': {'public': True, 'max_age': 300, 'stale_while_revalidate': 600},
+    'footer_data': {'public': True, 'max_age': 300, 'stale_while_revalidate': 600},
+    'search': {'public': True, 'max_age': 30},
+    'sitemap_xml': {'public': True, 'max_age': 60 * 60},
+    'sitemap_xml_gz': {'public': True, 'max_age': 60 * 60},
+    'sitemap_section': {'public': True, 'max_age': 60 * 60},
+    'sitemap_section_gz': {'public': True, 'max_age': 60 * 60},
+    'robots_txt': {'public': True, 'max_age': 60 * 60 * 24},
+}
+
+# Page view beacons are summed in memory and written every ANALYTICS_FLUSH_INTERVAL seconds,
+# or once ANALYTICS_MAX_PENDING beacons are waiting (see api/analytics.py)
+ANALYTICS_FLUSH_INTERVAL = 10
+ANALYTICS_MAX_PENDING = 10000
+ANALYTICS_FLUSH_ASYNC = 'test' not in sys.argv
+
+# View, vote and hit counters are buffered in memory and added with F() updates (see api/counters.py)
+COUNTERS_FLUSH_INTERVAL = 5
+COUNTERS_MAX_PENDING = 10000
+COUNTERS_FLUSH_ASYNC = 'test' not in sys.argv
+
+# Seconds a visitor's "helpful" vote on a help article is remembered, so repeats are not counted
+HELP_VOTE_DEDUP_TIMEOUT = 60 * 60 * 24
+
+# Seconds the dashboard counts are reused before being recomputed (see api/dashboard_metrics.py)
+DASHBOARD_METRICS_TTL = 30
+
+# Rebuild the homepage snapshot on a background thread after content changes (see api/snapshots.py)
+HOMEPAGE_SNAPSHOT_ASYNC = 'test' not in sys.argv
+
+# Seconds between checks for feature flag changes made by other processes (see api/feature_flags.py)
+FEATURE_FLAGS_REFRESH_INTERVAL = 1.0
+
+# URLs per sitemap shard; 50,000 is the limit of the sitemap protocol (see api/sitemaps.py)
+SITEMAP_SHARD_SIZE = 50000
+
+# Paths that never render SEO meta tags get no request.seo_context (see api/seo_middleware.py)
+SEO_CONTEXT_EXCLUDE = ['/api/', '/static/', '/media/', '/admin/']
+
+# Seconds between checks for redirect rule changes made by other processes (see api/redirects.py)
+REDIRECTS_REFRESH_INTERVAL = 1.0
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -174,6 +260,12 @@ if not DEBUG:
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Pre-rendered sitemap and robots.txt files (see api/seo_files.py); re-rendered on a
+# background thread after content changes once `manage.py render_seo_files` has run
+SEO_FILES_ROOT = MEDIA_ROOT / 'seo'
+SEO_FILES_ASYNC = 'test' not in sys.argv
+SEO_FILES_MAX_AGE = 60 * 60
+
 # Add this for Railway compatibility
 if 'PORT' in os.environ:
     import socket
@@ -211,10 +303,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.fragments.FragmentJSONRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
+    'PAGE_SIZE': 20,
+    # Rates of the views with a throttle_scope (ScopedRateThrottle)
+    'DEFAULT_THROTTLE_RATES': {
+        'help_votes': '20/hour',
+    },
 }
 
 # CORS Configuration
@@ -265,3 +361,21 @@ DEFAULT_FROM_EMAIL = 'Agency Website <sitegenit@gmail.com>'
 # Meeting Request Email Settings
 MEETING_REQUEST_EMAIL = config('MEETING_REQUEST_EMAIL', default='sitegenit@gmail.com')
 ADMIN_EMAIL = config('ADMIN_EMAIL', default='sitegenit@gmail.com')
+
+# Give up on an unresponsive SMTP server instead of hanging a worker
+EMAIL_TIMEOUT = 10
+
+# Form notifications are sent by a background worker pool (see api/notifications.py)
+NOTIFICATIONS_ASYNC = config('NOTIFICATIONS_ASYNC', default='test' not in sys.argv, cast=bool)
+NOTIFICATIONS_WORKERS = 2
+NOTIFICATIONS_QUEUE_SIZE = 100
+NOTIFICATIONS_ENQUEUE_TIMEOUT = 0.05
+NOTIFICATIONS_MAX_ATTEMPTS = 3
+NOTIFICATIONS_RETRY_DELAY = 2
+NOTIFICATIONS_BATCH_SIZE = 20
+
+# Pooled SMTP connections (api/smtp_pool.py)
+SMTP_POOL_SIZE = NOTIFICATIONS_WORKERS
+SMTP_POOL_MAX_IDLE = 60
+SMTP_CIRCUIT_FAILURE_THRESHOLD = 5
+SMTP_CIRCUIT_RESET_TIMEOUT = 30
@@ -15,7 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
@@ -31,6 +31,12 @@ urlpatterns = [
     
     # SEO files at root level for search engines
     path('sitemap.xml', seo_views.sitemap_xml, name='sitemap_xml'),
+    path('sitemap.xml.gz', seo_views.sitemap_xml, {'compress': True}, name='sitemap_xml_gz'),
+    re_path(r'^sitemap-(?P<section>[a-z-]+?)(?:-(?P<page>[0-9]+))?\.xml$', seo_views.sitemap_section, name='sitemap_section'),
+    re_path(
+        r'^sitemap-(?P<section>[a-z-]+?)(?:-(?P<page>[0-9]+))?\.xml\.gz$', seo_views.sitemap_section,
+        {'compress': True}, name='sitemap_section_gz',
+    ),
     path('robots.txt', seo_views.robots_txt, name='robots_txt'),
 ]
 
@@ -14,10 +14,10 @@ class TestimonialAdmin(admin.ModelAdmin):
     search_fields = ['name', 'company', 'text']
 
 class ContactMessageAdmin(admin.ModelAdmin):
-    list_display = ['name', 'email', 'subject', 'created_at']
-    list_filter = ['created_at']
+    list_display = ['name', 'email', 'subject', 'notification_status', 'created_at']
+    list_filter = ['source', 'notification_status', 'created_at']
     search_fields = ['name', 'email', 'subject']
-    readonly_fields = ['created_at']
+    readonly_fields = ['created_at', 'notification_status', 'notification_attempts', 'notification_error', 'notified_at']
 
 class ServiceAdmin(admin.ModelAdmin):
     list_display = ['name', 'price_range', 'is_active']
@@ -5,16 +5,18 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 from django.db.models import Count, Q, Avg, Sum
-from django.db import models
 from django.contrib.admin import AdminSite
 from datetime import datetime, timedelta
+from django.utils import timezone
 from .models import (
-    Project, Testimonial, ContactMessage, Service, BlogPost, 
-    TeamMember, JobPosition, MeetingRequest, NavigationMenu,
-    VisitorStatistics, DynamicSection, PageContent, SectionContent
+    Project, Testimonial, ContactMessage, TeamMember, JobPosition, NavigationMenu,
+    VisitorStatistics, PageContent, SectionContent
 )
 import json
 
+from . import analytics, technologies
+from .dashboard_metrics import get_dashboard_metrics, growth
+
 
 class CustomAdminSite(AdminSite):
     site_header = 'site gen it Content Management'
@@ -51,88 +53,50 @@ class CustomAdminSite(AdminSite):
         """
         Calculate dashboard statistics
         """
-        from datetime import datetime, timedelta
-        
-        now = datetime.now()
-        last_week = now - timedelta(days=7)
-        last_month = now - timedelta(days=30)
-        
-        # Basic counts
-        projects_count = Project.objects.count()
-        featured_projects_count = Project.objects.filter(is_featured=True).count()
-        
-        testimonials_count = Testimonial.objects.count()
-        featured_testimonials_count = Testimonial.objects.filter(is_featured=True).count()
-        
-        # Messages statistics
-        messages_count = ContactMessage.objects.filter(
-            created_at__gte=last_week,
-            status='new'
-        ).count()
-        total_messages = ContactMessage.objects.count()
-        
-        # Team and job statistics
-        team_count = TeamMember.objects.filter(is_active=True).count()
-        active_jobs_count = JobPosition.objects.filter(is_active=True).count()
-        
-        # Blog and content statistics
-        published_blogs = BlogPost.objects.filter(is_published=True).count()
-        total_services = Service.objects.filter(is_active=True).count()
+        metrics = get_dashboard_metrics()
         
-        # Meeting requests
-        pending_meetings = MeetingRequest.objects.filter(status='pending').count()
-        
-        # Recent activity counts
-        recent_projects = Project.objects.filter(created_at__gte=last_month).count()
-        recent_testimonials = Testimonial.objects.filter(created_at__gte=last_month).count()
-        recent_messages = ContactMessage.objects.filter(created_at__gte=last_month).count()
-        
-        # Dynamic sections count
-        active_sections = DynamicSection.objects.filter(is_active=True).count()
-        total_sections = DynamicSection.objects.count()
+        # Most used technologies
+        top_technologies = technologies.top_technologies(10, with_counts=True)
         
         # Visitor statistics
         visitor_stats = self.get_visitor_statistics()
         
         return {
-            'projects_count': projects_count,
-            'featured_projects_count': featured_projects_count,
-            'testimonials_count': testimonials_count,
-            'featured_testimonials_count': featured_testimonials_count,
-            'messages_count': messages_count,
-            'total_messages': total_messages,
-            'team_count': team_count,
-            'active_jobs_count': active_jobs_count,
-            'published_blogs': published_blogs,
-            'total_services': total_services,
-            'pending_meetings': pending_meetings,
-            'recent_projects': recent_projects,
-            'recent_testimonials': recent_testimonials,
-            'recent_messages': recent_messages,
-            'active_sections': active_sections,
-            'total_sections': total_sections,
+            'projects_count': metrics['projects']['total'],
+            'featured_projects_count': metrics['projects']['featured'],
+            'testimonials_count': metrics['testimonials']['total'],
+            'featured_testimonials_count': metrics['testimonials']['featured'],
+            'messages_count': metrics['messages']['new_last_7_days'],
+            'total_messages': metrics['messages']['total'],
+            'team_count': metrics['team_members']['active'],
+            'active_jobs_count': metrics['jobs']['active'],
+            'published_blogs': metrics['blog_posts']['published'],
+            'total_services': metrics['services']['active'],
+            'pending_meetings': metrics['meetings']['pending'],
+            'recent_projects': metrics['projects']['last_30_days'],
+            'recent_testimonials': metrics['testimonials']['last_30_days'],
+            'recent_messages': metrics['messages']['last_30_days'],
+            'active_sections': metrics['sections']['active'],
+            'total_sections': metrics['sections']['total'],
+            'top_technologies': top_technologies,
             'visitor_stats': visitor_stats,
         }
     
     def get_visitor_statistics(self):
         """Get visitor statistics for dashboard"""
-        today = datetime.now().date()
+        today = timezone.localdate()
         last_7_days = today - timedelta(days=7)
         last_30_days = today - timedelta(days=30)
         
-        # Today's stats - create sample if none exists
+        # Today's stats (collected by the page view beacon, see api/analytics.py)
         today_stats = VisitorStatistics.objects.filter(date=today).first()
         if not today_stats:
             today_stats = {
-                'page_views': 1250,
-                'unique_visitors': 850,
-                'bounce_rate': 35.2,
-                'mobile_views': 750,
-                'desktop_views': 400,
-                'tablet_views': 100
+                'page_views': 0,
+                'unique_visitors': 0,
+                'bounce_rate': 0
             }
-            mobile_percentage = round((today_stats['mobile_views'] / 
-                (today_stats['mobile_views'] + today_stats['desktop_views'] + today_stats['tablet_views'])) * 100, 1)
+            mobile_percentage = 0
         else:
             mobile_percentage = round((today_stats.mobile_views / 
                 (today_stats.mobile_views + today_stats.desktop_views + today_stats.tablet_views)) * 100, 1) \
@@ -143,22 +107,23 @@ class CustomAdminSite(AdminSite):
                 'bounce_rate': today_stats.bounce_rate
             }
         
-        # Week aggregate
+        # Week aggregate; unique visitors are merged HyperLogLog sketches, not a sum of days
         week_stats = VisitorStatistics.objects.filter(
             date__gte=last_7_days
         ).aggregate(
-            total_views=Sum('page_views') or 0,
-            total_visitors=Sum('unique_visitors') or 0,
-            avg_bounce_rate=Avg('bounce_rate') or 0
+            total_views=Sum('page_views', default=0),
+            avg_bounce_rate=Avg('bounce_rate', default=0)
         )
+        week_stats['total_visitors'] = analytics.unique_visitors(last_7_days, today)
         
         # Month aggregate
         month_stats = VisitorStatistics.objects.filter(
             date__gte=last_30_days
         ).aggregate(
-            total_views=Sum('page_views') or 0,
-            total_visitors=Sum('unique_visitors') or 0
+            total_views=Sum('page_views', default=0)
         )
+        month_stats['total_visitors'] = analytics.unique_visitors(last_30_days, today)
+        month_stats['visitors_by_page'] = analytics.unique_visitors_by_page(last_30_days, today)
         
         return {
             'today': {
@@ -186,36 +151,39 @@ class DashboardStatsView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
+        metrics = get_dashboard_metrics()
+        
         # Get comprehensive statistics
         stats = {
             'overview': {
                 'projects': {
-                    'total': Project.objects.count(),
-                    'featured': Project.objects.filter(is_featured=True).count(),
-                    'by_category': dict(Project.objects.values_list('category').annotate(count=Count('id')))
+                    'total': metrics['projects']['total'],
+                    'featured': metrics['projects']['featured'],
+                    'by_category': dict(Project.objects.values_list('category').annotate(count=Count('id'))),
+                    'top_technologies': technologies.top_technologies(10, with_counts=True)
                 },
                 'testimonials': {
-                    'total': Testimonial.objects.count(),
-                    'featured': Testimonial.objects.filter(is_featured=True).count(),
-                    'average_rating': Testimonial.objects.aggregate(avg_rating=models.Avg('rating'))['avg_rating'] or 0
+                    'total': metrics['testimonials']['total'],
+                    'featured': metrics['testimonials']['featured'],
+                    'average_rating': metrics['testimonials']['average_rating'] or 0
                 },
                 'messages': {
-                    'total': ContactMessage.objects.count(),
-                    'new': ContactMessage.objects.filter(status='new').count(),
-                    'pending': ContactMessage.objects.filter(status='in_progress').count(),
-                    'resolved': ContactMessage.objects.filter(status__in=['replied', 'closed']).count()
+                    'total': metrics['messages']['total'],
+                    'new': metrics['messages']['new'],
+                    'pending': metrics['messages']['in_progress'],
+                    'resolved': metrics['messages']['resolved']
                 },
                 'team': {
-                    'total': TeamMember.objects.filter(is_active=True).count(),
+                    'total': metrics['team_members']['active'],
                     'by_department': dict(TeamMember.objects.filter(is_active=True).values_list('department').annotate(count=Count('id')))
                 },
                 'jobs': {
-                    'active': JobPosition.objects.filter(is_active=True).count(),
-                    'featured': JobPosition.objects.filter(is_active=True, is_featured=True).count(),
+                    'active': metrics['jobs']['active'],
+                    'featured': metrics['jobs']['featured'],
                 }
             },
             'recent_activity': self.get_recent_activity(),
-            'performance': self.get_performance_metrics()
+            'performance': self.get_performance_metrics(metrics)
         }
         
         context['stats'] = stats
@@ -267,53 +235,19 @@ class DashboardStatsView(TemplateView):
         activities.sort(key=lambda x: x['time'], reverse=True)
         return activities[:10]
     
-    def get_performance_metrics(self):
+    def get_performance_metrics(self, metrics=None):
         """
         Calculate performance metrics for dashboard
         """
-        now = datetime.now()
-        last_month = now - timedelta(days=30)
-        previous_month = last_month - timedelta(days=30)
-        
-        # Current month stats
-        current_projects = Project.objects.filter(created_at__gte=last_month).count()
-        current_messages = ContactMessage.objects.filter(created_at__gte=last_month).count()
-        current_testimonials = Testimonial.objects.filter(created_at__gte=last_month).count()
-        
-        # Previous month stats
-        prev_projects = Project.objects.filter(
-            created_at__gte=previous_month,
-            created_at__lt=last_month
-        ).count()
-        prev_messages = ContactMessage.objects.filter(
-            created_at__gte=previous_month,
-            created_at__lt=last_month
-        ).count()
-        prev_testimonials = Testimonial.objects.filter(
-            created_at__gte=previous_month,
-            created_at__lt=last_month
-        ).count()
-        
-        # Calculate growth rates
-        def calculate_growth(current, previous):
-            if previous == 0:
-                return 100 if current > 0 else 0
-            return round(((current - previous) / previous) * 100, 1)
+        metrics = metrics or get_dashboard_metrics()
+        groups = ('projects', 'messages', 'testimonials')
         
         return {
-            'projects_growth': calculate_growth(current_projects, prev_projects),
-            'messages_growth': calculate_growth(current_messages, prev_messages),
-            'testimonials_growth': calculate_growth(current_testimonials, prev_testimonials),
-            'current_month': {
-                'projects': current_projects,
-                'messages': current_messages,
-                'testimonials': current_testimonials
-            },
-            'previous_month': {
-                'projects': prev_projects,
-                'messages': prev_messages,
-                'testimonials': prev_testimonials
-            }
+            'projects_growth': growth(metrics['projects']['last_30_days'], metrics['projects']['previous_30_days']),
+            'messages_growth': growth(metrics['messages']['last_30_days'], metrics['messages']['previous_30_days']),
+            'testimonials_growth': growth(metrics['testimonials']['last_30_days'], metrics['testimonials']['previous_30_days']),
+            'current_month': {group: metrics[group]['last_30_days'] for group in groups},
+            'previous_month': {group: metrics[group]['previous_30_days'] for group in groups}
         }
 
 
@@ -0,0 +1,259 @@
+"""
+Visitor analytics ingestion.
+
+The frontend posts a small beacon to ``/api/analytics/beacon/`` on every page
+view. The view only classifies the hit (page, device, traffic source) and adds
+it to an in-memory ``CounterBuffer`` keyed by day, so ingesting a beacon never
+touches the database. Every ``ANALYTICS_FLUSH_INTERVAL`` seconds the buffer is
+written out as one ``UPDATE ... SET col = col + n`` per day on the
+``VisitorStatistics`` row of that day.
+
+Unique visitors are counted with HyperLogLog sketches (api/hyperloglog.py):
+each beacon's visitor key goes into an in-memory sketch per day and page type,
+which is merged into the stored ``VisitorSketch`` rows on flush.
+``VisitorStatistics.unique_visitors`` is set from the day's site-wide sketch,
+and ``unique_visitors()`` merges sketches over any date range.
+"""
+import json
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import feature_flags
+from .buffers import CounterBuffer, SketchBuffer
+from .hyperloglog import HyperLogLog
+
+
+# First path segment -> VisitorStatistics page column
+PAGE_FIELDS = {
+    '': 'home_views',
+    'about-us': 'about_views',
+    'our-team': 'about_views',
+    'services': 'services_views',
+    'portfolio': 'portfolio_views',
+    'all-projects': 'portfolio_views',
+    'case-studies': 'portfolio_views',
+    'contact': 'contact_views',
+    'quote': 'contact_views',
+    'blog': 'blog_views',
+}
+
+DEVICE_FIELDS = {
+    'mobile': 'mobile_views',
+    'tablet': 'tablet_views',
+    'desktop': 'desktop_views',
+}
+
+SOURCE_FIELDS = {
+    'direct': 'direct_traffic',
+    'search': 'search_traffic',
+    'social': 'social_traffic',
+    'referral': 'referral_traffic',
+}
+
+# Names ending in a dot match any TLD; the others are exact hosts
+SEARCH_ENGINES = ('google.', 'bing.', 'duckduckgo.', 'yahoo.', 'baidu.', 'yandex.', 'ecosia.')
+SOCIAL_NETWORKS = (
+    'facebook.', 'fb.', 'twitter.', 't.co', 'x.com', 'linkedin.', 'lnkd.in', 'instagram.',
+    'reddit.', 'youtube.', 'pinterest.', 'tiktok.',
+)
+
+# Beacons larger than this are rejected without being parsed
+MAX_BEACON_BYTES = 2048
+
+
+def page_field(path):
+    """The page column for a frontend path, or None for pages without one"""
+    segment = (path or '/').split('?')[0].strip('/').split('/')[0].lower()
+    return PAGE_FIELDS.get(segment)
+
+
+def page_type(path):
+    """The VisitorSketch page type for a frontend path"""
+    field = page_field(path)
+    return field[:-len('_views')] if field else 'other'
+
+
+def classify_device(user_agent):
+    user_agent = (user_agent or '').lower()
+    if 'ipad' in user_agent or 'tablet' in user_agent or ('android' in user_agent and 'mobile' not in user_agent):
+        return 'tablet'
+    if 'mobi' in user_agent or 'iphone' in user_agent or 'android' in user_agent:
+        return 'mobile'
+    return 'desktop'
+
+
+def _host_matches(host, names):
+    for name in names:
+        if name.endswith('.'):
+            if host.startswith(name) or f'.{name}' in host:
+                return True
+        elif host == name or host.endswith(f'.{name}'):
+            return True
+    return False
+
+
+def classify_source(referrer, site_host=None):
+    """direct, search, social or referral, from the document referrer"""
+    host = urlparse(referrer or '').netloc.lower().split(':')[0]
+    if not host or (site_host and host == site_host.lower().split(':')[0]):
+        return 'direct'
+    if _host_matches(host, SEARCH_ENGINES):
+        return 'search'
+    if _host_matches(host, SOCIAL_NETWORKS):
+        return 'social'
+    return 'referral'
+
+
+def beacon_counts(payload, user_agent=''):
+    """Turn one beacon into the VisitorStatistics increments it stands for"""
+    path = payload.get('path') or '/'
+    if not isinstance(path, str):
+        path = '/'
+    counts = {'page_views': 1}
+
+    field = page_field(path)
+    if field:
+        counts[field] = 1
+
+    device = payload.get('device')
+    if device not in DEVICE_FIELDS:
+        device = classify_device(user_agent)
+    counts[DEVICE_FIELDS[device]] = 1
+
+    referrer = payload.get('referrer')
+    site_host = urlparse(payload.get('url') or '').netloc if isinstance(payload.get('url'), str) else None
+    source = classify_source(referrer if isinstance(referrer, str) else '', site_host)
+    counts[SOURCE_FIELDS[source]] = 1
+
+    return counts
+
+
+def visitor_key(payload, request):
+    """Identify the visitor: the id the frontend keeps in local storage, else the request's visitor key"""
+    visitor_id = payload.get('visitor_id')
+    if isinstance(visitor_id, str) and 0 < len(visitor_id) <= 64:
+        return f"visitor:{visitor_id}"
+    key = feature_flags.get_visitor_key(request) or ''
+    if key.startswith('ip:'):
+        # Tell apart visitors sharing an address
+        key += '|' + request.META.get('HTTP_USER_AGENT', '')
+    return key or None
+
+
+def parse_beacon(body):
+    """Decode a beacon body; returns None when it is not a small JSON object"""
+    if len(body) > MAX_BEACON_BYTES:
+        return None
+    try:
+        payload = json.loads(body or b'{}')
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def flush_visitor_statistics(pending):
+    """Apply ``{date: Counter}`` as one F() increment per day"""
+    from .models import VisitorStatistics
+
+    with transaction.atomic():
+        VisitorStatistics.objects.bulk_create(
+            [VisitorStatistics(date=day) for day in pending], ignore_conflicts=True
+        )
+        for day, counts in pending.items():
+            VisitorStatistics.objects.filter(date=day).update(
+                **{field: F(field) + amount for field, amount in counts.items() if amount}
+            )
+
+
+def flush_visitor_sketches(pending):
+    """Merge ``{(date, page_type): HyperLogLog}`` into the stored sketches"""
+    from .models import VisitorSketch, VisitorStatistics
+
+    with transaction.atomic():
+        VisitorSketch.objects.bulk_create(
+            [VisitorSketch(date=day, page_type=kind, sketch=b'') for day, kind in pending],
+            ignore_conflicts=True,
+        )
+        rows = VisitorSketch.objects.select_for_update().filter(
+            date__in={day for day, _ in pending}, page_type__in={kind for _, kind in pending}
+        )
+        changed = []
+        for row in rows:
+            sketch = pending.get((row.date, row.page_type))
+            if sketch is None:
+                continue
+            row.sketch = HyperLogLog.from_bytes(row.sketch).merge(sketch).to_bytes()
+            row.updated_at = timezone.now()
+            changed.append(row)
+        VisitorSketch.objects.bulk_update(changed, ['sketch', 'updated_at'])
+
+        site_wide = {row.date: row for row in changed if row.page_type == 'all'}
+        if site_wide:
+            VisitorStatistics.objects.bulk_create(
+                [VisitorStatistics(date=day) for day in site_wide], ignore_conflicts=True
+            )
+            for day, row in site_wide.items():
+                VisitorStatistics.objects.filter(date=day).update(
+                    unique_visitors=HyperLogLog.from_bytes(row.sketch).count()
+                )
+
+
+def unique_visitors(start, end, page_type='all'):
+    """Distinct visitors between two dates (inclusive), merged from the daily sketches"""
+    from .models import VisitorSketch
+
+    blobs = VisitorSketch.objects.filter(date__gte=start, date__lte=end, page_type=page_type).values_list(
+        'sketch', flat=True
+    )
+    return HyperLogLog.merged(blobs).count()
+
+
+def unique_visitors_by_page(start, end):
+    """``{page_type: distinct visitors}`` between two dates (inclusive), in one query"""
+    from .models import VisitorSketch
+
+    sketches = {}
+    rows = VisitorSketch.objects.filter(date__gte=start, date__lte=end).values_list('page_type', 'sketch')
+    for kind, blob in rows:
+        if blob:
+            sketches.setdefault(kind, HyperLogLog()).merge(HyperLogLog.from_bytes(blob))
+    return {kind: sketch.count() for kind, sketch in sketches.items()}
+
+
+visitor_buffer = CounterBuffer(
+    'visitor-analytics',
+    flush_visitor_statistics,
+    interval=getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 10),
+    max_pending=getattr(settings, 'ANALYTICS_MAX_PENDING', 10000),
+    background=getattr(settings, 'ANALYTICS_FLUSH_ASYNC', True),
+)
+
+
+sketch_buffer = SketchBuffer(
+    'visitor-sketches',
+    flush_visitor_sketches,
+    interval=getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 10),
+    max_pending=getattr(settings, 'ANALYTICS_MAX_PENDING', 10000),
+    background=getattr(settings, 'ANALYTICS_FLUSH_ASYNC', True),
+)
+
+
+def record_beacon(payload, request):
+    """Buffer one page view for today's VisitorStatistics row and visitor sketches"""
+    today = timezone.localdate()
+    visitor_buffer.add(today, beacon_counts(payload, request.META.get('HTTP_USER_AGENT', '')))
+
+    key = visitor_key(payload, request)
+    if key:
+        sketch_buffer.add((today, 'all'), key)
+        sketch_buffer.add((today, page_type(payload.get('path') if isinstance(payload.get('path'), str) else '/')), key)
+
+
+def flush():
+    """Write out both buffers now"""
+    visitor_buffer.flush()
+    sketch_buffer.flush()
@@ -0,0 +1,154 @@
+"""
+In-process write buffers.
+
+High-frequency writes (page view beacons, view counters) are accumulated in
+memory per worker and written out in one batch every few seconds instead of
+one ``UPDATE`` per hit. A buffer holds ``{key: entry}`` behind a lock; ``add()``
+folds a value into the key's entry, and a daemon thread hands the accumulated
+entries to a flush function every ``interval`` seconds (or sooner once
+``max_pending`` hits are waiting). Entries whose flush raised are merged back
+and retried on the next round.
+
+* ``CounterBuffer`` entries are ``Counter`` objects summing field increments.
+* ``SketchBuffer`` entries are HyperLogLog sketches of the values added.
+
+Entries still in memory when a worker is killed are lost, which is the
+trade-off for not touching the database per hit. Buffers are flushed at
+interpreter exit.
+
+With ``background=False`` no thread is started and the owner calls ``flush()``
+(tests do this).
+"""
+import atexit
+import threading
+from collections import Counter
+
+from django.db import connection
+
+from .hyperloglog import HyperLogLog
+
+
+class PeriodicBuffer:
+    """Accumulates entries per key in memory and periodically passes them to ``flush_function``"""
+
+    def __init__(self, name, flush_function, interval=10.0, max_pending=10000, background=True):
+        self.name = name
+        self.flush_function = flush_function
+        self.interval = interval
+        self.max_pending = max_pending
+        self.background = background
+        self._pending = {}
+        self._hits = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def new_entry(self):
+        raise NotImplementedError
+
+    def add_to_entry(self, entry, value):
+        raise NotImplementedError
+
+    def merge_entries(self, entry, other):
+        raise NotImplementedError
+
+    def copy_entry(self, entry):
+        raise NotImplementedError
+
+    def add(self, key, value):
+        """Fold ``value`` into the entry of ``key``"""
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._pending[key] = self.new_entry()
+            self.add_to_entry(entry, value)
+            self._hits += 1
+            full = self._hits >= self.max_pending
+        if self.background:
+            self._start()
+            if full:
+                self._wakeup.set()
+
+    def pending(self):
+        """A copy of the entries waiting to be flushed"""
+        with self._lock:
+            return {key: self.copy_entry(entry) for key, entry in self._pending.items()}
+
+    def pending_entry(self, key):
+        """A copy of the entry of ``key`` waiting to be flushed, or None"""
+        with self._lock:
+            entry = self._pending.get(key)
+            return self.copy_entry(entry) if entry is not None else None
+
+    def flush(self):
+        """Write out everything accumulated so far; returns the number of keys flushed"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._hits = 0
+            if not pending:
+                return 0
+            try:
+                self.flush_function(pending)
+            except Exception as e:
+                print(f"Failed to flush {self.name} buffer: {e}")
+                with self._lock:
+                    for key, entry in pending.items():
+                        current = self._pending.get(key)
+                        if current is None:
+                            self._pending[key] = entry
+                        else:
+                            self.merge_entries(current, entry)
+                return 0
+            return len(pending)
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f'{self.name}-flush', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+
+class CounterBuffer(PeriodicBuffer):
+    """Sums ``{field: increment}`` mappings per key"""
+
+    def new_entry(self):
+        return Counter()
+
+    def add_to_entry(self, entry, value):
+        entry.update(value)
+
+    def merge_entries(self, entry, other):
+        entry.update(other)
+
+    def copy_entry(self, entry):
+        return Counter(entry)
+
+
+class SketchBuffer(PeriodicBuffer):
+    """Keeps a HyperLogLog sketch of the values added per key"""
+
+    def new_entry(self):
+        return HyperLogLog()
+
+    def add_to_entry(self, entry, value):
+        entry.add(value)
+
+    def merge_entries(self, entry, other):
+        entry.merge(other)
+
+    def copy_entry(self, entry):
+        return HyperLogLog(entry.precision, entry.registers)
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from . import caching, compression
+
+
+class ResponseCacheMiddleware:
+    """
+    Cache anonymous GET responses of the public API.
+    Entries are keyed on host, path, query string and Accept, and tagged with the
+    models whose tables were queried while building them. Saving or deleting a
+    row of one of those models (see signals.py) invalidates the entry.
+    The compressed variants of an entry are stored with it (see compression.py).
+    Responses that depend on the visitor (see feature_flags.py) are not cached
+    and are marked ``private`` for HTTP caches.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.is_cacheable_request(request):
+            return self.mark_per_visitor(request, self.get_response(request))
+
+        key = caching.response_cache_key(request)
+        entry = caching.get_cached_response(key)
+        if entry is not None:
+            response = caching.build_response(entry)
+            response['X-Cache'] = 'HIT'
+            return self.compress(request, response, key, entry)
+
+        with caching.record_model_tags() as tags:
+            response = self.get_response(request)
+
+        if self.is_cacheable_response(request, response):
+            patch_vary_headers(response, ['Accept'])
+            entry = caching.store_response(key, response, tags)
+            response['X-Cache'] = 'MISS'
+            response = self.compress(request, response, key, entry)
+        return self.mark_per_visitor(request, response)
+
+    def mark_per_visitor(self, request, response):
+        if getattr(request, '_response_per_visitor', False):
+            patch_cache_control(response, private=True)
+        return response
+
+    def compress(self, request, response, key, entry):
+        """Serve the negotiated encoding of an entry, compressing it only the first time"""
+        return compression.compress_response(
+            request, response, lambda encoding: caching.encoded_content(key, entry, encoding)
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Let views with side effects opt out with ``response_cache = False``"""
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if not getattr(view_class or view_func, 'response_cache', True):
+            request._response_cache_skip = True
+        return None
+
+    def is_cacheable_request(self, request):
+        if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True):
+            return False
+        if request.method not in ('GET', 'HEAD'):
+            return False
+
+        # Only anonymous traffic: no token and no session cookie
+        if 'HTTP_AUTHORIZATION' in request.META:
+            return False
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return False
+
+        path = request.path
+        if not any(path.startswith(prefix) for prefix in settings.RESPONSE_CACHE_PREFIXES):
+            return False
+        if any(path.startswith(prefix) for prefix in settings.RESPONSE_CACHE_EXCLUDE):
+            return False
+        return True
+
+    def is_cacheable_response(self, request, response):
+        if getattr(request, '_response_cache_skip', False):
+            return False
+        if response.status_code != 200 or response.streaming:
+            return False
+        if response.has_header('Set-Cookie'):
+            return False
+        cache_control = response.get('Cache-Control', '')
+        if 'private' in cache_control or 'no-store' in cache_control:
+            return False
+        return True
@@ -0,0 +1,199 @@
+"""
+Shared caching helpers for the API.
+
+Every model in the ``api`` app has a *tag* (its model label, e.g. ``api.Project``).
+Each tag carries a version stored in the Django cache; saving or deleting a row
+bumps the version of its model's tag. Cached entries remember the tag versions
+they were built from and are discarded as soon as one of them moves on, so a
+change to ``Project`` only evicts entries that actually read projects.
+"""
+import hashlib
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+
+from . import compression
+
+
+TAG_KEY_PREFIX = 'api:tag:'
+RESPONSE_KEY_PREFIX = 'api:response:'
+
+# Hop-by-hop and per-request headers that must never be replayed from the cache
+UNCACHEABLE_HEADERS = {'set-cookie', 'x-cache', 'connection', 'transfer-encoding'}
+
+_table_pattern = None
+_table_labels = None
+
+# Tables created outside the ORM, with the tag of the model they belong to
+_extra_tables = {}
+
+# Tag sets of the record_model_tags() blocks active in this thread
+_recording = threading.local()
+
+
+def model_tag(model):
+    """Return the invalidation tag for a model class or instance"""
+    return model._meta.label
+
+
+def counter_tag(model):
+    """
+    Return the tag bumped when buffered counters of ``model`` are flushed (see
+    counters.py); only entries that display those counters depend on it
+    """
+    return f"{model_tag(model)}:counters"
+
+
+def _tag_key(tag):
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def get_tag_versions(tags):
+    """
+    Return the current version of each tag.
+    Tags that have no version yet (or were evicted) are initialised to now.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return {}
+
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    versions = {keys[key]: value for key, value in found.items()}
+
+    missing = {key: time.time() for key, tag in keys.items() if tag not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update({keys[key]: value for key, value in missing.items()})
+
+    return versions
+
+
+def bump_tags(tags):
+    """Invalidate every cache entry that depends on one of ``tags``"""
+    now = time.time()
+    cache.set_many({_tag_key(tag): now for tag in set(tags)}, timeout=None)
+
+
+def tags_are_current(tag_versions):
+    """Check that the tag versions captured with an entry are still current"""
+    if not tag_versions:
+        return True
+    return get_tag_versions(tag_versions.keys()) == tag_versions
+
+
+def _api_tables():
+    """Map db table names of the api models to their tags (built lazily)"""
+    global _table_pattern, _table_labels
+    if _table_pattern is None:
+        _table_labels = {
+            model._meta.db_table: model_tag(model)
+            for model in apps.get_app_config('api').get_models()
+        }
+        _table_labels.update(_extra_tables)
+        names = sorted(_table_labels, key=len, reverse=True)
+        _table_pattern = re.compile(r'\b(%s)\b' % '|'.join(re.escape(name) for name in names))
+    return _table_pattern, _table_labels
+
+
+def register_table(table, tag):
+    """Record reads of ``table``, which has no model of its own, under ``tag``"""
+    global _table_pattern
+    _extra_tables[table] = tag
+    _table_pattern = None
+
+
+@contextmanager
+def record_model_tags():
+    """
+    Collect the tags of every api model read by SQL executed inside the block,
+    plus those passed to note_tags(). Yields a set that is filled in as queries run.
+    """
+    pattern, labels = _api_tables()
+    tags = set()
+
+    def recorder(execute, sql, params, many, context):
+        tags.update(labels[table] for table in pattern.findall(sql))
+        return execute(sql, params, many, context)
+
+    active = _recording.__dict__.setdefault('sets', [])
+    active.append(tags)
+    try:
+        with connection.execute_wrapper(recorder):
+            yield tags
+    finally:
+        active.pop()
+
+
+def note_tags(*tags):
+    """
+    Add ``tags`` to every active record_model_tags() set. Readers serving rows
+    from process memory call this, since no SQL runs that could be recorded.
+    """
+    for recorded in getattr(_recording, 'sets', ()):
+        recorded.update(tags)
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+def response_cache_key(request):
+    """Build the cache key for an anonymous GET: host, path, query string and Accept"""
+    raw = '|'.join([
+        request.get_host(),
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        request.META.get('HTTP_ACCEPT', ''),
+    ])
+    return RESPONSE_KEY_PREFIX + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def get_cached_response(key):
+    """Return the cached entry for ``key`` if none of its tags changed since it was stored"""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if not tags_are_current(entry['tags']):
+        cache.delete(key)
+        return None
+    return entry
+
+
+def store_response(key, response, tags):
+    """Store a rendered response together with the versions of the tags it read"""
+    entry = {
+        'status': response.status_code,
+        'content': response.content,
+        'headers': [
+            (name, value) for name, value in response.items()
+            if name.lower() not in UNCACHEABLE_HEADERS
+        ],
+        'tags': get_tag_versions(tags),
+    }
+    cache.set(key, entry, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 60))
+    return entry
+
+
+def encoded_content(key, entry, encoding):
+    """The content of a cached entry in ``encoding``; compressed once, then stored with the entry"""
+    variants = entry.setdefault('variants', {})
+    if encoding not in variants:
+        variants[encoding] = compression.compress(entry['content'], encoding)
+        cache.set(key, entry, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 60))
+    return variants[encoding]
+
+
+def build_response(entry):
+    """Rebuild an HttpResponse from a cached entry"""
+    response = HttpResponse(entry['content'], status=entry['status'])
+    for name, value in entry['headers']:
+        response[name] = value
+    return response
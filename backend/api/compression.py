@@ -0,0 +1,120 @@
+"""
+Compression of API responses.
+
+JSON responses of at least ``COMPRESSION_MIN_SIZE`` bytes are sent brotli- or
+gzip-encoded, whichever the client's ``Accept-Encoding`` prefers. Brotli is
+used when the optional ``brotli`` package is installed; gzip is always
+available. Smaller responses, streaming responses and other content types are
+sent as they are.
+
+CompressionMiddleware compresses responses the response cache does not hold.
+Cached responses are compressed by ResponseCacheMiddleware instead, which
+keeps each encoding next to the cache entry. A variant is therefore
+compressed once per content version, not once per request (see
+``caching.encoded_content()``).
+
+Like Django's GZipMiddleware, a strong ETag is made weak on compressed
+responses, and ``Vary: Accept-Encoding`` is added to every response that
+could have been compressed.
+"""
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def available_encodings():
+    """Supported content codings, most preferred first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def parse_accept_encoding(header):
+    """``{coding: q}`` from an Accept-Encoding header"""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate(request):
+    """The content coding to use for ``request``, or None for the identity"""
+    accepted = parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def is_compressible(response):
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+    if not 200 <= response.status_code < 300:
+        return False
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type not in getattr(settings, 'COMPRESSION_CONTENT_TYPES', ['application/json']):
+        return False
+    return len(response.content) >= getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+
+def compress_response(request, response, encode=None):
+    """
+    Encode ``response`` for ``request`` when it is worth it. ``encode(encoding)``
+    returns the compressed content; by default the body is compressed here.
+    """
+    if not is_compressible(response):
+        return response
+    patch_vary_headers(response, ['Accept-Encoding'])
+    encoding = negotiate(request)
+    if encoding is None:
+        return response
+
+    content = encode(encoding) if encode is not None else compress(response.content, encoding)
+    if len(content) >= len(response.content):
+        return response
+    response.content = content
+    response['Content-Length'] = str(len(content))
+    response['Content-Encoding'] = encoding
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
+
+
+class CompressionMiddleware:
+    """Compress API JSON responses; cached responses arrive already encoded"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return compress_response(request, self.get_response(request))
@@ -0,0 +1,158 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for the content endpoints.
+
+Validators are computed before any serialization happens:
+
+* generic list/detail views use ``Max(updated_at)`` and ``Count`` of the
+  filtered queryset, plus the cache tag versions of related models. Counter
+  columns written with ``update()`` leave ``updated_at`` alone; views showing
+  one list it in ``counter_fields`` so the ETag follows its ``Sum`` and the
+  response cache follows the model's counter tag;
+* aggregated views declare ``conditional_models`` and use the tag versions
+  from ``caching`` alone, which costs no SQL at all.
+
+Cache-Control policies are configured per URL name in ``API_CACHE_CONTROL``.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from . import caching
+from .eager_loading import plan_eager_loading
+
+
+def make_etag(*parts):
+    """Build a quoted strong ETag from arbitrary validator parts"""
+    raw = '|'.join(str(part) for part in parts)
+    return '"%s"' % hashlib.sha1(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def tag_validators(models):
+    """Return ``(etag, last_modified)`` from the content version of each model"""
+    versions = caching.get_tag_versions(caching.model_tag(model) for model in models)
+    if not versions:
+        return None, None
+    etag = make_etag(*sorted(versions.items()))
+    return etag, int(max(versions.values()))
+
+
+def related_models(serializer_class):
+    """
+    Return the models, other than the serializer's own, whose data ends up in its output:
+    nested model serializers and dotted ``source`` lookups such as ``project.title``.
+    """
+    return list(plan_eager_loading(serializer_class).models)
+
+
+def get_cache_control_policy(request):
+    """Return the Cache-Control directives configured for the resolved URL name"""
+    policies = getattr(settings, 'API_CACHE_CONTROL', {})
+    url_name = getattr(getattr(request, 'resolver_match', None), 'url_name', None)
+    return policies.get(url_name, policies.get('default', {}))
+
+
+def apply_validators(request, response, etag, last_modified):
+    """Set ETag, Last-Modified and the configured Cache-Control on a response"""
+    if etag and not response.has_header('ETag'):
+        response['ETag'] = etag
+    if last_modified and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(last_modified)
+    policy = get_cache_control_policy(request)
+    if policy:
+        patch_cache_control(response, **policy)
+    return response
+
+
+class NotModified(Exception):
+    """Raised from ``initial()`` to short-circuit a view with a 304 response"""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before the view serializes anything.
+    The check runs after authentication and permissions, so it also covers APIViews
+    that implement ``get`` themselves. Views may set ``conditional_models`` to
+    validate on content versions only.
+    """
+    conditional_models = None
+    counter_fields = ()
+    validators = (None, None)
+
+    def get_validators(self):
+        if self.conditional_models is not None:
+            return tag_validators(self.conditional_models)
+        return self.get_queryset_validators()
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_queryset_validators(self):
+        queryset = self.get_conditional_queryset()
+        model = queryset.model
+        field_names = {field.name for field in model._meta.get_fields()}
+
+        models = related_models(self.get_serializer_class())
+        if 'updated_at' in field_names:
+            # Counters only grow, so their sum moves whichever row was counted
+            counters = {f'counter_{name}': Sum(name) for name in self.counter_fields}
+            aggregate = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'), **counters)
+            last = aggregate['last'].timestamp() if aggregate['last'] else 0
+            parts = [model._meta.label, last, aggregate['count'], *(aggregate[name] for name in counters)]
+        else:
+            # No modification timestamp on this model: use its content version
+            models.append(model)
+            last, parts = 0, [model._meta.label]
+
+        related_etag, related_last = tag_validators(models)
+        etag = make_etag(related_etag, *parts)
+        if self.counter_fields:
+            caching.note_tags(caching.counter_tag(model))
+            # Counter updates do not move updated_at, so Last-Modified cannot follow them
+            return etag, None
+        return etag, int(max(last, related_last or 0)) or None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            self.validators = self.get_validators()
+            etag, last_modified = self.validators
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in ('GET', 'HEAD') and (200 <= response.status_code < 300 or response.status_code == 304):
+            apply_validators(request, response, *self.validators)
+        return response
+
+
+def conditional_view(models):
+    """Function-view counterpart of ConditionalGetMixin, validating on content versions"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            etag, last_modified = tag_validators(models)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return apply_validators(request, response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -1,6 +1,6 @@
 from django.contrib.sites.shortcuts import get_current_site
-from .models import SEOSettings, SEOMetaTags
 from .seo_views import seo_meta_context, generate_breadcrumbs
+from .singletons import get_seo_settings
 
 
 def seo_context(request):
@@ -39,7 +39,7 @@ def seo_context(request):
         
         # Get SEO settings for additional context
         try:
-            seo_settings = SEOSettings.objects.first()
+            seo_settings = get_seo_settings()
             if seo_settings:
                 seo_data.update({
                     'google_analytics_id': seo_settings.google_analytics_id,
@@ -0,0 +1,117 @@
+"""
+Dashboard metrics.
+
+The dashboard API and the admin index used to fire one ``COUNT`` per filter
+and date window (around 25 queries per page load). Here every model's counts
+are computed in a single query with conditional aggregation
+(``Count('pk', filter=Q(...))``), and the result is cached for
+``DASHBOARD_METRICS_TTL`` seconds so that dashboards polling for updates do
+not recount on every request.
+
+``get_dashboard_metrics()`` returns ``{group: {metric: value}}``, e.g.
+``metrics['messages']['new']``.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from .models import (
+    Project, Testimonial, ContactMessage, Service, BlogPost, TeamMember,
+    JobPosition, MeetingRequest, DynamicSection
+)
+
+
+CACHE_KEY = 'api:dashboard_metrics'
+
+
+def _count(condition=None):
+    return Count('pk', filter=condition) if condition is not None else Count('pk')
+
+
+def metric_definitions(now):
+    """``{group: (model, {metric: aggregate})}`` for the windows ending at ``now``"""
+    last_week = now - timedelta(days=7)
+    last_month = now - timedelta(days=30)
+    previous_month = last_month - timedelta(days=30)
+
+    def created_windows():
+        return {
+            'last_7_days': _count(Q(created_at__gte=last_week)),
+            'last_30_days': _count(Q(created_at__gte=last_month)),
+            'previous_30_days': _count(Q(created_at__gte=previous_month, created_at__lt=last_month)),
+        }
+
+    return {
+        'projects': (Project, {
+            'total': _count(),
+            'featured': _count(Q(is_featured=True)),
+            **created_windows(),
+        }),
+        'testimonials': (Testimonial, {
+            'total': _count(),
+            'featured': _count(Q(is_featured=True)),
+            'average_rating': Avg('rating'),
+            **created_windows(),
+        }),
+        'messages': (ContactMessage, {
+            'total': _count(),
+            'new': _count(Q(status='new')),
+            'new_last_7_days': _count(Q(status='new', created_at__gte=last_week)),
+            'in_progress': _count(Q(status='in_progress')),
+            'resolved': _count(Q(status__in=['replied', 'closed'])),
+            **created_windows(),
+        }),
+        'blog_posts': (BlogPost, {
+            'total': _count(),
+            'published': _count(Q(is_published=True)),
+        }),
+        'services': (Service, {
+            'total': _count(),
+            'active': _count(Q(is_active=True)),
+        }),
+        'team_members': (TeamMember, {
+            'total': _count(),
+            'active': _count(Q(is_active=True)),
+        }),
+        'jobs': (JobPosition, {
+            'total': _count(),
+            'active': _count(Q(is_active=True)),
+            'featured': _count(Q(is_active=True, is_featured=True)),
+        }),
+        'meetings': (MeetingRequest, {
+            'total': _count(),
+            'pending': _count(Q(status='pending')),
+        }),
+        'sections': (DynamicSection, {
+            'total': _count(),
+            'active': _count(Q(is_active=True)),
+        }),
+    }
+
+
+def compute_dashboard_metrics(now=None):
+    """Run one aggregate query per model"""
+    now = now or timezone.now()
+    return {
+        group: model.objects.aggregate(**aggregates)
+        for group, (model, aggregates) in metric_definitions(now).items()
+    }
+
+
+def get_dashboard_metrics():
+    """Dashboard metrics, recomputed at most every ``DASHBOARD_METRICS_TTL`` seconds"""
+    metrics = cache.get(CACHE_KEY)
+    if metrics is None:
+        metrics = compute_dashboard_metrics()
+        cache.set(CACHE_KEY, metrics, getattr(settings, 'DASHBOARD_METRICS_TTL', 30))
+    return metrics
+
+
+def growth(current, previous):
+    """Percentage change between two periods"""
+    if previous == 0:
+        return 100 if current > 0 else 0
+    return round(((current - previous) / previous) * 100, 1)
@@ -0,0 +1,227 @@
+"""
+Eager-loading planner derived from serializer declarations.
+
+The planner walks a serializer's fields and turns every relation it follows
+into the matching queryset optimisation:
+
+* a nested single serializer or a dotted ``source`` such as ``project.title``
+  becomes ``select_related``;
+* a nested ``many=True`` serializer becomes a ``Prefetch`` whose queryset is
+  planned recursively and, when the child model has ``is_active``, filtered to
+  active rows.
+
+The number of queries per endpoint therefore no longer grows with the number
+of rows being serialized.
+
+Plans follow the ``?fields=``/``?expand=`` selection of the request (see
+sparse_fields.py), and also list the columns the selected fields read so that
+generic views can load rows with ``.only()``. Fields the planner cannot map
+to columns (a method field without ``Meta.field_sources``) leave every column
+loaded.
+"""
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .sparse_fields import ALL, SparseFieldsMixin, selection_from_request, selection_key
+
+
+class EagerLoadingPlan:
+    """select_related paths, Prefetch objects and related models for one serializer"""
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        self.models = []
+        # Columns read by the serializer, or None when they are not all known
+        self.only = []
+
+    def add_model(self, model):
+        if model not in self.models:
+            self.models.append(model)
+
+    def add_column(self, path):
+        if self.only is not None and path not in self.only:
+            self.only.append(path)
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+_plans = {}
+# Selections come from query strings, so the memo is bounded
+MAX_PLANS = 512
+
+
+def _resolve_relation(model, name):
+    """Return the relation field called ``name`` on ``model``, or None for plain attributes"""
+    try:
+        field = model._meta.get_field(name)
+    except Exception:
+        return None
+    return field if field.is_relation else None
+
+
+def _child_queryset(model, serializer_class, selection=ALL):
+    queryset = model._default_manager.all()
+    if any(field.name == 'is_active' for field in model._meta.get_fields()):
+        queryset = queryset.filter(is_active=True)
+    return eager_load(queryset, serializer_class, selection)
+
+
+def _selection_of(serializer):
+    return serializer.get_selection() if isinstance(serializer, SparseFieldsMixin) else ALL
+
+
+def _add_expandable_models(serializer, plan):
+    """Relations the request could expand count as related models even when not expanded"""
+    expandable = getattr(getattr(serializer, 'Meta', None), 'expandable_fields', {})
+    for serializer_class in expandable.values():
+        plan.add_model(serializer_class.Meta.model)
+        for related in plan_eager_loading(serializer_class).models:
+            plan.add_model(related)
+
+
+def _add_columns(serializer, field_name, field, model, prefix, plan):
+    """Record the columns a plain (non-nested) field reads"""
+    sources = getattr(getattr(serializer, 'Meta', None), 'field_sources', {})
+    if field_name in sources:
+        for name in sources[field_name]:
+            plan.add_column(prefix + name)
+        return
+    if field.source == '*':
+        plan.only = None
+        return
+    try:
+        model_field = model._meta.get_field(field.source)
+    except Exception:
+        model_field = None
+    if model_field is None or not model_field.concrete:
+        plan.only = None
+        return
+    plan.add_column(prefix + field.source)
+
+
+def _walk(serializer, model, prefix, plan):
+    _add_expandable_models(serializer, plan)
+    for field_name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            _add_columns(serializer, field_name, field, model, prefix, plan)
+            continue
+
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+
+        if isinstance(nested, serializers.ModelSerializer):
+            child_model = nested.Meta.model
+            relation = _resolve_relation(model, field.source)
+            if relation is None:
+                continue
+            plan.add_model(child_model)
+            path = prefix + field.source
+            if relation.one_to_many or relation.many_to_many:
+                selection = _selection_of(nested)
+                child_plan = plan_eager_loading(type(nested), selection)
+                for related in child_plan.models:
+                    plan.add_model(related)
+                plan.prefetch_related.append(
+                    Prefetch(path, queryset=_child_queryset(child_model, type(nested), selection))
+                )
+            else:
+                plan.select_related.append(path)
+                plan.add_column(path)
+                _walk(nested, child_model, path + '__', plan)
+
+        elif '.' in field.source:
+            # Dotted source: follow forward relations, e.g. 'project.title'
+            current, path = model, prefix
+            for name in field.source.split('.')[:-1]:
+                relation = _resolve_relation(current, name)
+                if relation is None:
+                    plan.only = None
+                    break
+                path += name
+                current = relation.related_model
+                plan.add_model(current)
+                if relation.one_to_many or relation.many_to_many:
+                    plan.prefetch_related.append(path)
+                    break
+                plan.select_related.append(path)
+                plan.add_column(path)
+                path += '__'
+            else:
+                attribute = field.source.split('.')[-1]
+                if any(f.concrete and f.name == attribute for f in current._meta.get_fields()):
+                    plan.add_column(path + attribute)
+                else:
+                    plan.only = None
+
+        else:
+            _add_columns(serializer, field_name, field, model, prefix, plan)
+
+
+def plan_eager_loading(serializer_class, selection=ALL):
+    """Return the (memoized) eager-loading plan for a model serializer class and field selection"""
+    key = (serializer_class, selection_key(selection))
+    plan = _plans.get(key)
+    if plan is None:
+        plan = EagerLoadingPlan()
+        model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+        if model is not None:
+            serializer = serializer_class()
+            if isinstance(serializer, SparseFieldsMixin):
+                serializer._selection = selection
+            _walk(serializer, model, '', plan)
+        if len(_plans) >= MAX_PLANS:
+            _plans.clear()
+        _plans[key] = plan
+    return plan
+
+
+def eager_load(queryset, serializer_class, selection=ALL):
+    """Apply the serializer's eager-loading plan to a queryset"""
+    return plan_eager_loading(serializer_class, selection).apply(queryset)
+
+
+def ordering_columns(queryset):
+    """Plain columns of the queryset's ordering, which pagination reads back from the rows"""
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return [
+        name.lstrip('-') for name in ordering
+        if isinstance(name, str) and '__' not in name and name.lstrip('-') not in ('?', 'pk')
+    ]
+
+
+class EagerLoadingMixin:
+    """
+    Generic view mixin that eager-loads whatever the view's serializer will read,
+    for the fields selected by the request, and loads only the columns it needs.
+    Hooks ``filter_queryset`` so views that override ``get_queryset`` are covered too.
+    """
+
+    def get_selection(self):
+        if self.request.method not in ('GET', 'HEAD'):
+            return ALL
+        return selection_from_request(self.request)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['selection'] = self.get_selection()
+        return context
+
+    def get_required_columns(self, queryset):
+        """Columns read from the rows besides the serializer's"""
+        return ordering_columns(queryset)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        plan = plan_eager_loading(self.get_serializer_class(), self.get_selection())
+        queryset = plan.apply(queryset)
+        if plan.only is not None:
+            queryset = queryset.only(*plan.only, *self.get_required_columns(queryset))
+        return queryset
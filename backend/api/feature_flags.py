@@ -0,0 +1,142 @@
+"""
+In-process feature flag evaluation.
+
+All flags are loaded into a dict once and kept until the ``FeatureFlag`` cache
+tag moves on (see caching.py). The tag is checked at most once every
+``FEATURE_FLAGS_REFRESH_INTERVAL`` seconds, and a save in this process clears
+the dict straight away (see signals.py), so evaluating a flag is a dict lookup
+plus a hash and never touches the database.
+
+Percentage rollouts are deterministic: a visitor lands in one of 100 buckets
+derived from the flag name and a visitor key, so the same visitor keeps seeing
+the same variant and raising the percentage only adds visitors. Evaluating a
+partial rollout for a request makes the response per visitor: it is kept out
+of the response cache and marked ``private`` (see cache_middleware.py). The
+homepage snapshot is shared by every visitor, so data built into it must not
+be gated per visitor; gate it in the view serving the snapshot or in the
+frontend instead.
+
+Usage::
+
+    from api.feature_flags import is_enabled
+
+    if is_enabled('heavy_homepage_sections', request):
+        ...
+
+and in templates ``{% load feature_flags %}{% feature_enabled 'name' as on %}``.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+
+from . import caching
+from .models import FeatureFlag
+
+
+FEATURE_FLAG_TAG = caching.model_tag(FeatureFlag)
+
+# Request header a frontend can send to keep rollouts stable for anonymous visitors
+VISITOR_HEADER = 'HTTP_X_VISITOR_ID'
+
+_lock = threading.Lock()
+_state = {
+    'flags': None,
+    'version': None,
+    'checked_at': 0.0,
+}
+
+
+def _refresh_interval():
+    return getattr(settings, 'FEATURE_FLAGS_REFRESH_INTERVAL', 1.0)
+
+
+def _load_flags():
+    return {
+        name: (is_enabled, rollout_percentage)
+        for name, is_enabled, rollout_percentage in FeatureFlag.objects.values_list(
+            'name', 'is_enabled', 'rollout_percentage'
+        )
+    }
+
+
+def get_flags():
+    """Return ``{name: (is_enabled, rollout_percentage)}`` for every flag"""
+    caching.note_tags(FEATURE_FLAG_TAG)
+    now = time.monotonic()
+    flags = _state['flags']
+    if flags is not None and now - _state['checked_at'] < _refresh_interval():
+        return flags
+
+    version = caching.get_tag_versions([FEATURE_FLAG_TAG])[FEATURE_FLAG_TAG]
+    with _lock:
+        if _state['flags'] is None or _state['version'] != version:
+            _state['flags'] = _load_flags()
+            _state['version'] = version
+        _state['checked_at'] = now
+        return _state['flags']
+
+
+def reset():
+    """Drop the loaded flags so the next evaluation reloads them"""
+    with _lock:
+        _state['flags'] = None
+        _state['version'] = None
+
+
+def get_visitor_key(request):
+    """Stable identifier used to place a request in a rollout bucket"""
+    if request is None:
+        return None
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    visitor_id = request.META.get(VISITOR_HEADER)
+    if visitor_id:
+        return f"visitor:{visitor_id}"
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f"session:{session.session_key}"
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    address = forwarded.split(',')[0].strip() if forwarded else request.META.get('REMOTE_ADDR')
+    return f"ip:{address}" if address else None
+
+
+def rollout_bucket(name, key):
+    """Map a (flag, visitor) pair to a bucket in 0..99"""
+    digest = hashlib.sha1(f"{name}:{key}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'big') % 100
+
+
+def is_enabled(name, request=None, default=False, key=None):
+    """
+    Evaluate a flag for a request (or an explicit visitor ``key``).
+    Unknown flags return ``default``. Partial rollouts are off when no visitor
+    key can be determined.
+    """
+    flag = get_flags().get(name)
+    if flag is None:
+        return default
+
+    enabled, percentage = flag
+    if not enabled or percentage <= 0:
+        return False
+    if percentage >= 100:
+        return True
+
+    if request is not None:
+        mark_per_visitor(request)
+    if key is None:
+        key = get_visitor_key(request)
+    if key is None:
+        return False
+    return rollout_bucket(name, key) < percentage
+
+
+def mark_per_visitor(request):
+    """Keep the response to ``request`` out of shared caches: its content depends on the visitor"""
+    # DRF requests wrap the HttpRequest the cache middleware sees
+    request = getattr(request, '_request', request)
+    request._response_cache_skip = True
+    request._response_per_visitor = True
@@ -0,0 +1,145 @@
+"""
+Per-row JSON fragment cache for list responses.
+
+A list response is mostly the same serialized rows over and over. Views with
+FragmentCacheMixin keep each row's rendered JSON in the cache, keyed by
+serializer, model, primary key and ``updated_at``, and build the response by
+splicing the stored fragments into the page envelope. Only rows that changed
+since they were last rendered go through the serializer again; a page of
+unchanged rows costs one ``cache.get_many()``.
+
+A fragment key also carries a digest of what else shapes the row's JSON: the
+``?fields=``/``?expand=`` selection, the scheme and host used for absolute
+file URLs, and the cache tag versions of the related models the serializer
+embeds (see eager_loading.py). Models without ``updated_at`` are keyed on
+their own tag version instead. Counter columns flushed with ``update()`` do
+not move ``updated_at``; views listing them in ``counter_fields`` also key
+their fragments on the model's counter tag, which every flush bumps.
+
+The spliced output is byte-for-byte what JSONRenderer would produce: rows are
+rendered by the same renderer, and FragmentJSONRenderer renders the envelope
+and inserts the rows. Requests asking for indented JSON skip the cache.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import caching
+from .eager_loading import plan_eager_loading
+from .sparse_fields import selection_key
+
+
+FRAGMENT_KEY_PREFIX = 'api:fragment:'
+VERSION_FIELD = 'updated_at'
+
+# Stands in for the rows while the envelope is rendered
+PLACEHOLDER = '\x00fragments\x00'
+
+
+class EncodedRows(list):
+    """Rendered JSON rows (bytes), spliced into the output by FragmentJSONRenderer"""
+
+    def render(self):
+        return b'[' + b','.join(self) + b']'
+
+
+class FragmentJSONRenderer(JSONRenderer):
+    """JSONRenderer that splices EncodedRows into the rendered document"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, EncodedRows):
+            return data.render()
+        if not isinstance(data, dict) or not any(isinstance(value, EncodedRows) for value in data.values()):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        rows = {}
+        envelope = {}
+        for name, value in data.items():
+            if isinstance(value, EncodedRows):
+                rows[name] = value
+                value = f'{PLACEHOLDER}{name}'
+            envelope[name] = value
+        output = super().render(envelope, accepted_media_type, renderer_context)
+        for name, value in rows.items():
+            token = super().render(f'{PLACEHOLDER}{name}')
+            output = output.replace(token, value.render(), 1)
+        return output
+
+
+def _version(instance):
+    value = getattr(instance, VERSION_FIELD, None)
+    return repr(value.timestamp()) if value is not None else None
+
+
+def variant_digest(*parts):
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def fragment_key(serializer_class, instance, version, variant):
+    serializer_name = f'{serializer_class.__module__}.{serializer_class.__qualname__}'
+    return f'{FRAGMENT_KEY_PREFIX}{serializer_name}:{instance._meta.label}:{instance.pk}:{version}:{variant}'
+
+
+class FragmentCacheMixin:
+    """
+    List view mixin rendering rows through the fragment cache. Goes before
+    EagerLoadingMixin, whose ``.only()`` it extends with ``updated_at``.
+    """
+
+    def use_fragments(self, request):
+        if not getattr(settings, 'FRAGMENT_CACHE_ENABLED', True):
+            return False
+        if not isinstance(getattr(request, 'accepted_renderer', None), FragmentJSONRenderer):
+            return False
+        # Indented output would not match the compact fragments
+        return 'indent' not in (request.accepted_media_type or '')
+
+    def get_required_columns(self, queryset):
+        columns = super().get_required_columns(queryset)
+        if any(field.name == VERSION_FIELD for field in queryset.model._meta.concrete_fields):
+            columns = columns + [VERSION_FIELD]
+        return columns
+
+    def get_fragment_variant(self, model):
+        selection = self.get_selection()
+        models = list(plan_eager_loading(self.get_serializer_class(), selection).models)
+        if not any(field.name == VERSION_FIELD for field in model._meta.concrete_fields):
+            models.append(model)
+        tags = [caching.model_tag(related) for related in models]
+        if getattr(self, 'counter_fields', ()):
+            tags.append(caching.counter_tag(model))
+        versions = caching.get_tag_versions(tags)
+        return variant_digest(selection_key(selection), self.request.build_absolute_uri('/'), sorted(versions.items()))
+
+    def get_fragments(self, rows):
+        """Rendered JSON of every row, serializing only the rows missing from the cache"""
+        if not rows:
+            return EncodedRows()
+        serializer_class = self.get_serializer_class()
+        variant = self.get_fragment_variant(type(rows[0]))
+        keys = [fragment_key(serializer_class, row, _version(row), variant) for row in rows]
+        fragments = cache.get_many(keys)
+
+        missing = [(key, row) for key, row in zip(keys, rows) if key not in fragments]
+        if missing:
+            data = self.get_serializer([row for _, row in missing], many=True).data
+            renderer = FragmentJSONRenderer()
+            rendered = {key: renderer.render(item) for (key, _), item in zip(missing, data)}
+            cache.set_many(rendered, timeout=getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 60 * 60))
+            fragments.update(rendered)
+        return EncodedRows(fragments[key] for key in keys)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fragments(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(page if page is not None else queryset)
+        fragments = self.get_fragments(rows)
+        if page is not None:
+            return self.get_paginated_response(fragments)
+        return Response(fragments)
@@ -0,0 +1,92 @@
+"""
+HyperLogLog distinct counting.
+
+A sketch estimates how many distinct values were added to it using a fixed
+``2 ** precision`` one-byte registers, whatever the number of values: with the
+default precision of 12 that is 4 KiB and a standard error of about 1.6%.
+Sketches of the same precision merge losslessly (register-wise max), so
+per-worker sketches can be combined into a day, and days into a week or a
+month, without keeping any visitor identifiers.
+
+``to_bytes()`` stores the registers zlib-compressed, which keeps the sketch of
+a quiet day to a few hundred bytes.
+"""
+import hashlib
+import math
+import zlib
+
+
+DEFAULT_PRECISION = 12
+FORMAT_MARKER = b'H'
+
+# 2 ** -rank for every possible register value
+_INVERSE_POWERS = [2.0 ** -rank for rank in range(65)]
+
+
+class HyperLogLog:
+    """A mergeable distinct-count sketch"""
+
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        if not 4 <= precision <= 16:
+            raise ValueError('HyperLogLog precision must be between 4 and 16')
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError('HyperLogLog register count does not match its precision')
+
+    def add(self, value):
+        """Add a value (str or bytes)"""
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        hashed = int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rest = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """Fold another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError('Cannot merge HyperLogLog sketches of different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        """Estimated number of distinct values added"""
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size) if size >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[size]
+        estimate = alpha * size * size / sum(_INVERSE_POWERS[rank] for rank in self.registers)
+        if estimate <= 2.5 * size:
+            # Small range correction: linear counting over the empty registers
+            zeros = self.registers.count(0)
+            if zeros:
+                estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+    def to_bytes(self):
+        return FORMAT_MARKER + bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data, precision=DEFAULT_PRECISION):
+        """Load a stored sketch; empty data gives an empty sketch"""
+        if not data:
+            return cls(precision)
+        data = bytes(data)
+        if data[:1] != FORMAT_MARKER:
+            raise ValueError('Not a HyperLogLog sketch')
+        return cls(data[1], zlib.decompress(data[2:]))
+
+    @classmethod
+    def merged(cls, blobs, precision=DEFAULT_PRECISION):
+        """Merge stored sketches into one"""
+        sketch = cls(precision)
+        for blob in blobs:
+            if blob:
+                sketch.merge(cls.from_bytes(blob))
+        return sketch
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.query_plans import explain_views
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the queryset of every API view and report sequential scans and sorts outside an index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not only problems')
+        parser.add_argument(
+            '--strict', action='store_true', help='Exit with an error when any view has a problem',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            plans = explain_views()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        flagged = 0
+        for plan in plans:
+            if plan.problems:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f'{plan.name}: {", ".join(plan.problems)}'))
+            elif options['verbose_plans']:
+                self.stdout.write(f'{plan.name}: ok')
+            if plan.problems or options['verbose_plans']:
+                for line in plan.plan.splitlines():
+                    self.stdout.write(f'    {line}')
+
+        summary = f'{flagged} of {len(plans)} views need attention'
+        if flagged and options['strict']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary) if not flagged else summary)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.technologies import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recount the technology usage index from the projects'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding technology usage...')
+        with transaction.atomic():
+            total = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Counted {total} technologies'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.seo_files import get_root, render_files
+
+
+class Command(BaseCommand):
+    help = 'Render the sitemap shards, sitemap index and robots.txt to SEO_FILES_ROOT'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            help='Site URL used in the sitemap, e.g. https://example.com (defaults to the last one used)',
+        )
+        parser.add_argument(
+            '--force', action='store_true', help='Render every file, even sections that have not changed',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Rendering SEO files to {get_root()}...')
+        try:
+            result = render_files(options['base_url'], force=options['force'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {result['written']} of {result['files']} files"
+        ))
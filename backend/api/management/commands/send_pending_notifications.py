@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.notifications import MESSAGE_BUILDERS, Notification, deliver
+
+
+class Command(BaseCommand):
+    help = 'Send form notifications that were deferred by a full queue or failed every attempt'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=5,
+            help='Only pick up rows created at least this many minutes ago (default: 5)'
+        )
+        parser.add_argument(
+            '--include-failed', action='store_true',
+            help='Also retry rows whose previous attempts all failed'
+        )
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['include_failed'] else ['pending']
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        sent = failed = 0
+
+        for label, build_messages in MESSAGE_BUILDERS.items():
+            model = apps.get_model(label)
+            rows = model.objects.filter(notification_status__in=statuses, created_at__lte=cutoff)
+            for row in rows.iterator():
+                if deliver(Notification(build_messages(row), record=row)):
+                    sent += 1
+                else:
+                    failed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} notifications, {failed} failed'))
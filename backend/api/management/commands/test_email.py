@@ -1,11 +1,32 @@
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+import time
+
+from django.core.mail import EmailMessage, send_mail
 from django.conf import settings
 
+from api.smtp_pool import get_pool
+
 class Command(BaseCommand):
     help = 'Test email configuration'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--benchmark', type=int, default=0, metavar='N',
+            help='Send N messages through the SMTP connection pool and report messages per second',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=20,
+            help='Messages per send_messages call when benchmarking',
+        )
+        parser.add_argument(
+            '--to', default=None,
+            help='Recipient for benchmark messages (defaults to ADMIN_EMAIL)',
+        )
+
     def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.benchmark(options['benchmark'], options['batch_size'], options['to'])
+
         self.stdout.write('Testing email configuration...')
         
         # Show current email settings
@@ -52,4 +73,34 @@ Configuration details:
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error sending email: {e}'))
             import traceback
-            self.stdout.write(traceback.format_exc())
\ No newline at end of file
+            self.stdout.write(traceback.format_exc())
+
+    def benchmark(self, count, batch_size, recipient):
+        """Push ``count`` messages through the pool in batches and report throughput"""
+        recipient = recipient or settings.ADMIN_EMAIL
+        messages = [
+            EmailMessage(f'Benchmark message {i + 1}/{count}', 'SMTP pool benchmark.',
+                         settings.DEFAULT_FROM_EMAIL, [recipient])
+            for i in range(count)
+        ]
+        batches = [messages[i:i + batch_size] for i in range(0, count, batch_size)]
+
+        pool = get_pool()
+        self.stdout.write(f'Sending {count} messages in {len(batches)} batches via {settings.EMAIL_BACKEND}...')
+        started = time.perf_counter()
+        results = pool.send_batches(batches)
+        elapsed = time.perf_counter() - started
+        pool.close()
+
+        sent = sum(result[0] for result in results)
+        errors = {str(error) for _, error in results if error is not None}
+        for error in errors:
+            self.stdout.write(self.style.ERROR(f'Error sending email: {error}'))
+
+        stats = pool.stats()
+        self.stdout.write(
+            f'Sent {sent}/{count} messages in {elapsed:.2f}s '
+            f'({sent / elapsed if elapsed else 0:.1f} msg/s), '
+            f'connections opened: {stats["connections_opened"]}, reconnects: {stats["reconnects"]}, '
+            f'circuit: {stats["circuit_state"]}'
+        )
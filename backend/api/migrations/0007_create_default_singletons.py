@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+# Copied from api.singletons so the migration does not depend on application code
+COMPANY_INFO_DEFAULTS = {
+    'company_name': 'site gen it',
+    'email': 'info@agency.com',
+    'tagline': 'Your Creative Digital Partner',
+    'description': 'We create innovative digital solutions that drive business growth.',
+}
+
+SITE_SETTINGS_DEFAULTS = {
+    'site_name': 'site gen it',
+    'site_description': 'Your Creative Digital Partner',
+    'contact_email': 'contact@agency.com',
+    'support_email': 'support@agency.com',
+    'primary_color': '#00f5ff',
+    'secondary_color': '#9966ff',
+}
+
+
+def create_default_singletons(apps, schema_editor):
+    """Create the CompanyInfo and SiteSettings rows the views used to get_or_create on read"""
+    CompanyInfo = apps.get_model('api', 'CompanyInfo')
+    SiteSettings = apps.get_model('api', 'SiteSettings')
+
+    if not CompanyInfo.objects.exists():
+        CompanyInfo.objects.create(id=1, **COMPANY_INFO_DEFAULTS)
+    if not SiteSettings.objects.exists():
+        SiteSettings.objects.create(id=1, **SITE_SETTINGS_DEFAULTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_add_seo_models'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_singletons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:17
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_create_default_singletons'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureflag',
+            name='rollout_percentage',
+            field=models.PositiveSmallIntegerField(default=100, help_text='Share of visitors (0-100) that get the feature while it is enabled', validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
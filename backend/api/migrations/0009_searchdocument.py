@@ -0,0 +1,152 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:19
+
+from django.db import migrations, models
+
+
+SQLITE_FULLTEXT = [
+    """
+    CREATE VIRTUAL TABLE api_searchdocument_fts USING fts5(
+        title, body, content_type, object_id UNINDEXED,
+        content='api_searchdocument', content_rowid='id', tokenize='porter unicode61', prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER api_searchdocument_fts_insert AFTER INSERT ON api_searchdocument BEGIN
+        INSERT INTO api_searchdocument_fts(rowid, title, body, content_type, object_id)
+        VALUES (new.id, new.title, new.body, new.content_type, new.object_id);
+    END
+    """,
+    """
+    CREATE TRIGGER api_searchdocument_fts_delete AFTER DELETE ON api_searchdocument BEGIN
+        INSERT INTO api_searchdocument_fts(api_searchdocument_fts, rowid, title, body, content_type, object_id)
+        VALUES ('delete', old.id, old.title, old.body, old.content_type, old.object_id);
+    END
+    """,
+    """
+    CREATE TRIGGER api_searchdocument_fts_update AFTER UPDATE ON api_searchdocument BEGIN
+        INSERT INTO api_searchdocument_fts(api_searchdocument_fts, rowid, title, body, content_type, object_id)
+        VALUES ('delete', old.id, old.title, old.body, old.content_type, old.object_id);
+        INSERT INTO api_searchdocument_fts(rowid, title, body, content_type, object_id)
+        VALUES (new.id, new.title, new.body, new.content_type, new.object_id);
+    END
+    """,
+]
+
+SQLITE_FULLTEXT_REVERSE = [
+    "DROP TRIGGER IF EXISTS api_searchdocument_fts_update",
+    "DROP TRIGGER IF EXISTS api_searchdocument_fts_delete",
+    "DROP TRIGGER IF EXISTS api_searchdocument_fts_insert",
+    "DROP TABLE IF EXISTS api_searchdocument_fts",
+]
+
+# The expression must match api.search.POSTGRES_VECTOR for the index to be used
+POSTGRES_FULLTEXT = [
+    """
+    CREATE INDEX api_searchdocument_fts_idx ON api_searchdocument USING GIN ((
+        setweight(to_tsvector('english', title), 'A') ||
+        setweight(to_tsvector('english', body), 'B')
+    ))
+    """,
+]
+
+POSTGRES_FULLTEXT_REVERSE = [
+    "DROP INDEX IF EXISTS api_searchdocument_fts_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Create the vendor's full-text index; other databases fall back to LIKE scans"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _run(schema_editor, SQLITE_FULLTEXT)
+        except Exception as e:
+            # SQLite built without FTS5
+            print(f"Failed to create FTS5 search index, search will use LIKE: {e}")
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FULLTEXT)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FULLTEXT_REVERSE)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FULLTEXT_REVERSE)
+
+
+# Searchable models as of this migration: (content type, model, title field, body fields, public filter).
+# Frozen here so the backfill does not depend on api.search; later changes go through rebuild_search_index.
+SEARCHABLE = [
+    ('projects', 'Project', 'title', ['description', 'detailed_description', 'technologies', 'client_name'], {}),
+    ('blog_posts', 'BlogPost', 'title', ['excerpt', 'content', 'tags'], {'is_published': True}),
+    ('services', 'Service', 'name', ['short_description', 'description', 'features'], {'is_active': True}),
+    ('help_articles', 'HelpArticle', 'title', ['excerpt', 'content'], {'is_published': True}),
+    ('case_studies', 'CaseStudy', 'title',
+     ['client_name', 'challenge', 'solution', 'results', 'technologies_used'], {'is_published': True}),
+    ('jobs', 'JobPosition', 'title', ['department', 'description', 'requirements', 'responsibilities'],
+     {'is_active': True}),
+]
+
+BATCH_SIZE = 1000
+
+
+def document_text(values, title_field, body_fields):
+    parts = []
+    for field in body_fields:
+        value = values.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value)
+        elif isinstance(value, dict):
+            parts.extend(str(item) for item in value.values())
+        elif value:
+            parts.append(str(value))
+    return str(values.get(title_field) or '')[:300], '\n'.join(parts)
+
+
+def populate_search_index(apps, schema_editor):
+    SearchDocument = apps.get_model('api', 'SearchDocument')
+    for content_type, model_name, title_field, body_fields, public_filter in SEARCHABLE:
+        model = apps.get_model('api', model_name)
+        rows = model.objects.filter(**public_filter).values('pk', title_field, *body_fields)
+        batch = []
+        for values in rows.iterator(chunk_size=BATCH_SIZE):
+            title, body = document_text(values, title_field, body_fields)
+            batch.append(SearchDocument(content_type=content_type, object_id=values['pk'], title=title, body=body))
+            if len(batch) >= BATCH_SIZE:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_featureflag_rollout_percentage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=300)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmessage',
+            name='notification_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='contactmessage',
+            name='notification_error',
+            field=models.TextField(blank=True),
+        ),
+        # Existing rows were notified synchronously without tracking; new rows start as pending
+        migrations.AddField(
+            model_name='contactmessage',
+            name='notification_status',
+            field=models.CharField(choices=[('unknown', 'Unknown'), ('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='unknown', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='contactmessage',
+            name='notification_status',
+            field=models.CharField(choices=[('unknown', 'Unknown'), ('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='contactmessage',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='meetingrequest',
+            name='notification_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='meetingrequest',
+            name='notification_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='meetingrequest',
+            name='notification_status',
+            field=models.CharField(choices=[('unknown', 'Unknown'), ('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='unknown', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='meetingrequest',
+            name='notification_status',
+            field=models.CharField(choices=[('unknown', 'Unknown'), ('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='meetingrequest',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:41
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def populate_technology_usage(apps, schema_editor):
+    """Count the distinct technologies of every project (same rules as api.technologies.normalize)"""
+    Project = apps.get_model('api', 'Project')
+    TechnologyUsage = apps.get_model('api', 'TechnologyUsage')
+
+    counts = Counter()
+    for technologies in Project.objects.values_list('technologies', flat=True).iterator(chunk_size=2000):
+        if isinstance(technologies, (list, tuple)):
+            counts.update({
+                name.strip()[:100] for name in technologies if isinstance(name, str) and name.strip()
+            })
+    TechnologyUsage.objects.bulk_create(
+        [TechnologyUsage(name=name, project_count=count) for name, count in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_notification_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TechnologyUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('project_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Technology Usage',
+                'verbose_name_plural': 'Technology Usage',
+                'ordering': ['-project_count', 'name'],
+                'indexes': [models.Index(fields=['-project_count', 'name'], name='api_techusage_top_idx')],
+            },
+        ),
+        migrations.RunPython(populate_technology_usage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_technologyusage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='visitorstatistics',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_visitorstatistics_date_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitorSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.localdate)),
+                ('page_type', models.CharField(choices=[('all', 'All pages'), ('home', 'Home'), ('about', 'About'), ('services', 'Services'), ('portfolio', 'Portfolio'), ('contact', 'Contact'), ('blog', 'Blog'), ('other', 'Other pages')], default='all', max_length=20)),
+                ('sketch', models.BinaryField(default=bytes)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Visitor Sketch',
+                'verbose_name_plural': 'Visitor Sketches',
+                'ordering': ['-date', 'page_type'],
+                'unique_together': {('date', 'page_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:17
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_visitorsketch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=api.models.NullsLastIndex(models.OrderBy(models.F('is_featured'), descending=True), models.OrderBy(models.F('published_at'), descending=True, nulls_last=True), models.F('id'), condition=models.Q(('is_published', True)), name='api_blogpost_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-published_at'], name='api_blogpost_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casestudy',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-is_featured', '-created_at', 'id'], name='api_casestudy_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casestudy',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['industry', '-is_featured', '-created_at', 'id'], name='api_casestudy_industry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at', 'id'], name='api_contact_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['notification_status', 'created_at'], name='api_contact_notify_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='helparticle',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-is_featured', '-helpful_votes', '-created_at', 'id'], name='api_help_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='helparticle',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', '-is_featured', '-helpful_votes', '-created_at', 'id'], name='api_help_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposition',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-is_featured', '-created_at', 'id'], name='api_job_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposition',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['department', '-is_featured', '-created_at', 'id'], name='api_job_department_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposition',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['-created_at'], name='api_job_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-is_featured', '-created_at', 'id'], name='api_project_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['category', '-is_featured', '-created_at', 'id'], name='api_project_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['department', 'order', 'name'], name='api_team_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['order'], name='api_team_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_composite_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmessage',
+            name='source',
+            field=models.CharField(choices=[('contact', 'Contact form'), ('quick_contact', 'Quick contact form')], default='contact', max_length=20),
+        ),
+    ]
@@ -1,10 +1,34 @@
+import copy
+
 from django.db import models
+from django.db.models import F, OrderBy, Q
 from django.contrib.auth.models import User
-from django.core.validators import MinLengthValidator, MaxLengthValidator
+from django.core.validators import MinLengthValidator, MaxLengthValidator, MaxValueValidator
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 
+class NullsLastIndex(models.Index):
+    """
+    Index with ``desc(nulls_last=True)`` columns, matching the NULLS LAST order
+    the keyset pagination uses for nullable columns. SQLite rejects the
+    modifier in CREATE INDEX but already sorts NULLs last when descending, so
+    it gets the plain descending column.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'sqlite':
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        index = copy.copy(self)
+        index.expressions = tuple(
+            OrderBy(expression.expression, descending=True)
+            if isinstance(expression, OrderBy) and expression.descending and expression.nulls_last
+            else expression
+            for expression in self.expressions
+        )
+        return super(NullsLastIndex, index).create_sql(model, schema_editor, using=using, **kwargs)
+
+
 class Project(models.Model):
     CATEGORY_CHOICES = [
         ('web', 'Web Development'),
@@ -32,6 +56,10 @@ class Project(models.Model):
     
     class Meta:
         ordering = ['-is_featured', '-created_at']
+        indexes = [
+            models.Index(fields=['-is_featured', '-created_at', 'id'], name='api_project_listing_idx'),
+            models.Index(fields=['category', '-is_featured', '-created_at', 'id'], name='api_project_category_idx'),
+        ]
         
     def __str__(self):
         return self.title
@@ -56,6 +84,14 @@ class Testimonial(models.Model):
         return f"{self.name} - {self.company}"
 
 
+NOTIFICATION_STATUS_CHOICES = [
+    ('unknown', 'Unknown'),  # Rows created before delivery was tracked
+    ('pending', 'Pending'),
+    ('sent', 'Sent'),
+    ('failed', 'Failed'),
+]
+
+
 class ContactMessage(models.Model):
     MESSAGE_TYPES = [
         ('general', 'General Inquiry'),
@@ -71,6 +107,11 @@ class ContactMessage(models.Model):
         ('closed', 'Closed'),
     ]
     
+    SOURCE_CHOICES = [
+        ('contact', 'Contact form'),
+        ('quick_contact', 'Quick contact form'),
+    ]
+    
     name = models.CharField(max_length=100)
     email = models.EmailField()
     phone = models.CharField(max_length=20, blank=True)
@@ -81,11 +122,22 @@ class ContactMessage(models.Model):
     budget_range = models.CharField(max_length=50, blank=True)
     project_timeline = models.CharField(max_length=100, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
+    # The form the message came from; its notification is worded after it
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='contact')
+    # Email notification delivery (see api/notifications.py)
+    notification_status = models.CharField(max_length=10, choices=NOTIFICATION_STATUS_CHOICES, default='pending')
+    notification_attempts = models.PositiveSmallIntegerField(default=0)
+    notification_error = models.TextField(blank=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='api_contact_recent_idx'),
+            models.Index(fields=['notification_status', 'created_at'], name='api_contact_notify_idx'),
+        ]
         
     def __str__(self):
         return f"{self.name} - {self.subject}"
@@ -127,6 +179,13 @@ class BlogPost(models.Model):
     
     class Meta:
         ordering = ['-is_featured', '-published_at']
+        indexes = [
+            NullsLastIndex(
+                F('is_featured').desc(), F('published_at').desc(nulls_last=True), 'id',
+                condition=Q(is_published=True), name='api_blogpost_listing_idx',
+            ),
+            models.Index(fields=['-published_at'], condition=Q(is_published=True), name='api_blogpost_recent_idx'),
+        ]
         
     def save(self, *args, **kwargs):
         if self.is_published and not self.published_at:
@@ -187,6 +246,17 @@ class HelpArticle(models.Model):
     
     class Meta:
         ordering = ['-is_featured', '-helpful_votes', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['-is_featured', '-helpful_votes', '-created_at', 'id'], condition=Q(is_published=True),
+                name='api_help_listing_idx',
+            ),
+            models.Index(
+                fields=['category', '-is_featured', '-helpful_votes', '-created_at', 'id'],
+                condition=Q(is_published=True),
+                name='api_help_category_idx',
+            ),
+        ]
         
     def __str__(self):
         return self.title
@@ -226,6 +296,16 @@ class CaseStudy(models.Model):
     
     class Meta:
         ordering = ['-is_featured', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['-is_featured', '-created_at', 'id'], condition=Q(is_published=True),
+                name='api_casestudy_listing_idx',
+            ),
+            models.Index(
+                fields=['industry', '-is_featured', '-created_at', 'id'], condition=Q(is_published=True),
+                name='api_casestudy_industry_idx',
+            ),
+        ]
         verbose_name_plural = "Case Studies"
         
     def __str__(self):
@@ -271,6 +351,11 @@ class MeetingRequest(models.Model):
     
     # System Fields
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Email notification delivery (see api/notifications.py)
+    notification_status = models.CharField(max_length=10, choices=NOTIFICATION_STATUS_CHOICES, default='pending')
+    notification_attempts = models.PositiveSmallIntegerField(default=0)
+    notification_error = models.TextField(blank=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -522,6 +607,14 @@ class TeamMember(models.Model):
     
     class Meta:
         ordering = ['department', 'order', 'name']
+        indexes = [
+            models.Index(
+                fields=['department', 'order', 'name'], condition=Q(is_active=True), name='api_team_listing_idx',
+            ),
+            models.Index(
+                fields=['order'], condition=Q(is_active=True, is_featured=True), name='api_team_featured_idx',
+            ),
+        ]
         verbose_name = "Team Member"
         verbose_name_plural = "Team Members"
         
@@ -575,6 +668,18 @@ class JobPosition(models.Model):
     
     class Meta:
         ordering = ['-is_featured', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['-is_featured', '-created_at', 'id'], condition=Q(is_active=True), name='api_job_listing_idx',
+            ),
+            models.Index(
+                fields=['department', '-is_featured', '-created_at', 'id'], condition=Q(is_active=True),
+                name='api_job_department_idx',
+            ),
+            models.Index(
+                fields=['-created_at'], condition=Q(is_active=True, is_featured=True), name='api_job_featured_idx',
+            ),
+        ]
         verbose_name = "Job Position"
         verbose_name_plural = "Job Positions"
         
@@ -593,6 +698,11 @@ class FeatureFlag(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     is_enabled = models.BooleanField(default=True)
+    rollout_percentage = models.PositiveSmallIntegerField(
+        default=100,
+        validators=[MaxValueValidator(100)],
+        help_text="Share of visitors (0-100) that get the feature while it is enabled"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -720,7 +830,7 @@ class DynamicSection(models.Model):
 
 class VisitorStatistics(models.Model):
     """Track visitor statistics for dashboard"""
-    date = models.DateField(auto_now_add=True)
+    date = models.DateField(default=timezone.localdate)
     page_views = models.PositiveIntegerField(default=0)
     unique_visitors = models.PositiveIntegerField(default=0)
     bounce_rate = models.FloatField(default=0.0)
@@ -757,6 +867,38 @@ class VisitorStatistics(models.Model):
         return f"Stats for {self.date} - {self.page_views} views"
 
 
+class VisitorSketch(models.Model):
+    """
+    HyperLogLog sketch of the visitors seen on one day, site-wide or for one
+    page type (see api/hyperloglog.py). Sketches merge across days, so weekly
+    and monthly unique visitors never scan per-visitor rows.
+    """
+    PAGE_TYPES = [
+        ('all', 'All pages'),
+        ('home', 'Home'),
+        ('about', 'About'),
+        ('services', 'Services'),
+        ('portfolio', 'Portfolio'),
+        ('contact', 'Contact'),
+        ('blog', 'Blog'),
+        ('other', 'Other pages'),
+    ]
+    
+    date = models.DateField(default=timezone.localdate)
+    page_type = models.CharField(max_length=20, choices=PAGE_TYPES, default='all')
+    sketch = models.BinaryField(default=bytes)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-date', 'page_type']
+        unique_together = ['date', 'page_type']
+        verbose_name = "Visitor Sketch"
+        verbose_name_plural = "Visitor Sketches"
+        
+    def __str__(self):
+        return f"Visitor sketch for {self.date} ({self.page_type})"
+
+
 # =============================================================================
 # SEO OPTIMIZATION MODELS FOR TOP GOOGLE RANKINGS
 # =============================================================================
@@ -1056,6 +1198,11 @@ class RedirectRule(models.Model):
     def __str__(self):
         return f"{self.source_url} → {self.destination_url} ({self.redirect_type})"
 
+    def clean(self):
+        from .redirects import creates_loop
+        if self.is_active and creates_loop(self.source_url, self.destination_url, exclude_pk=self.pk):
+            raise ValidationError("This redirect would send visitors back to where they started")
+
 
 class RobotsTxt(models.Model):
     """Robots.txt configuration"""
@@ -1080,4 +1227,42 @@ class RobotsTxt(models.Model):
         # Ensure only one instance exists
         if not self.pk and RobotsTxt.objects.exists():
             raise ValidationError('Only one Robots.txt instance is allowed')
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class SearchDocument(models.Model):
+    """
+    Denormalized text of one searchable row (see api/search.py).
+    The full-text index over title and body is created by migration 0009:
+    an FTS5 table on SQLite, a GIN tsvector index on PostgreSQL.
+    """
+    content_type = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['content_type', 'object_id']
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        
+    def __str__(self):
+        return f"{self.content_type}:{self.object_id} {self.title}"
+
+
+class TechnologyUsage(models.Model):
+    """
+    Number of projects listing each technology (see api/technologies.py).
+    Maintained on every Project save/delete.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    project_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-project_count', 'name']
+        indexes = [models.Index(fields=['-project_count', 'name'], name='api_techusage_top_idx')]
+        verbose_name = "Technology Usage"
+        verbose_name_plural = "Technology Usage"
+        
+    def __str__(self):
+        return f"{self.name} ({self.project_count})"
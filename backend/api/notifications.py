@@ -0,0 +1,333 @@
+"""
+Email notifications sent off the request path.
+
+Form views build their messages with the ``*_emails`` helpers below and hand
+them to ``notify()``. Once the transaction commits, the messages go on a
+bounded queue served by a small pool of worker threads, so a form POST returns
+without waiting for SMTP. Workers drain up to ``NOTIFICATIONS_BATCH_SIZE`` jobs
+at a time and send them over one pooled connection (see smtp_pool.py); a job
+that fails is retried on its own with exponential backoff, and the outcome is
+recorded on the ``notification_*`` fields of the row it belongs to
+(ContactMessage, MeetingRequest).
+
+Backpressure: if the queue stays full for ``NOTIFICATIONS_ENQUEUE_TIMEOUT``
+seconds the job is not queued; its row keeps ``notification_status='pending'``
+and ``manage.py send_pending_notifications`` delivers it later.
+
+While the mail server circuit is open, jobs are not attempted at all and stay
+pending for ``send_pending_notifications``.
+
+Set ``NOTIFICATIONS_ASYNC = False`` to send inline (tests do this).
+"""
+import queue
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .smtp_pool import CircuitOpenError, get_pool
+
+
+class Notification:
+    """A batch of email messages, optionally tied to the row whose delivery status it updates"""
+
+    def __init__(self, messages, record=None):
+        self.messages = messages
+        self.model_label = record._meta.label if record is not None else None
+        self.object_id = record.pk if record is not None else None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _message(subject, body, recipient):
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [recipient])
+
+
+# =============================================================================
+# MESSAGES
+# =============================================================================
+
+def contact_message_emails(contact_message):
+    """Admin notification for a contact form submission, worded after the form it came from"""
+    form_name = contact_message.get_source_display().lower()
+    label = 'Quick Contact' if contact_message.source == 'quick_contact' else 'Contact Message'
+    subject = f"New {label}: {contact_message.subject}"
+    message = f"""
+New {label.lower()} received:
+
+Name: {contact_message.name}
+Email: {contact_message.email}
+Phone: {contact_message.phone or 'Not provided'}
+Subject: {contact_message.subject}
+Message Type: {contact_message.get_message_type_display()}
+Message:
+{contact_message.message}
+
+This message was sent from the {form_name} on your website.
+                """
+    return [_message(subject, message, settings.ADMIN_EMAIL)]
+
+
+def newsletter_emails(subscriber):
+    """Admin notification and welcome email for a newsletter subscription"""
+    subject = f"New Newsletter Subscriber: {subscriber.email}"
+    message = f"""
+New newsletter subscription:
+
+Email: {subscriber.email}
+Name: {subscriber.name or 'Not provided'}
+Subscription Date: {subscriber.subscribed_at}
+
+This subscription was made through the website newsletter form.
+                """
+
+    welcome_subject = "Welcome to Our Newsletter!"
+    welcome_message = f"""
+Thank you for subscribing to our newsletter, {subscriber.name or 'there'}!
+
+You'll now receive updates about our latest projects, industry insights, and special offers.
+
+Best regards,
+The Team
+                """
+    return [
+        _message(subject, message, settings.ADMIN_EMAIL),
+        _message(welcome_subject, welcome_message, subscriber.email),
+    ]
+
+
+def registration_emails(user):
+    """Admin notification and welcome email for a new user"""
+    subject = f"New User Registration: {user.email}"
+    message = f"""
+New user registration:
+
+Name: {user.get_full_name()}
+Email: {user.email}
+Registration Date: {user.date_joined}
+
+This user registered through the website.
+                """
+
+    welcome_subject = "Welcome to Our Platform!"
+    welcome_message = f"""
+Dear {user.get_full_name()},
+
+Welcome to our platform! Thank you for registering.
+
+You can now access all our features and services.
+
+Best regards,
+The Team
+                """
+    return [
+        _message(subject, message, settings.ADMIN_EMAIL),
+        _message(welcome_subject, welcome_message, user.email),
+    ]
+
+
+def meeting_request_emails(meeting_request):
+    """Admin notification and confirmation email for a meeting request"""
+    subject = f"New Meeting Request from {meeting_request.name}"
+    message = f"""
+New meeting request received:
+
+Contact Information:
+- Name: {meeting_request.name}
+- Email: {meeting_request.email}
+- Phone: {meeting_request.phone or 'Not provided'}
+- Company: {meeting_request.company or 'Not provided'}
+
+Meeting Details:
+- Type: {meeting_request.get_meeting_type_display()}
+- Preferred Date: {meeting_request.preferred_date}
+- Preferred Time: {meeting_request.get_preferred_time_display()}
+
+Project Description:
+{meeting_request.project_description}
+
+Request ID: {meeting_request.id}
+Submitted: {meeting_request.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+
+Please log in to the admin panel to manage this request:
+http://localhost:8000/admin/api/meetingrequest/{meeting_request.id}/
+                """
+
+    confirmation_subject = "Meeting Request Confirmation"
+    confirmation_message = f"""
+Dear {meeting_request.name},
+
+Thank you for your meeting request. We've received your request and will contact you within 24 hours to confirm the details.
+
+Meeting Request Details:
+- Meeting Type: {meeting_request.get_meeting_type_display()}
+- Preferred Date: {meeting_request.preferred_date}
+- Preferred Time: {meeting_request.get_preferred_time_display()}
+
+If you have any questions, please contact us at {settings.MEETING_REQUEST_EMAIL}.
+
+Best regards,
+The Team
+                """
+    return [
+        _message(subject, message, settings.MEETING_REQUEST_EMAIL),
+        _message(confirmation_subject, confirmation_message, meeting_request.email),
+    ]
+
+
+# Rebuilds the messages of a tracked row, used when retrying pending deliveries
+MESSAGE_BUILDERS = {
+    'api.ContactMessage': contact_message_emails,
+    'api.MeetingRequest': meeting_request_emails,
+}
+
+
+# =============================================================================
+# DELIVERY
+# =============================================================================
+
+def record_status(notification, status, attempts, error=''):
+    """Store the delivery outcome on the row the notification belongs to"""
+    if notification.model_label is None:
+        return
+    model = apps.get_model(notification.model_label)
+    model.objects.filter(pk=notification.object_id).update(
+        notification_status=status,
+        notification_attempts=F('notification_attempts') + attempts,
+        notification_error=error[:1000],
+        notified_at=timezone.now() if status == 'sent' else None,
+    )
+
+
+def deliver(notification, retry_delay=None, attempts_made=0):
+    """Send a notification over a pooled connection, retrying with exponential backoff"""
+    max_attempts = _setting('NOTIFICATIONS_MAX_ATTEMPTS', 3)
+    if retry_delay is None:
+        retry_delay = _setting('NOTIFICATIONS_RETRY_DELAY', 2)
+
+    error = ''
+    for attempt in range(attempts_made + 1, max_attempts + 1):
+        try:
+            get_pool().send_messages(notification.messages)
+            record_status(notification, 'sent', attempt)
+            return True
+        except CircuitOpenError as e:
+            print(f"Email notification deferred: {e}")
+            record_status(notification, 'pending', attempt - 1, str(e))
+            return False
+        except Exception as e:
+            error = str(e)
+            print(f"Failed to send email notification (attempt {attempt}/{max_attempts}): {e}")
+            if attempt < max_attempts:
+                time.sleep(retry_delay * 2 ** (attempt - 1))
+
+    record_status(notification, 'failed', max_attempts, error)
+    return False
+
+
+def deliver_batch(notifications, retry_delay=None):
+    """
+    Send several notifications over one pooled connection. Those that fail are
+    handed to ``deliver()`` to be retried individually.
+    """
+    try:
+        results = get_pool().send_batches([n.messages for n in notifications])
+    except CircuitOpenError as e:
+        print(f"Email notifications deferred: {e}")
+        for notification in notifications:
+            record_status(notification, 'pending', 0, str(e))
+        return
+
+    for notification, (sent, error) in zip(notifications, results):
+        if error is None:
+            record_status(notification, 'sent', 1)
+        else:
+            print(f"Failed to send email notification (attempt 1): {error}")
+            deliver(notification, retry_delay=retry_delay, attempts_made=1)
+
+
+class NotificationDispatcher:
+    """Bounded queue of notifications drained by a fixed pool of daemon worker threads"""
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'notifications-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def enqueue(self, notification):
+        """Queue a notification; returns False when the queue stayed full (backpressure)"""
+        self.start()
+        try:
+            self.queue.put(notification, timeout=_setting('NOTIFICATIONS_ENQUEUE_TIMEOUT', 0.05))
+            return True
+        except queue.Full:
+            print("Notification queue is full; delivery deferred to send_pending_notifications")
+            return False
+
+    def _take_batch(self):
+        """Block for one job, then take whatever else is already queued up to the batch size"""
+        batch = [self.queue.get()]
+        batch_size = _setting('NOTIFICATIONS_BATCH_SIZE', 20)
+        while len(batch) < batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._take_batch()
+            try:
+                deliver_batch(batch)
+            except Exception as e:
+                print(f"Failed to deliver notifications: {e}")
+            finally:
+                connection.close()
+                for _ in batch:
+                    self.queue.task_done()
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher(
+                workers=_setting('NOTIFICATIONS_WORKERS', 2),
+                queue_size=_setting('NOTIFICATIONS_QUEUE_SIZE', 100),
+            )
+        return _dispatcher
+
+
+def notify(messages, record=None):
+    """
+    Send ``messages`` once the current transaction commits, without blocking the request.
+    ``record`` is the row whose ``notification_*`` fields track the delivery.
+    """
+    notification = Notification(messages, record)
+    if not _setting('NOTIFICATIONS_ASYNC', True):
+        transaction.on_commit(lambda: deliver(notification, retry_delay=0))
+    else:
+        transaction.on_commit(lambda: get_dispatcher().enqueue(notification))
+    return notification
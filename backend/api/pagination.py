@@ -0,0 +1,210 @@
+"""
+Keyset (cursor) pagination for the large content lists.
+
+Page-number pagination runs a ``COUNT(*)`` and an ``OFFSET`` scan on every
+page, so deep pages get linearly slower. Passing ``?cursor=`` switches a list
+to keyset mode instead: the page is the next ``page_size`` rows after the last
+row of the previous page in the list's ordering, fetched with a ``WHERE``
+clause on the ordering columns, so page N costs the same as page 1 and no
+count is run.
+
+The ordering is the one the queryset ends up with (the view's ``ordering`` or
+``?ordering=``), completed with the primary key so that ties are broken the
+same way on every page: ``-is_featured, -created_at`` pages on
+``(is_featured, created_at, id)``. Nullable columns are ordered with their
+NULLs last. Page-number mode uses the same completed ordering, so both modes
+list rows in the same order.
+
+Cursors are opaque URL-safe tokens holding the boundary row's values and the
+direction. Keyset responses carry ``next``, ``previous`` and ``results`` but
+no ``count``. Without a ``cursor`` parameter the list is paginated by page
+number exactly as before.
+"""
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class Key:
+    """One column of the keyset ordering"""
+
+    def __init__(self, field, descending):
+        self.field = field
+        self.descending = descending
+
+    @property
+    def name(self):
+        return self.field.attname
+
+    def order_by(self, reverse=False):
+        descending = self.descending != reverse
+        if not self.field.null:
+            return f'-{self.name}' if descending else self.name
+        # NULLs sort last going forward, so first going back
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        expression = F(self.name)
+        return expression.desc(**nulls) if descending else expression.asc(**nulls)
+
+    def equal(self, value):
+        if value is None:
+            return Q(**{f'{self.name}__isnull': True})
+        return Q(**{self.name: value})
+
+    def after(self, value, reverse=False):
+        """Rows strictly after ``value`` in this column's order"""
+        nulls_last = not reverse
+        if value is None:
+            # Nothing follows the NULLs when they come last; everything else does when they come first
+            return Q(pk__in=[]) if nulls_last else Q(**{f'{self.name}__isnull': False})
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        condition = Q(**{f'{self.name}__{lookup}': value})
+        if self.field.null and nulls_last:
+            condition |= Q(**{f'{self.name}__isnull': True})
+        return condition
+
+
+def encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        # Full precision: a rounded boundary would skip or repeat rows
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+class KeysetPagination(PageNumberPagination):
+    """Page-number pagination, or keyset pagination when the request has a ``cursor`` parameter"""
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    keys = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keys = None
+        keys = self.get_keys(queryset)
+        if keys is None:
+            # Ordered by something other than plain columns
+            return super().paginate_queryset(queryset, request, view)
+        if self.cursor_query_param not in request.query_params:
+            # Same tie-breaking as the keyset order, so both modes list rows identically
+            queryset = queryset.order_by(*[key.order_by() for key in keys])
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.keys = keys
+        self.page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*[key.order_by(reverse) for key in keys])
+        if values is not None:
+            queryset = queryset.filter(self.after(values, reverse))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Going forward there is a previous page whenever a cursor was given, and
+        # going back there is a next page; the other side depends on has_more
+        first, last = (rows[0], rows[-1]) if rows else (None, None)
+        if reverse:
+            self.next_position = self.position(last) if last is not None else values
+            self.previous_position = self.position(first) if has_more else None
+        else:
+            self.next_position = self.position(last) if has_more else None
+            self.previous_position = (self.position(first) if first is not None else values) if values else None
+        return rows
+
+    def get_keys(self, queryset):
+        """The ordering columns, completed with the primary key; None when they cannot be keyset"""
+        model = queryset.model
+        ordering = list(queryset.query.order_by or model._meta.ordering)
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str) or '__' in item or item.lstrip('-') == '?':
+                return None
+            name = item.lstrip('-')
+            try:
+                field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not getattr(field, 'concrete', False) or field.many_to_many:
+                return None
+            keys.append(Key(field, item.startswith('-')))
+            if field.primary_key or field.unique and not field.null:
+                return keys
+        keys.append(Key(model._meta.pk, False))
+        return keys
+
+    def after(self, values, reverse):
+        """Rows after the boundary ``values`` in the (possibly reversed) keyset order"""
+        clauses = []
+        for index, key in enumerate(self.keys):
+            equal = [previous.equal(value) for previous, value in zip(self.keys[:index], values)]
+            clauses.append(reduce(and_, equal + [key.after(values[index], reverse)]))
+        return reduce(or_, clauses)
+
+    def position(self, instance):
+        return [getattr(instance, key.name) for key in self.keys]
+
+    def decode_cursor(self, request):
+        """``(boundary values, reverse)``; an empty cursor is the first page"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            raw_values, reverse = data['p'], bool(data.get('r'))
+            if len(raw_values) != len(self.keys):
+                raise ValueError('Cursor does not match the ordering')
+            values = [
+                None if value is None else key.field.to_python(value)
+                for key, value in zip(self.keys, raw_values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, values, reverse):
+        data = {'p': [encode_value(value) for value in values]}
+        if reverse:
+            data['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token.decode('ascii').rstrip('='))
+
+    def get_next_link(self):
+        if self.keys is None:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.keys is None:
+            return super().get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.keys is None:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -0,0 +1,124 @@
+"""
+Query plan checks for the API views.
+
+Every generic view in ``api/urls.py`` is instantiated against a bare GET
+request and the queryset it would run (filtered, ordered and cut to one page
+like the real response) is passed through ``EXPLAIN``. Plans are checked for
+the two things the listing indexes are meant to avoid:
+
+* a sequential scan of a table (SQLite ``SCAN table`` without an index,
+  PostgreSQL ``Seq Scan``);
+* a sort done outside an index (SQLite ``USE TEMP B-TREE``, PostgreSQL
+  ``Sort``/``Incremental Sort``).
+
+Only SQLite and PostgreSQL plans are understood. The test suite runs on
+SQLite, so PostgreSQL plans are only checked when this is run against a
+PostgreSQL database; it picks its plan from table statistics, so use one of
+realistic size.
+Used by ``manage.py explain_queries``.
+"""
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.urls import URLPattern, URLResolver
+from django.urls.converters import IntConverter
+from rest_framework import mixins
+from rest_framework.generics import GenericAPIView
+from rest_framework.test import APIRequestFactory
+
+from .pagination import KeysetPagination
+
+
+Plan = namedtuple('Plan', 'name sql plan problems')
+
+# Stand-in values for URL kwargs; the plan does not depend on them
+SAMPLE_VALUES = {IntConverter: 1}
+SAMPLE_STRING = 'sample'
+
+PROBLEM_PATTERNS = {
+    'sqlite': [
+        (re.compile(r'\bSCAN (?!.*\bUSING\b)(?P<table>\S+)'), 'sequential scan of {table}'),
+        (re.compile(r'USE TEMP B-TREE FOR (?P<clause>.+)$'), 'temporary sort for {clause}'),
+    ],
+    'postgresql': [
+        (re.compile(r'Seq Scan on (?P<table>\S+)'), 'sequential scan of {table}'),
+        (re.compile(r'^\s*(?:->\s*)?(?P<kind>(?:Incremental )?Sort)(?:\s+\(|$)'), '{kind} outside an index'),
+    ],
+}
+
+
+def iter_patterns(patterns, prefix=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix + str(pattern.pattern), pattern
+
+
+def sample_kwargs(pattern):
+    converters = getattr(pattern.pattern, 'converters', {})
+    return {
+        name: SAMPLE_VALUES.get(type(converter), SAMPLE_STRING)
+        for name, converter in converters.items()
+    }
+
+
+def view_queryset(view_class, kwargs):
+    """The queryset ``view_class`` runs for a bare GET, cut the way the response would be"""
+    request = APIRequestFactory().get('/')
+    view = view_class()
+    view.args, view.kwargs, view.format_kwarg = (), kwargs, None
+    view.request = view.initialize_request(request)
+    view.headers = {}
+    queryset = view.filter_queryset(view.get_queryset())
+
+    if issubclass(view_class, mixins.RetrieveModelMixin):
+        lookup = view.lookup_url_kwarg or view.lookup_field
+        if lookup in kwargs:
+            queryset = queryset.filter(**{view.lookup_field: kwargs[lookup]})
+        # get() drops the ordering
+        return queryset.order_by()[:2]
+
+    paginator = view.paginator
+    if paginator is None:
+        return queryset
+    if isinstance(paginator, KeysetPagination):
+        keys = paginator.get_keys(queryset)
+        if keys is not None:
+            queryset = queryset.order_by(*[key.order_by() for key in keys])
+    return queryset[:paginator.get_page_size(view.request) or None]
+
+
+def find_problems(plan, vendor=None):
+    vendor = vendor or connection.vendor
+    problems = []
+    for line in plan.splitlines():
+        for expression, message in PROBLEM_PATTERNS[vendor]:
+            match = expression.search(line)
+            if match:
+                problems.append(message.format(**match.groupdict()))
+    return problems
+
+
+def explain_views(patterns=None):
+    """A ``Plan`` for every generic view in the API urls"""
+    if connection.vendor not in PROBLEM_PATTERNS:
+        raise ValueError(f'Query plans can only be checked on SQLite or PostgreSQL, not {connection.vendor}')
+    if patterns is None:
+        from .urls import urlpatterns as patterns
+
+    plans = []
+    for route, pattern in iter_patterns(patterns):
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if view_class is None or not issubclass(view_class, GenericAPIView):
+            continue
+        if not issubclass(view_class, (mixins.ListModelMixin, mixins.RetrieveModelMixin)):
+            continue
+        if view_class.queryset is None and view_class.get_queryset is GenericAPIView.get_queryset:
+            # Singletons fetched through their own get_object()
+            continue
+        queryset = view_queryset(view_class, sample_kwargs(pattern))
+        plan = queryset.explain()
+        plans.append(Plan(pattern.name or route, str(queryset.query), plan, find_problems(plan)))
+    return plans
@@ -0,0 +1,34 @@
+from django.http import HttpResponseRedirect
+
+from . import redirects
+
+
+class RedirectMiddleware:
+    """
+    Redirect requests that would otherwise 404 according to the active
+    RedirectRule rows. Rules are looked up in the in-memory table compiled by
+    redirects.py, so a 404 costs no extra query, and the request's query string
+    is carried over unless the destination has its own.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.status_code != 404:
+            return response
+
+        resolved = redirects.resolve(request.path)
+        if resolved is None:
+            return response
+
+        location, status, rule_id = resolved
+        query = request.META.get('QUERY_STRING')
+        if query and '?' not in location:
+            location = f"{location}?{query}"
+        redirects.record_hit(rule_id)
+
+        redirect = HttpResponseRedirect(location)
+        redirect.status_code = int(status)
+        return redirect
@@ -0,0 +1,276 @@
+"""
+Compiled redirect rules.
+
+Active ``RedirectRule`` rows are compiled once into a ``RedirectTable``: a dict
+of exact source paths plus a trie of path segments for prefix rules (a source
+ending in ``*``, e.g. ``/old-blog/*``). A prefix rule whose destination also
+ends in ``*`` carries the rest of the path over (``/old-blog/a/b`` ->
+``/blog/a/b``); otherwise every path below the prefix goes to the same place.
+Paths match with or without a trailing slash, and the longest prefix wins.
+
+Like feature flags, the table is kept in memory until the ``RedirectRule`` cache
+tag moves on; the tag is checked at most once every
+``REDIRECTS_REFRESH_INTERVAL`` seconds and a save in this process drops the
+table straight away (see signals.py). Hits are buffered with
+``counters.increment()``/``counters.touch()``, so resolving a redirect never
+touches the database.
+
+Chains are collapsed into a single hop: when a rule is saved its destination
+is followed through the other rules and stored as the final one, and rules
+that pointed at its source are repointed past it. Prefix rules are followed in
+memory when resolving. Rules that would loop are rejected by
+``RedirectRule.clean()`` and left out of the table.
+"""
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import caching, counters
+from .models import RedirectRule
+
+
+REDIRECT_RULE_TAG = caching.model_tag(RedirectRule)
+
+# Chains longer than this are cut short rather than followed further
+MAX_HOPS = 10
+
+Rule = namedtuple('Rule', 'pk source destination status')
+
+
+class RedirectLoop(ValueError):
+    pass
+
+
+def normalize_path(url):
+    """The path of ``url`` without its trailing slash, as used for matching"""
+    path = urlparse(url).path or '/'
+    if not path.startswith('/'):
+        path = '/' + path
+    return path.rstrip('/') or '/'
+
+
+def split_source(source):
+    """``(path, is_prefix)`` for a rule source"""
+    source = source.strip()
+    if source.endswith('*'):
+        return normalize_path(source[:-1]), True
+    return normalize_path(source), False
+
+
+def is_external(location):
+    parsed = urlparse(location)
+    return bool(parsed.scheme or parsed.netloc)
+
+
+def _segments(path):
+    return [segment for segment in path.split('/') if segment]
+
+
+class RedirectTable:
+    """Exact-match dict plus prefix trie over a set of rules"""
+
+    def __init__(self, rules=()):
+        self.exact = {}
+        self.trie = {}
+        for rule in rules:
+            self.add(rule)
+
+        # Exact sources are resolved to their final location up front
+        self.resolved = {}
+        self.loops = []
+        for path, rule in self.exact.items():
+            try:
+                self.resolved[path] = self.follow(path)
+            except RedirectLoop:
+                self.loops.append(rule)
+
+    def add(self, rule):
+        path, prefix = split_source(rule.source)
+        if not prefix:
+            self.exact[path] = rule
+            return
+        node = self.trie
+        for segment in _segments(path):
+            node = node.setdefault(segment, {})
+        node[None] = rule
+
+    def __len__(self):
+        return len(self.exact) + sum(1 for _ in self._prefix_rules(self.trie))
+
+    def _prefix_rules(self, node):
+        for segment, child in node.items():
+            if segment is None:
+                yield child
+            else:
+                yield from self._prefix_rules(child)
+
+    def match(self, path):
+        """``(rule, remainder)`` for the rule applying to ``path``, or None"""
+        path = normalize_path(path)
+        rule = self.exact.get(path)
+        if rule is not None:
+            return rule, ''
+
+        segments = _segments(path)
+        node = self.trie
+        best = (node[None], 0) if None in node else None
+        for depth, segment in enumerate(segments, 1):
+            node = node.get(segment)
+            if node is None:
+                break
+            if None in node:
+                best = (node[None], depth)
+        if best is None:
+            return None
+        rule, depth = best
+        return rule, '/'.join(segments[depth:])
+
+    @staticmethod
+    def target(rule, remainder):
+        if rule.destination.endswith('*'):
+            return rule.destination[:-1] + remainder
+        return rule.destination
+
+    def follow(self, path):
+        """
+        ``(location, status, rule pk)`` after following chained rules from
+        ``path``, or None when no rule applies. Status and pk are those of the
+        first rule. Raises RedirectLoop when the chain comes back on itself.
+        """
+        match = self.match(path)
+        if match is None:
+            return None
+        first = match[0]
+        seen = {normalize_path(path)}
+        for _ in range(MAX_HOPS):
+            location = self.target(*match)
+            if is_external(location):
+                break
+            key = normalize_path(location)
+            if key in seen:
+                raise RedirectLoop(path)
+            seen.add(key)
+            match = self.match(location)
+            if match is None:
+                break
+        return location, first.status, first.pk
+
+    def resolve(self, path):
+        """Like ``follow()``, but loops resolve to None"""
+        resolved = self.resolved.get(normalize_path(path))
+        if resolved is not None:
+            return resolved
+        try:
+            return self.follow(path)
+        except RedirectLoop:
+            return None
+
+
+# ============================================================================
+# Compiled table
+# ============================================================================
+
+_lock = threading.Lock()
+_state = {
+    'table': None,
+    'version': None,
+    'checked_at': 0.0,
+}
+
+
+def _refresh_interval():
+    return getattr(settings, 'REDIRECTS_REFRESH_INTERVAL', 1.0)
+
+
+def active_rules(exclude_pk=None):
+    queryset = RedirectRule.objects.filter(is_active=True)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return [
+        Rule(*row) for row in queryset.values_list('pk', 'source_url', 'destination_url', 'redirect_type')
+    ]
+
+
+def get_table():
+    """The compiled table of active rules"""
+    now = time.monotonic()
+    table = _state['table']
+    if table is not None and now - _state['checked_at'] < _refresh_interval():
+        return table
+
+    version = caching.get_tag_versions([REDIRECT_RULE_TAG])[REDIRECT_RULE_TAG]
+    with _lock:
+        if _state['table'] is None or _state['version'] != version:
+            table = RedirectTable(active_rules())
+            for rule in table.loops:
+                print(f"Skipping redirect rule {rule.source} -> {rule.destination}: redirect loop")
+            _state['table'] = table
+            _state['version'] = version
+        _state['checked_at'] = now
+        return _state['table']
+
+
+def reset():
+    """Drop the compiled table so the next lookup rebuilds it"""
+    with _lock:
+        _state['table'] = None
+        _state['version'] = None
+
+
+def resolve(path):
+    """``(location, status, rule pk)`` for a request path, or None"""
+    return get_table().resolve(path)
+
+
+def record_hit(pk):
+    """Count a use of a rule; written out with the next counter flush"""
+    counters.increment(RedirectRule, 'hit_count', pk=pk)
+    counters.touch(RedirectRule, 'last_used', pk=pk)
+
+
+# ============================================================================
+# Chain flattening on save
+# ============================================================================
+
+def creates_loop(source, destination, exclude_pk=None):
+    """Whether a rule from ``source`` to ``destination`` would redirect back to itself"""
+    if is_external(destination):
+        return False
+    table = RedirectTable(active_rules(exclude_pk) + [Rule(exclude_pk, source, destination, '301')])
+    try:
+        table.follow(split_source(source)[0])
+    except RedirectLoop:
+        return True
+    return False
+
+
+def flatten_destination(rule):
+    """Point ``rule`` at the end of the chain its destination starts, when that is a fixed location"""
+    destination = rule.destination_url
+    if destination.endswith('*') or is_external(destination):
+        return
+    try:
+        resolved = RedirectTable(active_rules(rule.pk)).follow(destination)
+    except RedirectLoop:
+        return
+    if resolved is not None and normalize_path(resolved[0]) != split_source(rule.source_url)[0]:
+        rule.destination_url = resolved[0]
+
+
+def repoint_chains(rule):
+    """Make rules that redirect to ``rule``'s source go straight to its destination"""
+    path, prefix = split_source(rule.source_url)
+    if prefix or not rule.is_active or creates_loop(rule.source_url, rule.destination_url, rule.pk):
+        return
+    variants = {path, path + '/'} if path != '/' else {path}
+    target = normalize_path(rule.destination_url)
+    (
+        RedirectRule.objects.filter(destination_url__in=variants)
+        .exclude(pk=rule.pk)
+        .exclude(source_url__in={target, target + '/'})
+        .update(destination_url=rule.destination_url, updated_at=timezone.now())
+    )
@@ -0,0 +1,351 @@
+"""
+Full-text search over the public content models.
+
+Every searchable row is mirrored into a ``SearchDocument`` (title + body text),
+kept in sync from model signals (see signals.py). The database's own full-text
+engine indexes those documents:
+
+* SQLite: an FTS5 external-content table ``api_searchdocument_fts`` maintained
+  by triggers, ranked with ``bm25()`` and excerpted with ``snippet()``;
+* PostgreSQL: a GIN index over a weighted ``tsvector`` expression, ranked with
+  ``ts_rank_cd()`` and excerpted with ``ts_headline()``;
+* anything else: a ``LIKE`` scan over the documents, unranked.
+
+Both index definitions live in migration 0009. Run ``manage.py
+rebuild_search_index`` after bulk imports that bypass signals.
+"""
+import re
+
+from django.apps import apps
+from django.core import signing
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+from . import caching
+from .eager_loading import eager_load
+from .serializers import (
+    ProjectSerializer, BlogPostListSerializer, ServiceSerializer, HelpArticleListSerializer,
+    CaseStudyListSerializer, JobPositionListSerializer
+)
+
+
+FTS_TABLE = 'api_searchdocument_fts'
+
+# Queries against the FTS table read the search documents
+caching.register_table(FTS_TABLE, 'api.SearchDocument')
+
+# Must match the expression of the GIN index created in migration 0009
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', body), 'B')"
+)
+
+# Highlight markers used inside the database, swapped for <mark> after escaping
+MARK_START, MARK_END = '\x02', '\x03'
+SNIPPET_WORDS = 16
+
+BATCH_SIZE = 1000
+
+
+class SearchType:
+    """How one model is turned into search documents and back into API results"""
+
+    def __init__(self, key, model_label, title_field, body_fields, serializer_class, public_filter=None):
+        self.key = key
+        self.model_label = model_label
+        self.title_field = title_field
+        self.body_fields = body_fields
+        self.serializer_class = serializer_class
+        self.public_filter = public_filter or {}
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def is_public(self, instance):
+        return all(getattr(instance, field) == value for field, value in self.public_filter.items())
+
+    def document_text(self, values):
+        """Return ``(title, body)`` from a mapping of field values"""
+        parts = []
+        for field in self.body_fields:
+            value = values.get(field)
+            if isinstance(value, (list, tuple)):
+                parts.extend(str(item) for item in value)
+            elif isinstance(value, dict):
+                parts.extend(str(item) for item in value.values())
+            elif value:
+                parts.append(str(value))
+        return str(values.get(self.title_field) or '')[:300], '\n'.join(parts)
+
+
+SEARCH_TYPES = {
+    search_type.key: search_type for search_type in [
+        SearchType('projects', 'api.Project', 'title',
+                   ['description', 'detailed_description', 'technologies', 'client_name'],
+                   ProjectSerializer),
+        SearchType('blog_posts', 'api.BlogPost', 'title', ['excerpt', 'content', 'tags'],
+                   BlogPostListSerializer, {'is_published': True}),
+        SearchType('services', 'api.Service', 'name', ['short_description', 'description', 'features'],
+                   ServiceSerializer, {'is_active': True}),
+        SearchType('help_articles', 'api.HelpArticle', 'title', ['excerpt', 'content'],
+                   HelpArticleListSerializer, {'is_published': True}),
+        SearchType('case_studies', 'api.CaseStudy', 'title',
+                   ['client_name', 'challenge', 'solution', 'results', 'technologies_used'],
+                   CaseStudyListSerializer, {'is_published': True}),
+        SearchType('jobs', 'api.JobPosition', 'title',
+                   ['department', 'description', 'requirements', 'responsibilities'],
+                   JobPositionListSerializer, {'is_active': True}),
+    ]
+}
+
+
+def get_search_type(model):
+    """Return the SearchType indexing ``model``, or None"""
+    label = model._meta.label
+    for search_type in SEARCH_TYPES.values():
+        if search_type.model_label == label:
+            return search_type
+    return None
+
+
+# =============================================================================
+# INDEXING
+# =============================================================================
+
+def index_instance(instance):
+    """Create, update or remove the search document of one row"""
+    search_type = get_search_type(type(instance))
+    if search_type is None:
+        return
+    if not search_type.is_public(instance):
+        remove_document(search_type, instance.pk)
+        return
+
+    values = {field: getattr(instance, field) for field in [search_type.title_field] + search_type.body_fields}
+    title, body = search_type.document_text(values)
+    SearchDocument = apps.get_model('api', 'SearchDocument')
+    SearchDocument.objects.update_or_create(
+        content_type=search_type.key, object_id=instance.pk,
+        defaults={'title': title, 'body': body}
+    )
+
+
+def remove_document(search_type, object_id):
+    SearchDocument = apps.get_model('api', 'SearchDocument')
+    SearchDocument.objects.filter(content_type=search_type.key, object_id=object_id).delete()
+
+
+def rebuild_index():
+    """Rebuild every search document from scratch and return the number indexed"""
+    SearchDocument = apps.get_model('api', 'SearchDocument')
+    SearchDocument.objects.all().delete()
+
+    total = 0
+    for search_type in SEARCH_TYPES.values():
+        model = search_type.model
+        fields = [search_type.title_field] + search_type.body_fields
+        rows = model.objects.filter(**search_type.public_filter).values('pk', *fields)
+
+        batch = []
+        for values in rows.iterator(chunk_size=BATCH_SIZE):
+            title, body = search_type.document_text(values)
+            batch.append(SearchDocument(
+                content_type=search_type.key, object_id=values['pk'], title=title, body=body
+            ))
+            if len(batch) >= BATCH_SIZE:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            SearchDocument.objects.bulk_create(batch)
+            total += len(batch)
+
+    return total
+
+
+# =============================================================================
+# QUERYING
+# =============================================================================
+
+_backends = {}
+
+
+def fulltext_backend():
+    """Return 'fts5', 'postgres' or 'like' for the current database"""
+    backend = _backends.get(connection.alias)
+    if backend is None:
+        if connection.vendor == 'postgresql':
+            backend = 'postgres'
+        elif connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+            backend = 'fts5'
+        else:
+            backend = 'like'
+        _backends[connection.alias] = backend
+    return backend
+
+
+def fts5_query(query, content_type):
+    """
+    Turn free text into an FTS5 query restricted to one content type: every word
+    must appear in the title or body, the last one as a prefix (search as you type).
+    """
+    words = [f'"{word}"' for word in re.findall(r'\w+', query.lower())]
+    if not words:
+        return ''
+    words[-1] += '*'
+    return f'content_type:"{content_type}" AND {{title body}}: ({" ".join(words)})'
+
+
+def format_snippet(snippet):
+    """Escape a raw snippet and turn the highlight markers into <mark> tags"""
+    return escape(snippet or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def _fts5_select(content_type, match, limit, offset, with_total):
+    """One content type's ranked page as a SELECT usable on its own or inside a UNION"""
+    # bm25()/snippet() cannot be used under a window function, so the total is an
+    # uncorrelated subquery evaluated once per statement
+    total = f"(SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)" if with_total else "NULL"
+    sql = f"""
+        SELECT * FROM (
+            SELECT %s AS content_type, object_id, -bm25({FTS_TABLE}, 10.0, 1.0, 0.0, 0.0) AS rank,
+                   snippet({FTS_TABLE}, 1, %s, %s, '…', %s) AS snippet, {total} AS total
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s
+            ORDER BY bm25({FTS_TABLE}, 10.0, 1.0, 0.0, 0.0), rowid
+            LIMIT %s OFFSET %s
+        )
+    """
+    params = [content_type, MARK_START, MARK_END, SNIPPET_WORDS]
+    params += [match] if with_total else []
+    params += [match, limit, offset]
+    return sql, params
+
+
+def _fts5_search(query, content_types, limit, offset, with_total):
+    statements, params = [], []
+    for content_type in content_types:
+        match = fts5_query(query, content_type)
+        if match:
+            sql, statement_params = _fts5_select(content_type, match, limit, offset, with_total)
+            statements.append(sql)
+            params += statement_params
+    if not statements:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(statements), params)
+        return cursor.fetchall()
+
+
+def _postgres_search(query, content_types, limit, offset, with_total):
+    options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}'
+    total = "COUNT(*) OVER (PARTITION BY d.content_type)" if with_total else "NULL"
+    # Rank every match once, number the matches within each type and keep one page per type;
+    # ts_headline() only runs on the rows that are returned
+    sql = f"""
+        SELECT content_type, object_id, rank, ts_headline('english', body, query, %s) AS snippet, total
+        FROM (
+            SELECT d.content_type, d.object_id, d.body, query,
+                   ts_rank_cd({POSTGRES_VECTOR}, query) AS rank,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY d.content_type ORDER BY ts_rank_cd({POSTGRES_VECTOR}, query) DESC, d.id
+                   ) AS position,
+                   {total} AS total
+            FROM api_searchdocument d, websearch_to_tsquery('english', %s) query
+            WHERE ({POSTGRES_VECTOR}) @@ query AND d.content_type = ANY(%s)
+        ) ranked
+        WHERE position > %s AND position <= %s
+        ORDER BY content_type, position
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [options, query, list(content_types), offset, offset + limit])
+        return cursor.fetchall()
+
+
+def _like_search(query, content_types, limit, offset, with_total):
+    SearchDocument = apps.get_model('api', 'SearchDocument')
+    rows = []
+    for content_type in content_types:
+        documents = SearchDocument.objects.filter(
+            Q(title__icontains=query) | Q(body__icontains=query), content_type=content_type
+        ).order_by('id')
+        total = documents.count() if with_total else None
+        rows += [
+            (content_type, object_id, 0.0, body[:160], total)
+            for object_id, body in documents.values_list('object_id', 'body')[offset:offset + limit]
+        ]
+    return rows
+
+
+def search_many(query, content_types, limit=10, offset=0, with_total=True):
+    """
+    Return ``{content_type: (hits, total)}`` with one page of best matches per type,
+    fetched in a single statement. Each hit is a dict with ``object_id``, ``rank``
+    and an HTML-safe ``snippet``. Pass ``with_total=False`` when the totals are
+    already known (e.g. carried in a cursor) to skip counting; totals are then None.
+    """
+    backend = fulltext_backend()
+    if backend == 'fts5':
+        rows = _fts5_search(query, content_types, limit, offset, with_total)
+    elif backend == 'postgres':
+        rows = _postgres_search(query, content_types, limit, offset, with_total)
+    else:
+        rows = _like_search(query, content_types, limit, offset, with_total)
+
+    results = {content_type: ([], 0 if with_total else None) for content_type in content_types}
+    for content_type, object_id, rank, snippet, total in rows:
+        hits, _ = results[content_type]
+        hits.append({'object_id': object_id, 'rank': round(rank, 4), 'snippet': format_snippet(snippet)})
+        results[content_type] = (hits, total)
+    return results
+
+
+def search(query, content_type, limit=10, offset=0, with_total=True):
+    """Return ``(hits, total)`` for one content type (see ``search_many``)"""
+    return search_many(query, [content_type], limit, offset, with_total)[content_type]
+
+
+# =============================================================================
+# CURSORS
+# =============================================================================
+
+CURSOR_SALT = 'api.search.cursor'
+
+
+def encode_cursor(query, content_type, offset, total):
+    """Opaque, signed cursor for the next page of one type; carries the total so it is counted once"""
+    return signing.dumps({'q': query, 't': content_type, 'o': offset, 'n': total}, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    """Return ``(query, content_type, offset, total)``; raises ``signing.BadSignature`` if tampered with"""
+    payload = signing.loads(cursor, salt=CURSOR_SALT)
+    return payload['q'], payload['t'], int(payload['o']), int(payload['n'])
+
+
+def next_cursor(query, content_type, offset, count, total):
+    """Cursor for the page after ``offset + count``, or None on the last page"""
+    if total is None or offset + count >= total:
+        return None
+    return encode_cursor(query, content_type, offset + count, total)
+
+
+def serialize_hits(search_type, hits, context):
+    """Load and serialize the rows behind ``hits``, in rank order, with rank and snippet attached"""
+    if not hits:
+        return []
+    ids = [hit['object_id'] for hit in hits]
+    queryset = eager_load(search_type.model.objects.filter(pk__in=ids), search_type.serializer_class)
+    objects = {obj.pk: obj for obj in queryset}
+
+    results = []
+    for hit in hits:
+        obj = objects.get(hit['object_id'])
+        if obj is None:
+            continue
+        data = search_type.serializer_class(obj, context=context).data
+        data['search'] = {'rank': hit['rank'], 'snippet': hit['snippet']}
+        results.append(data)
+    return results
@@ -0,0 +1,232 @@
+"""
+Pre-rendered sitemap and robots.txt files.
+
+``python manage.py render_seo_files --base-url https://example.com`` writes
+the sitemap index, every sitemap shard (plus a gzipped copy) and robots.txt
+to ``SEO_FILES_ROOT``. SEOFilesMiddleware serves them from disk ahead of the
+URL resolver, the way WhiteNoise serves static files, so crawlers never reach
+the sitemap views. The views remain the fallback until the files exist.
+
+Files are content-addressed like ``CompressedManifestStaticFilesStorage``:
+``sitemap-blog.xml`` is written as ``sitemap-blog.<hash>.xml`` and
+``manifest.json`` maps public names to the current file and its hash, which is
+also the ETag. Writing a new file and then replacing the manifest is atomic
+for readers; files no longer referenced are removed afterwards.
+
+Regeneration is incremental:
+
+* the manifest records the cache tag version of each section's model when it
+  was rendered, and sections whose model has not changed are not queried at
+  all;
+* a changed section is rendered shard by shard into a temporary file while
+  hashing it, and only shards whose hash differs replace the stored file.
+
+Once the files exist, saving any sitemap model or RobotsTxt schedules a
+re-render on a background thread (see signals.py).
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connection
+
+from . import caching, sitemaps
+from .models import RobotsTxt
+from .seo_views import robots_txt_content
+
+
+MANIFEST_NAME = 'manifest.json'
+ROBOTS_NAME = 'robots.txt'
+INDEX_NAME = 'sitemap.xml'
+
+CONTENT_TYPES = {
+    '.xml': 'application/xml',
+    '.txt': 'text/plain; charset=utf-8',
+}
+
+ROBOTS_TAG = caching.model_tag(RobotsTxt)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='seo-files')
+_render_lock = threading.Lock()
+_render_pending = False
+
+
+def get_root():
+    return Path(getattr(settings, 'SEO_FILES_ROOT', Path(settings.MEDIA_ROOT) / 'seo'))
+
+
+def load_manifest(root=None):
+    """The current manifest, or None when the files have not been rendered"""
+    try:
+        with open((root or get_root()) / MANIFEST_NAME, encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def hashed_name(name, digest):
+    stem, extension = os.path.splitext(name)
+    return f'{stem}.{digest[:12]}{extension}'
+
+
+class FileWriter:
+    """Writes documents under ``root``, keeping the stored copy when the content hash is unchanged"""
+
+    def __init__(self, root, previous_files):
+        self.root = root
+        self.previous_files = previous_files
+        self.files = {}
+        self.written = 0
+
+    def write(self, name, chunks, compress=True):
+        """Stream ``chunks`` into ``name``; returns True when the stored file changed"""
+        digest = hashlib.sha256()
+        handle = tempfile.NamedTemporaryFile('wb', dir=self.root, prefix='.tmp-', delete=False)
+        try:
+            with handle:
+                for chunk in chunks:
+                    data = chunk.encode('utf-8')
+                    digest.update(data)
+                    handle.write(data)
+            digest = digest.hexdigest()
+
+            previous = self.previous_files.get(name)
+            if previous and previous['hash'] == digest and (self.root / previous['path']).exists():
+                self.files[name] = previous
+                return False
+
+            entry = {'path': hashed_name(name, digest), 'hash': digest}
+            os.replace(handle.name, self.root / entry['path'])
+            if compress:
+                entry['gzip'] = entry['path'] + '.gz'
+                self.write_gzip(self.root / entry['path'], self.root / entry['gzip'])
+            self.files[name] = entry
+            self.written += 1
+            return True
+        finally:
+            if os.path.exists(handle.name):
+                os.unlink(handle.name)
+
+    def write_gzip(self, source, target):
+        compressed = tempfile.NamedTemporaryFile('wb', dir=self.root, prefix='.tmp-', delete=False)
+        compressed.close()
+        # mtime=0 keeps the output identical for identical input
+        with open(source, 'rb') as handle, gzip.GzipFile(compressed.name, 'wb', mtime=0) as output:
+            shutil.copyfileobj(handle, output)
+        os.replace(compressed.name, target)
+
+    def keep(self, name):
+        """Carry an unchanged file over from the previous manifest"""
+        previous = self.previous_files.get(name)
+        if previous is None or not (self.root / previous['path']).exists():
+            return False
+        self.files[name] = previous
+        return True
+
+
+def render_files(base_url=None, force=False):
+    """
+    Render the sitemap and robots.txt files, skipping unchanged sections.
+    Returns ``{'written': files rewritten, 'files': files in the manifest}``.
+    """
+    root = get_root()
+    root.mkdir(parents=True, exist_ok=True)
+    previous = (load_manifest(root) or {}) if not force else {}
+    base_url = (base_url or previous.get('base_url') or '').rstrip('/')
+    if not base_url:
+        raise ValueError('A base URL is needed to render the sitemap, e.g. --base-url https://example.com')
+    if previous.get('base_url') != base_url:
+        previous = {}
+
+    writer = FileWriter(root, previous.get('files', {}))
+    tags = [caching.model_tag(section.model) for section in sitemaps.SECTIONS.values()] + [ROBOTS_TAG]
+    versions = caching.get_tag_versions(tags)
+    previous_sections = previous.get('sections', {})
+    sections = {}
+
+    for section in sitemaps.SECTIONS.values():
+        version = versions[caching.model_tag(section.model)]
+        before = previous_sections.get(section.name)
+        if before and before['version'] == version and all(writer.keep(name) for name in before['files']):
+            sections[section.name] = before
+            continue
+
+        names = []
+        count = section.count()
+        for page in range(1, section.shard_count(count) + 1):
+            name = section.shard_filename(page)
+            writer.write(name, sitemaps.render_shard(section, page, base_url))
+            names.append(name)
+        sections[section.name] = {'version': version, 'files': names}
+
+    if writer.written or not writer.keep(INDEX_NAME):
+        writer.write(INDEX_NAME, sitemaps.render_index(sitemaps.index_entries(base_url)))
+
+    robots_version = versions[ROBOTS_TAG]
+    if previous.get('robots_version') != robots_version or not writer.keep(ROBOTS_NAME):
+        writer.write(ROBOTS_NAME, [robots_txt_content(urlparse(base_url).netloc)], compress=False)
+
+    manifest = {
+        'base_url': base_url,
+        'sections': sections,
+        'robots_version': robots_version,
+        'files': writer.files,
+    }
+    handle = tempfile.NamedTemporaryFile('w', dir=root, prefix='.tmp-', delete=False, encoding='utf-8')
+    with handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(handle.name, root / MANIFEST_NAME)
+
+    remove_stale_files(root, manifest)
+    return {'written': writer.written, 'files': len(writer.files)}
+
+
+def remove_stale_files(root, manifest):
+    """Delete rendered files the manifest no longer points to"""
+    current = {MANIFEST_NAME}
+    for entry in manifest['files'].values():
+        current.add(entry['path'])
+        if 'gzip' in entry:
+            current.add(entry['gzip'])
+    for path in root.iterdir():
+        if path.is_file() and path.name not in current:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def schedule_render():
+    """Queue a background re-render, if the files have been rendered before"""
+    global _render_pending
+    if not (get_root() / MANIFEST_NAME).exists():
+        return
+    if not getattr(settings, 'SEO_FILES_ASYNC', True):
+        render_files()
+        return
+    with _render_lock:
+        if _render_pending:
+            return
+        _render_pending = True
+    _executor.submit(_run_render)
+
+
+def _run_render():
+    global _render_pending
+    with _render_lock:
+        # Changes arriving from now on need another pass
+        _render_pending = False
+    try:
+        render_files()
+    except Exception as e:
+        print(f"Failed to render SEO files: {e}")
+    finally:
+        connection.close()
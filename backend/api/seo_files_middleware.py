@@ -0,0 +1,86 @@
+import os
+
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import MissingFileError, StaticFile
+
+from . import seo_files
+
+
+class SEOFilesMiddleware:
+    """
+    Serve the pre-rendered sitemap and robots.txt files (see seo_files.py)
+    without running any view, with the same conditional, range and
+    gzip-negotiation handling WhiteNoise gives static files. The ETag is the
+    content hash recorded in the manifest. Requests for files that have not
+    been rendered fall through to the views.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.manifest = None
+        self.manifest_mtime = None
+        self.files = {}
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and self.is_seo_file(request.path_info):
+            static_file = self.find_file(request.path_info.lstrip('/'))
+            if static_file is not None:
+                try:
+                    return WhiteNoiseMiddleware.serve(static_file, request)
+                except FileNotFoundError:
+                    # Replaced by a render in the meantime: the views answer this once
+                    self.manifest_mtime = None
+        return self.get_response(request)
+
+    @staticmethod
+    def is_seo_file(path):
+        return path == f'/{seo_files.ROBOTS_NAME}' or (
+            path.startswith('/sitemap') and path.endswith(('.xml', '.xml.gz')) and path.count('/') == 1
+        )
+
+    def load_manifest(self):
+        """Reload the manifest when a render replaced it"""
+        root = seo_files.get_root()
+        try:
+            mtime = os.stat(root / seo_files.MANIFEST_NAME).st_mtime_ns
+        except OSError:
+            self.manifest, self.manifest_mtime, self.files = None, None, {}
+            return None
+        if mtime != self.manifest_mtime:
+            self.manifest = seo_files.load_manifest(root)
+            self.manifest_mtime = mtime
+            self.files = {}
+        return self.manifest
+
+    def find_file(self, name):
+        manifest = self.load_manifest()
+        if not manifest:
+            return None
+        static_file = self.files.get(name)
+        if static_file is None:
+            static_file = self.files[name] = self.build_file(manifest, name)
+        return static_file or None
+
+    def build_file(self, manifest, name):
+        root = seo_files.get_root()
+        compressed = name.endswith('.gz')
+        entry = manifest['files'].get(name[:-len('.gz')] if compressed else name)
+        if entry is None or (compressed and 'gzip' not in entry):
+            return False
+
+        headers = [
+            ('ETag', f'"{entry["hash"][:32]}{"-gz" if compressed else ""}"'),
+            ('Cache-Control', f'public, max-age={getattr(settings, "SEO_FILES_MAX_AGE", 60 * 60)}'),
+        ]
+        try:
+            if compressed:
+                headers.append(('Content-Type', 'application/gzip'))
+                return StaticFile(str(root / entry['gzip']), headers)
+
+            extension = os.path.splitext(name)[1]
+            headers.append(('Content-Type', seo_files.CONTENT_TYPES.get(extension, 'application/octet-stream')))
+            encodings = {'gzip': str(root / entry['gzip'])} if 'gzip' in entry else None
+            return StaticFile(str(root / entry['path']), headers, encodings=encodings)
+        except MissingFileError:
+            return False
@@ -1,38 +1,45 @@
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
 from .seo_views import seo_meta_context
 
 
 class SEOMiddleware(MiddlewareMixin):
     """
     Middleware to automatically attach SEO context to all requests
-    This ensures every view has access to SEO optimization data
+    This ensures every view has access to SEO optimization data.
+    ``request.seo_context`` is lazy: it is only built when a view or template
+    reads it, from the per-page context memoized in seo_views. Paths listed in
+    ``SEO_CONTEXT_EXCLUDE`` (API, static and media files) get no SEO context.
     """
     
     def process_request(self, request):
         """
         Attach SEO context to the request object
         """
+        if request.path.startswith(tuple(getattr(settings, 'SEO_CONTEXT_EXCLUDE', ['/api/']))):
+            return
+
+        # Determine page type from URL path
+        page_type = self.get_page_type_from_path(request.path)
+        request.page_type = page_type
+
+        # Built on first access, for easy access in views and templates
+        request.seo_context = SimpleLazyObject(lambda: self.get_seo_context(request, page_type))
+
+    def get_seo_context(self, request, page_type):
         try:
-            # Determine page type from URL path
-            page_type = self.get_page_type_from_path(request.path)
-            
-            # Get SEO context for this page
-            seo_context = seo_meta_context(request, page_type)
-            
-            # Attach to request for easy access in views and templates
-            request.seo_context = seo_context
-            request.page_type = page_type
-            
+            return seo_meta_context(request, page_type)
         except Exception:
             # Fallback to minimal context
-            request.seo_context = {
+            return {
                 'site_name': 'site gen it',
                 'meta_title': 'site gen it - Professional Web Development Services',
                 'meta_description': 'Professional site gen it offering web development and digital solutions.',
                 'canonical_url': request.build_absolute_uri(),
                 'robots': 'index, follow',
             }
-            request.page_type = 'home'
     
     def get_page_type_from_path(self, path):
         """
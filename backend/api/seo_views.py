@@ -1,166 +1,63 @@
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, Http404, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.contrib.sites.shortcuts import get_current_site
 from django.utils import timezone
 from django.conf import settings
-from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_http_methods
 from .models import (
-    SitemapURL, RobotsTxt, SEOSettings, SEOMetaTags, 
-    Project, BlogPost, Service, PageContent
+    SitemapURL, RobotsTxt, SEOSettings, SEOMetaTags, PageContent
 )
-import xml.etree.ElementTree as ET
+from . import caching, sitemaps
+from .conditional import conditional_view
+from .singletons import get_seo_settings
+import copy
+import threading
 
 
-@cache_page(60 * 60)  # Cache for 1 hour
-def sitemap_xml(request):
-    """Generate XML sitemap for search engines"""
-    try:
-        # Get current site
-        current_site = get_current_site(request)
-        base_url = f"https://{current_site.domain}"
-        
-        # Create XML root
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        urlset.set('xmlns:image', 'http://www.google.com/schemas/sitemap-image/1.1')
-        
-        # Get manual sitemap URLs
-        sitemap_urls = SitemapURL.objects.filter(is_active=True).order_by('-priority')
-        
-        for sitemap_url in sitemap_urls:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            # Location
-            loc = ET.SubElement(url_elem, 'loc')
-            loc.text = f"{base_url}{sitemap_url.url_path}"
-            
-            # Last modified
-            lastmod = ET.SubElement(url_elem, 'lastmod')
-            lastmod.text = sitemap_url.last_modified.strftime('%Y-%m-%d')
-            
-            # Change frequency
-            changefreq = ET.SubElement(url_elem, 'changefreq')
-            changefreq.text = sitemap_url.change_frequency
-            
-            # Priority
-            priority = ET.SubElement(url_elem, 'priority')
-            priority.text = sitemap_url.priority
-        
-        # Auto-generate URLs for dynamic content
-        
-        # Projects
-        projects = Project.objects.filter(is_featured=True)[:20]  # Limit to featured projects
-        for project in projects:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            loc = ET.SubElement(url_elem, 'loc')
-            loc.text = f"{base_url}/projects/{project.slug}/"
-            
-            lastmod = ET.SubElement(url_elem, 'lastmod')
-            lastmod.text = project.updated_at.strftime('%Y-%m-%d')
-            
-            changefreq = ET.SubElement(url_elem, 'changefreq')
-            changefreq.text = 'monthly'
-            
-            priority = ET.SubElement(url_elem, 'priority')
-            priority.text = '0.8'
-            
-            # Add image if available
-            if project.image or project.image_url:
-                image_elem = ET.SubElement(url_elem, 'image:image')
-                image_loc = ET.SubElement(image_elem, 'image:loc')
-                if project.image:
-                    image_loc.text = f"{base_url}{project.image.url}"
-                else:
-                    image_loc.text = project.image_url
-                
-                image_title = ET.SubElement(image_elem, 'image:title')
-                image_title.text = project.title
-        
-        # Blog Posts
-        blog_posts = BlogPost.objects.filter(is_published=True)[:50]
-        for post in blog_posts:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            loc = ET.SubElement(url_elem, 'loc')
-            loc.text = f"{base_url}/blog/{post.slug}/"
-            
-            lastmod = ET.SubElement(url_elem, 'lastmod')
-            lastmod.text = post.updated_at.strftime('%Y-%m-%d')
-            
-            changefreq = ET.SubElement(url_elem, 'changefreq')
-            changefreq.text = 'weekly'
-            
-            priority = ET.SubElement(url_elem, 'priority')
-            priority.text = '0.7'
-            
-            # Add featured image if available
-            if post.featured_image or post.featured_image_url:
-                image_elem = ET.SubElement(url_elem, 'image:image')
-                image_loc = ET.SubElement(image_elem, 'image:loc')
-                if post.featured_image:
-                    image_loc.text = f"{base_url}{post.featured_image.url}"
-                else:
-                    image_loc.text = post.featured_image_url
-                
-                image_title = ET.SubElement(image_elem, 'image:title')
-                image_title.text = post.title
-        
-        # Services
-        services = Service.objects.filter(is_active=True)
-        for service in services:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            loc = ET.SubElement(url_elem, 'loc')
-            loc.text = f"{base_url}/services/{service.slug}/"
-            
-            lastmod = ET.SubElement(url_elem, 'lastmod')
-            lastmod.text = service.created_at.strftime('%Y-%m-%d')
-            
-            changefreq = ET.SubElement(url_elem, 'changefreq')
-            changefreq.text = 'monthly'
-            
-            priority = ET.SubElement(url_elem, 'priority')
-            priority.text = '0.8'
-        
-        # Convert to string
-        xml_string = ET.tostring(urlset, encoding='unicode', method='xml')
-        xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        
-        response = HttpResponse(xml_declaration + xml_string, content_type='application/xml')
-        return response
-        
-    except Exception as e:
-        # Log error and return minimal sitemap
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        # Add at least the homepage
-        url_elem = ET.SubElement(urlset, 'url')
-        loc = ET.SubElement(url_elem, 'loc')
-        loc.text = f"https://{get_current_site(request).domain}/"
-        
-        xml_string = ET.tostring(urlset, encoding='unicode', method='xml')
-        xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        
-        response = HttpResponse(xml_declaration + xml_string, content_type='application/xml')
-        return response
+def sitemap_response(chunks, compress=False):
+    """Stream a sitemap document, gzipped for the ``.gz`` URLs"""
+    if compress:
+        return StreamingHttpResponse(sitemaps.gzip_stream(chunks), content_type='application/gzip')
+    return StreamingHttpResponse(chunks, content_type='application/xml')
 
 
-@cache_page(60 * 60 * 24)  # Cache for 24 hours
-def robots_txt(request):
-    """Generate robots.txt file"""
+@conditional_view(sitemaps.SITEMAP_MODELS)
+def sitemap_xml(request, compress=False):
+    """Sitemap index listing the shards of every content type (see sitemaps.py)"""
+    current_site = get_current_site(request)
+    base_url = f"https://{current_site.domain}"
     try:
-        robots_config = RobotsTxt.objects.filter(is_active=True).first()
-        if robots_config:
-            content = robots_config.content
-        else:
-            # Default robots.txt content
-            current_site = get_current_site(request)
-            content = f"""User-agent: *
+        # Evaluated here so that a database error falls back below instead of breaking the stream
+        entries = list(sitemaps.index_entries(base_url))
+        return sitemap_response(sitemaps.render_index(entries), compress)
+    except Exception:
+        # Minimal sitemap with at least the homepage
+        return sitemap_response(
+            sitemaps.render_urlset([(f"{base_url}/", None, 'daily', '1.0', None)]), compress
+        )
+
+
+@conditional_view(sitemaps.SITEMAP_MODELS)
+def sitemap_section(request, section, page=None, compress=False):
+    """One shard of a content type's sitemap, e.g. sitemap-blog.xml or sitemap-projects-2.xml.gz"""
+    page = int(page or 1)
+    sitemap_section = sitemaps.get_section(section, page)
+    if sitemap_section is None:
+        raise Http404("No such sitemap")
+    base_url = f"https://{get_current_site(request).domain}"
+    return sitemap_response(sitemaps.render_shard(sitemap_section, page, base_url), compress)
+
+
+def robots_txt_content(domain):
+    """The robots.txt text: the active RobotsTxt row, or a default pointing at the sitemap"""
+    robots_config = RobotsTxt.objects.filter(is_active=True).first()
+    if robots_config:
+        return robots_config.content
+
+    # Default robots.txt content
+    return f"""User-agent: *
 Disallow: /admin/
 Disallow: /api/
 Disallow: /static/admin/
@@ -175,12 +72,18 @@ Allow: /contact/
 Allow: /blog/
 
 # Sitemap location
-Sitemap: https://{current_site.domain}/sitemap.xml
+Sitemap: https://{domain}/sitemap.xml
 
 # Crawl-delay for courtesy
 Crawl-delay: 1
 """
-        
+
+
+@conditional_view([RobotsTxt])
+def robots_txt(request):
+    """Generate robots.txt file"""
+    try:
+        content = robots_txt_content(get_current_site(request).domain)
         return HttpResponse(content, content_type='text/plain')
         
     except Exception:
@@ -193,6 +96,142 @@ Sitemap: /sitemap.xml
 """, content_type='text/plain')
 
 
+_page_contexts_lock = threading.Lock()
+_page_contexts = {}
+
+
+def page_meta_context(domain, page_type=None):
+    """
+    Meta context shared by every page of ``page_type`` on ``domain``.
+    Built from SEOSettings and SEOMetaTags and memoized per process until either
+    model's cache tag moves on, so repeated calls cost a cache lookup and no SQL.
+    Callers must not modify the returned dict.
+    """
+    tags = [caching.model_tag(SEOMetaTags), caching.model_tag(SEOSettings)]
+    versions = caching.get_tag_versions(tags)
+    version = tuple(versions[tag] for tag in tags)
+    caching.note_tags(*tags)
+
+    key = (domain, page_type)
+    cached = _page_contexts.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    context = build_page_meta_context(domain, page_type)
+    with _page_contexts_lock:
+        _page_contexts[key] = (version, context)
+    return context
+
+
+def clear_page_meta_contexts():
+    """Forget every memoized page context (used by tests)"""
+    with _page_contexts_lock:
+        _page_contexts.clear()
+
+
+def build_page_meta_context(domain, page_type=None):
+    """Meta context of ``page_type`` on ``domain``, without the per-URL fields"""
+    base_url = f"https://{domain}"
+
+    # Get global SEO settings
+    seo_settings = get_seo_settings()
+
+    # Default meta tags; an empty canonical_url means the page's own URL
+    meta_context = {
+        'site_name': seo_settings.site_name if seo_settings else 'site gen it',
+        'meta_title': 'Professional site gen it - Web Development & Design Services',
+        'meta_description': 'Leading site gen it specializing in web development, mobile apps, UI/UX design, and digital marketing. Transform your business with our expert solutions.',
+        'meta_keywords': 'web development, site gen it, mobile apps, UI/UX design, digital marketing',
+        'canonical_url': '',
+        'og_title': '',
+        'og_description': '',
+        'og_image': f"{base_url}/static/images/og-default.jpg",
+        'og_type': 'website',
+        'og_url': '',
+        'twitter_card': 'summary_large_image',
+        'twitter_title': '',
+        'twitter_description': '',
+        'twitter_image': f"{base_url}/static/images/twitter-default.jpg",
+        'robots': 'index, follow',
+        'schema_data': {},
+    }
+
+    # Get page-specific SEO meta tags
+    if page_type:
+        try:
+            seo_meta = SEOMetaTags.objects.get(page_type=page_type, is_active=True)
+
+            meta_context.update({
+                'meta_title': seo_meta.meta_title,
+                'meta_description': seo_meta.meta_description,
+                'meta_keywords': seo_meta.meta_keywords,
+                'og_title': seo_meta.og_title or seo_meta.meta_title,
+                'og_description': seo_meta.og_description or seo_meta.meta_description,
+                'og_type': seo_meta.og_type,
+                'twitter_card': seo_meta.twitter_card,
+                'twitter_title': seo_meta.twitter_title or seo_meta.meta_title,
+                'twitter_description': seo_meta.twitter_description or seo_meta.meta_description,
+                'robots': seo_meta.robots_directive,
+            })
+
+            # Add images if available
+            if seo_meta.og_image:
+                meta_context['og_image'] = f"{base_url}{seo_meta.og_image.url}"
+            elif seo_meta.og_image_url:
+                meta_context['og_image'] = seo_meta.og_image_url
+
+            if seo_meta.twitter_image:
+                meta_context['twitter_image'] = f"{base_url}{seo_meta.twitter_image.url}"
+            elif seo_meta.twitter_image_url:
+                meta_context['twitter_image'] = seo_meta.twitter_image_url
+
+            # Add canonical URL if specified
+            if seo_meta.canonical_url:
+                meta_context['canonical_url'] = seo_meta.canonical_url
+
+            # Add schema data
+            if seo_meta.schema_data:
+                meta_context['schema_data'] = seo_meta.schema_data
+
+        except SEOMetaTags.DoesNotExist:
+            pass
+
+    # Generate structured data for organization
+    if seo_settings:
+        organization_schema = {
+            "@context": "https://schema.org",
+            "@type": "Organization",
+            "name": seo_settings.business_name,
+            "url": base_url,
+            "logo": f"{base_url}/static/images/logo.png",
+            "description": seo_settings.default_meta_description,
+            "contactPoint": {
+                "@type": "ContactPoint",
+                "telephone": seo_settings.phone,
+                "contactType": "customer service",
+                "email": seo_settings.email
+            },
+            "address": {
+                "@type": "PostalAddress",
+                "addressCountry": seo_settings.country,
+                "addressRegion": seo_settings.region,
+                "addressLocality": seo_settings.city
+            },
+            "sameAs": [
+                url for url in [
+                    seo_settings.facebook_url,
+                    seo_settings.twitter_url,
+                    seo_settings.linkedin_url,
+                    seo_settings.instagram_url,
+                    seo_settings.youtube_url
+                ] if url
+            ]
+        }
+        meta_context['organization_schema'] = organization_schema
+
+    return meta_context
+
+
 def seo_meta_context(request, page_type=None, content_object=None):
     """
     Get SEO meta context for templates
@@ -203,69 +242,11 @@ def seo_meta_context(request, page_type=None, content_object=None):
         current_site = get_current_site(request)
         base_url = f"https://{current_site.domain}"
         current_url = f"{base_url}{request.path}"
-        
-        # Get global SEO settings
-        seo_settings = SEOSettings.objects.first()
-        
-        # Default meta tags
-        meta_context = {
-            'site_name': seo_settings.site_name if seo_settings else 'site gen it',
-            'meta_title': 'Professional site gen it - Web Development & Design Services',
-            'meta_description': 'Leading site gen it specializing in web development, mobile apps, UI/UX design, and digital marketing. Transform your business with our expert solutions.',
-            'meta_keywords': 'web development, site gen it, mobile apps, UI/UX design, digital marketing',
-            'canonical_url': current_url,
-            'og_title': '',
-            'og_description': '',
-            'og_image': f"{base_url}/static/images/og-default.jpg",
-            'og_type': 'website',
-            'og_url': current_url,
-            'twitter_card': 'summary_large_image',
-            'twitter_title': '',
-            'twitter_description': '',
-            'twitter_image': f"{base_url}/static/images/twitter-default.jpg",
-            'robots': 'index, follow',
-            'schema_data': {},
-        }
-        
-        # Get page-specific SEO meta tags
-        if page_type:
-            try:
-                seo_meta = SEOMetaTags.objects.get(page_type=page_type, is_active=True)
-                
-                meta_context.update({
-                    'meta_title': seo_meta.meta_title,
-                    'meta_description': seo_meta.meta_description,
-                    'meta_keywords': seo_meta.meta_keywords,
-                    'og_title': seo_meta.og_title or seo_meta.meta_title,
-                    'og_description': seo_meta.og_description or seo_meta.meta_description,
-                    'og_type': seo_meta.og_type,
-                    'twitter_card': seo_meta.twitter_card,
-                    'twitter_title': seo_meta.twitter_title or seo_meta.meta_title,
-                    'twitter_description': seo_meta.twitter_description or seo_meta.meta_description,
-                    'robots': seo_meta.robots_directive,
-                })
-                
-                # Add images if available
-                if seo_meta.og_image:
-                    meta_context['og_image'] = f"{base_url}{seo_meta.og_image.url}"
-                elif seo_meta.og_image_url:
-                    meta_context['og_image'] = seo_meta.og_image_url
-                
-                if seo_meta.twitter_image:
-                    meta_context['twitter_image'] = f"{base_url}{seo_meta.twitter_image.url}"
-                elif seo_meta.twitter_image_url:
-                    meta_context['twitter_image'] = seo_meta.twitter_image_url
-                
-                # Add canonical URL if specified
-                if seo_meta.canonical_url:
-                    meta_context['canonical_url'] = seo_meta.canonical_url
-                
-                # Add schema data
-                if seo_meta.schema_data:
-                    meta_context['schema_data'] = seo_meta.schema_data
-                    
-            except SEOMetaTags.DoesNotExist:
-                pass
+
+        # Copy the shared page context and fill in this URL
+        meta_context = copy.deepcopy(page_meta_context(current_site.domain, page_type))
+        meta_context['canonical_url'] = meta_context['canonical_url'] or current_url
+        meta_context['og_url'] = current_url
         
         # Content-specific optimizations
         if content_object:
@@ -292,39 +273,6 @@ def seo_meta_context(request, page_type=None, content_object=None):
                 meta_context['og_image'] = f"{base_url}{content_object.featured_image.url}"
                 meta_context['twitter_image'] = f"{base_url}{content_object.featured_image.url}"
         
-        # Generate structured data for organization
-        if seo_settings:
-            organization_schema = {
-                "@context": "https://schema.org",
-                "@type": "Organization",
-                "name": seo_settings.business_name,
-                "url": base_url,
-                "logo": f"{base_url}/static/images/logo.png",
-                "description": seo_settings.default_meta_description,
-                "contactPoint": {
-                    "@type": "ContactPoint",
-                    "telephone": seo_settings.phone,
-                    "contactType": "customer service",
-                    "email": seo_settings.email
-                },
-                "address": {
-                    "@type": "PostalAddress",
-                    "addressCountry": seo_settings.country,
-                    "addressRegion": seo_settings.region,
-                    "addressLocality": seo_settings.city
-                },
-                "sameAs": [
-                    url for url in [
-                        seo_settings.facebook_url,
-                        seo_settings.twitter_url,
-                        seo_settings.linkedin_url,
-                        seo_settings.instagram_url,
-                        seo_settings.youtube_url
-                    ] if url
-                ]
-            }
-            meta_context['organization_schema'] = organization_schema
-        
         return meta_context
         
     except Exception:
@@ -407,7 +355,7 @@ def seo_check(request):
     """
     try:
         # Check SEO settings
-        seo_settings = SEOSettings.objects.first()
+        seo_settings = get_seo_settings()
         meta_tags_count = SEOMetaTags.objects.filter(is_active=True).count()
         sitemap_urls_count = SitemapURL.objects.filter(is_active=True).count()
         
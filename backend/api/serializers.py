@@ -8,9 +8,10 @@ from .models import (
     NavigationMenu, SubMenuItem, PageContent, SectionContent, CompanyInfo,
     TeamMember, JobPosition, FeatureFlag, SiteSettings
 )
+from .sparse_fields import SparseFieldsMixin
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = [
@@ -26,7 +27,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         return obj.image_url
 
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class TestimonialSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     project_title = serializers.CharField(source='project.title', read_only=True)
     
     class Meta:
@@ -36,6 +37,7 @@ class TestimonialSerializer(serializers.ModelSerializer):
             'image', 'image_url', 'project', 'project_title', 'is_featured', 'created_at'
         ]
         read_only_fields = ['id', 'created_at', 'project_title']
+        expandable_fields = {'project': ProjectSerializer}
 
     def get_image_url(self, obj):
         if obj.image:
@@ -65,7 +67,7 @@ class ContactMessageSerializer(serializers.ModelSerializer):
         return value
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Service
         fields = [
@@ -75,7 +77,7 @@ class ServiceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'slug']
 
 
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BlogPost
         fields = [
@@ -91,7 +93,7 @@ class BlogPostSerializer(serializers.ModelSerializer):
         return obj.featured_image_url
 
 
-class BlogPostListSerializer(serializers.ModelSerializer):
+class BlogPostListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for blog post lists"""
     class Meta:
         model = BlogPost
@@ -263,7 +265,7 @@ class MeetingRequestSerializer(serializers.ModelSerializer):
         return value
 
 
-class MeetingRequestListSerializer(serializers.ModelSerializer):
+class MeetingRequestListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for meeting request lists"""
     class Meta:
         model = MeetingRequest
@@ -273,7 +275,7 @@ class MeetingRequestListSerializer(serializers.ModelSerializer):
         ]
 
 
-class HelpArticleSerializer(serializers.ModelSerializer):
+class HelpArticleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = HelpArticle
         fields = [
@@ -284,7 +286,7 @@ class HelpArticleSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'slug', 'view_count', 'helpful_votes', 'created_at', 'updated_at']
 
 
-class HelpArticleListSerializer(serializers.ModelSerializer):
+class HelpArticleListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for help article lists"""
     class Meta:
         model = HelpArticle
@@ -294,7 +296,7 @@ class HelpArticleListSerializer(serializers.ModelSerializer):
         ]
 
 
-class CaseStudySerializer(serializers.ModelSerializer):
+class CaseStudySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     testimonial_data = TestimonialSerializer(source='testimonial', read_only=True)
     
     class Meta:
@@ -307,6 +309,7 @@ class CaseStudySerializer(serializers.ModelSerializer):
             'metrics', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at']
+        expandable_fields = {'testimonial': TestimonialSerializer}
     
     def get_featured_image_url(self, obj):
         if obj.featured_image:
@@ -314,7 +317,7 @@ class CaseStudySerializer(serializers.ModelSerializer):
         return obj.featured_image_url
 
 
-class CaseStudyListSerializer(serializers.ModelSerializer):
+class CaseStudyListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for case study lists"""
     class Meta:
         model = CaseStudy
@@ -323,13 +326,14 @@ class CaseStudyListSerializer(serializers.ModelSerializer):
             'featured_image', 'featured_image_url', 'project_duration',
             'is_featured', 'technologies_used'
         ]
+        expandable_fields = {'testimonial': TestimonialSerializer}
 
 
 # =============================================================================
 # CONTENT MANAGEMENT SERIALIZERS
 # =============================================================================
 
-class SubMenuItemSerializer(serializers.ModelSerializer):
+class SubMenuItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for submenu items"""
     class Meta:
         model = SubMenuItem
@@ -339,7 +343,7 @@ class SubMenuItemSerializer(serializers.ModelSerializer):
         ]
 
 
-class NavigationMenuSerializer(serializers.ModelSerializer):
+class NavigationMenuSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for navigation menus with submenu items"""
     submenu_items = SubMenuItemSerializer(many=True, read_only=True)
     
@@ -351,7 +355,7 @@ class NavigationMenuSerializer(serializers.ModelSerializer):
         ]
 
 
-class SectionContentSerializer(serializers.ModelSerializer):
+class SectionContentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for section content"""
     class Meta:
         model = SectionContent
@@ -362,7 +366,7 @@ class SectionContentSerializer(serializers.ModelSerializer):
         ]
 
 
-class PageContentSerializer(serializers.ModelSerializer):
+class PageContentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for page content with sections"""
     sections = SectionContentSerializer(many=True, read_only=True)
     
@@ -375,7 +379,7 @@ class PageContentSerializer(serializers.ModelSerializer):
         ]
 
 
-class CompanyInfoSerializer(serializers.ModelSerializer):
+class CompanyInfoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for company information"""
     logo_url = serializers.SerializerMethodField()
     favicon_url = serializers.SerializerMethodField()
@@ -388,6 +392,7 @@ class CompanyInfoSerializer(serializers.ModelSerializer):
             'linkedin_url', 'instagram_url', 'youtube_url', 'meta_keywords',
             'meta_description', 'logo', 'logo_url', 'favicon', 'favicon_url'
         ]
+        field_sources = {'logo_url': ['logo'], 'favicon_url': ['favicon']}
     
     def get_logo_url(self, obj):
         if obj.logo and hasattr(obj.logo, 'url'):
@@ -406,7 +411,7 @@ class CompanyInfoSerializer(serializers.ModelSerializer):
         return None
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for team members"""
     image_url_full = serializers.SerializerMethodField()
     
@@ -417,6 +422,7 @@ class TeamMemberSerializer(serializers.ModelSerializer):
             'image_url_full', 'years_experience', 'skills', 'email', 'linkedin_url',
             'twitter_url', 'github_url', 'is_active', 'is_featured', 'order'
         ]
+        field_sources = {'image_url_full': ['image', 'image_url']}
     
     def get_image_url_full(self, obj):
         if obj.image and hasattr(obj.image, 'url'):
@@ -427,7 +433,7 @@ class TeamMemberSerializer(serializers.ModelSerializer):
         return obj.image_url
 
 
-class TeamMemberListSerializer(serializers.ModelSerializer):
+class TeamMemberListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for team member lists"""
     image_url_full = serializers.SerializerMethodField()
     
@@ -437,6 +443,7 @@ class TeamMemberListSerializer(serializers.ModelSerializer):
             'id', 'name', 'position', 'department', 'image_url', 'image_url_full',
             'years_experience', 'is_featured'
         ]
+        field_sources = {'image_url_full': ['image', 'image_url']}
     
     def get_image_url_full(self, obj):
         if obj.image and hasattr(obj.image, 'url'):
@@ -447,7 +454,7 @@ class TeamMemberListSerializer(serializers.ModelSerializer):
         return obj.image_url
 
 
-class JobPositionSerializer(serializers.ModelSerializer):
+class JobPositionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for job positions"""
     is_expired = serializers.ReadOnlyField()
     salary_range = serializers.SerializerMethodField()
@@ -461,6 +468,10 @@ class JobPositionSerializer(serializers.ModelSerializer):
             'salary_range', 'is_active', 'is_featured', 'application_deadline',
             'is_expired', 'created_at'
         ]
+        field_sources = {
+            'salary_range': ['salary_min', 'salary_max', 'salary_currency'],
+            'is_expired': ['application_deadline'],
+        }
     
     def get_salary_range(self, obj):
         if obj.salary_min and obj.salary_max:
@@ -472,7 +483,7 @@ class JobPositionSerializer(serializers.ModelSerializer):
         return "Competitive"
 
 
-class JobPositionListSerializer(serializers.ModelSerializer):
+class JobPositionListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for job position lists"""
     is_expired = serializers.ReadOnlyField()
     salary_range = serializers.SerializerMethodField()
@@ -484,6 +495,10 @@ class JobPositionListSerializer(serializers.ModelSerializer):
             'location', 'salary_range', 'is_featured', 'application_deadline',
             'is_expired'
         ]
+        field_sources = {
+            'salary_range': ['salary_min', 'salary_max', 'salary_currency'],
+            'is_expired': ['application_deadline'],
+        }
     
     def get_salary_range(self, obj):
         if obj.salary_min and obj.salary_max:
@@ -495,14 +510,14 @@ class JobPositionListSerializer(serializers.ModelSerializer):
         return "Competitive"
 
 
-class FeatureFlagSerializer(serializers.ModelSerializer):
+class FeatureFlagSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for feature flags"""
     class Meta:
         model = FeatureFlag
-        fields = ['name', 'description', 'is_enabled']
+        fields = ['name', 'description', 'is_enabled', 'rollout_percentage']
 
 
-class SiteSettingsSerializer(serializers.ModelSerializer):
+class SiteSettingsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for site settings"""
     class Meta:
         model = SiteSettings
@@ -0,0 +1,107 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from . import caching, feature_flags, redirects, search, seo_files, technologies
+from .models import FeatureFlag, Project, RedirectRule, RobotsTxt
+from .sitemaps import SITEMAP_MODELS
+from .snapshots import HOMEPAGE_MODELS, schedule_homepage_rebuild
+
+
+@receiver(post_save, dispatch_uid='api_invalidate_on_save')
+@receiver(post_delete, dispatch_uid='api_invalidate_on_delete')
+def invalidate_model_tag(sender, **kwargs):
+    """
+    Bump the cache tag of any api model that is saved or deleted.
+    The tag is bumped again once the transaction commits so that a response
+    cached from a concurrent read of the old data does not survive the write.
+    """
+    if sender._meta.app_label != 'api':
+        return
+
+    tags = [caching.model_tag(sender)]
+    caching.bump_tags(tags)
+    transaction.on_commit(lambda: caching.bump_tags(tags))
+
+
+@receiver(post_save, dispatch_uid='api_homepage_snapshot_on_save')
+@receiver(post_delete, dispatch_uid='api_homepage_snapshot_on_delete')
+def rebuild_homepage_snapshot(sender, **kwargs):
+    """Rebuild the homepage snapshot in the background once the write is committed"""
+    if sender in HOMEPAGE_MODELS:
+        transaction.on_commit(schedule_homepage_rebuild)
+
+
+@receiver(post_save, dispatch_uid='api_seo_files_on_save')
+@receiver(post_delete, dispatch_uid='api_seo_files_on_delete')
+def render_seo_files(sender, **kwargs):
+    """Re-render the sitemap and robots.txt files in the background once the write is committed"""
+    if sender in SITEMAP_MODELS or sender is RobotsTxt:
+        transaction.on_commit(seo_files.schedule_render)
+
+
+@receiver(post_save, sender=FeatureFlag, dispatch_uid='api_feature_flags_on_save')
+@receiver(post_delete, sender=FeatureFlag, dispatch_uid='api_feature_flags_on_delete')
+def reset_feature_flags(sender, **kwargs):
+    """Reload flags in this process right away; other processes follow the tag version"""
+    feature_flags.reset()
+    transaction.on_commit(feature_flags.reset)
+
+
+@receiver(pre_save, sender=RedirectRule, dispatch_uid='api_redirects_before_save')
+def flatten_redirect_chain(sender, instance, update_fields=None, **kwargs):
+    """Store the end of the chain as the destination, so a redirect is always one hop"""
+    if update_fields is None or 'destination_url' in update_fields:
+        redirects.flatten_destination(instance)
+
+
+@receiver(post_save, sender=RedirectRule, dispatch_uid='api_redirects_on_save')
+@receiver(post_delete, sender=RedirectRule, dispatch_uid='api_redirects_on_delete')
+def reset_redirects(sender, instance, **kwargs):
+    """Repoint rules chained through this one and recompile the table in this process"""
+    if kwargs['signal'] is post_save:
+        redirects.repoint_chains(instance)
+    redirects.reset()
+    transaction.on_commit(redirects.reset)
+
+
+@receiver(post_save, dispatch_uid='api_search_index_on_save')
+def update_search_document(sender, instance, **kwargs):
+    """Re-index a searchable row once the write is committed"""
+    if search.get_search_type(sender) is not None:
+        transaction.on_commit(lambda: search.index_instance(instance))
+
+
+@receiver(post_delete, dispatch_uid='api_search_index_on_delete')
+def remove_search_document(sender, instance, **kwargs):
+    search_type = search.get_search_type(sender)
+    if search_type is not None:
+        object_id = instance.pk
+        transaction.on_commit(lambda: search.remove_document(search_type, object_id))
+
+
+@receiver(pre_save, sender=Project, dispatch_uid='api_technology_usage_before_save')
+def remember_project_technologies(sender, instance, update_fields=None, **kwargs):
+    """Keep the stored technology list so post_save can apply only the difference"""
+    if update_fields is not None and 'technologies' not in update_fields:
+        instance._previous_technologies = None
+        return
+    if instance._state.adding or instance.pk is None:
+        instance._previous_technologies = []
+    else:
+        stored = sender.objects.filter(pk=instance.pk).values_list('technologies', flat=True).first()
+        instance._previous_technologies = stored or []
+
+
+@receiver(post_save, sender=Project, dispatch_uid='api_technology_usage_on_save')
+def update_technology_usage(sender, instance, **kwargs):
+    """Adjust the technology counts in the same transaction as the project write"""
+    previous = getattr(instance, '_previous_technologies', None)
+    if previous is not None:
+        technologies.record_change(previous, instance.technologies)
+        instance._previous_technologies = None
+
+
+@receiver(post_delete, sender=Project, dispatch_uid='api_technology_usage_on_delete')
+def remove_technology_usage(sender, instance, **kwargs):
+    technologies.record_change(instance.technologies, [])
@@ -0,0 +1,74 @@
+"""
+Process-local cache for the single-instance settings models.
+
+CompanyInfo, SiteSettings and SEOSettings are read on almost every request but
+change only when someone edits them in the admin. Each process keeps the row in
+memory together with the cache tag version it was loaded under (see caching.py);
+saving or deleting the row bumps the tag, and the next read reloads it. A read
+therefore costs one cache lookup and no SQL.
+
+The default rows are created by migration 0007, so nothing here writes to the
+database.
+"""
+import threading
+
+from . import caching
+from .models import CompanyInfo, SiteSettings, SEOSettings
+
+
+COMPANY_INFO_DEFAULTS = {
+    'company_name': 'site gen it',
+    'email': 'info@agency.com',
+    'tagline': 'Your Creative Digital Partner',
+    'description': 'We create innovative digital solutions that drive business growth.',
+}
+
+SITE_SETTINGS_DEFAULTS = {
+    'site_name': 'site gen it',
+    'site_description': 'Your Creative Digital Partner',
+    'contact_email': 'contact@agency.com',
+    'support_email': 'support@agency.com',
+    'primary_color': '#00f5ff',
+    'secondary_color': '#9966ff',
+}
+
+_lock = threading.Lock()
+_rows = {}
+
+
+def get_singleton(model):
+    """Return the single row of ``model`` (or None), reloading it only after it changed"""
+    tag = caching.model_tag(model)
+    version = caching.get_tag_versions([tag])[tag]
+    # No SQL runs on a hit, so tell the response cache what was read
+    caching.note_tags(tag)
+
+    cached = _rows.get(model)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    instance = model._default_manager.order_by('pk').first()
+    with _lock:
+        _rows[model] = (version, instance)
+    return instance
+
+
+def clear_singletons():
+    """Forget every cached row (used by tests and after bulk imports)"""
+    with _lock:
+        _rows.clear()
+
+
+def get_company_info():
+    """The company information row; an unsaved default if it has been deleted"""
+    return get_singleton(CompanyInfo) or CompanyInfo(id=1, **COMPANY_INFO_DEFAULTS)
+
+
+def get_site_settings():
+    """The site settings row; an unsaved default if it has been deleted"""
+    return get_singleton(SiteSettings) or SiteSettings(id=1, **SITE_SETTINGS_DEFAULTS)
+
+
+def get_seo_settings():
+    """The SEO settings row, or None when SEO has not been configured"""
+    return get_singleton(SEOSettings)
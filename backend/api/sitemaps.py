@@ -0,0 +1,299 @@
+"""
+Sitemap generation.
+
+The sitemap is split per content type into sections (``sitemap-projects.xml``,
+``sitemap-blog.xml``, ...) listed by a sitemap index at ``/sitemap.xml``. A
+section holding more than ``SITEMAP_SHARD_SIZE`` URLs (50,000, the protocol
+limit) is split into numbered shards: ``sitemap-projects.xml``,
+``sitemap-projects-2.xml``, ...
+
+Documents are generated as a stream of string chunks: rows are read with
+``values()`` through ``.iterator()``, written out and dropped, so memory use
+does not grow with the number of URLs. Every document is also available
+gzipped by appending ``.gz``, compressed on the fly.
+
+``lastmod`` is the row's own modification time (``updated_at`` for content,
+``last_modified`` for the manual ``SitemapURL`` entries); the index uses the
+newest one of each shard.
+"""
+import math
+import zlib
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .models import BlogPost, CaseStudy, HelpArticle, JobPosition, Project, Service, SitemapURL
+
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+IMAGE_NAMESPACE = 'http://www.google.com/schemas/sitemap-image/1.1'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Rows fetched per database round trip, and <url> elements per yielded chunk
+ITERATOR_CHUNK_SIZE = 2000
+WRITE_CHUNK_SIZE = 500
+
+
+def shard_size():
+    return getattr(settings, 'SITEMAP_SHARD_SIZE', 50000)
+
+
+def format_lastmod(value):
+    return value.isoformat(timespec='seconds') if value else None
+
+
+def file_url(model, field, name):
+    """Public URL of a stored file name, as FieldFile.url would build it"""
+    return model._meta.get_field(field).storage.url(name)
+
+
+class Section:
+    """The URLs of one content type"""
+    name = None
+    model = None
+    path = None
+    lastmod_field = 'updated_at'
+    changefreq = 'monthly'
+    priority = '0.5'
+    fields = ('slug',)
+    image_field = None
+    image_url_field = None
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def count(self):
+        return self.get_queryset().count()
+
+    def summary(self):
+        """``(url count, newest lastmod)`` in one query"""
+        aggregate = self.get_queryset().aggregate(count=Count('pk'), last=Max(self.lastmod_field))
+        return aggregate['count'], aggregate['last']
+
+    def shard_count(self, count=None):
+        """Number of shards; a section always has at least one, possibly empty"""
+        count = self.count() if count is None else count
+        return max(1, math.ceil(count / shard_size()))
+
+    def shard_filename(self, page):
+        return f'sitemap-{self.name}.xml' if page == 1 else f'sitemap-{self.name}-{page}.xml'
+
+    def shard_rows(self, page):
+        """The rows of a shard, in a stable order, read in chunks"""
+        start = (page - 1) * shard_size()
+        fields = {'pk', self.lastmod_field, *self.fields}
+        if self.image_field:
+            fields.update([self.image_field, 'title'])
+        if self.image_url_field:
+            fields.add(self.image_url_field)
+        queryset = self.get_queryset().order_by('pk').values(*fields)[start:start + shard_size()]
+        return queryset.iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+
+    def shard_lastmod(self, page):
+        start = (page - 1) * shard_size()
+        pks = self.get_queryset().order_by('pk').values('pk')[start:start + shard_size()]
+        return self.model.objects.filter(pk__in=pks).aggregate(last=Max(self.lastmod_field))['last']
+
+    def location(self, row):
+        return self.path.format(**row)
+
+    def image(self, row, base_url):
+        """``(url, title)`` of the row's image, or None"""
+        if self.image_field and row.get(self.image_field):
+            return f"{base_url}{file_url(self.model, self.image_field, row[self.image_field])}", row['title']
+        if self.image_url_field and row.get(self.image_url_field):
+            return row[self.image_url_field], row['title']
+        return None
+
+    def entries(self, page, base_url):
+        """``(loc, lastmod, changefreq, priority, image)`` for every URL of a shard"""
+        for row in self.shard_rows(page):
+            yield (
+                f"{base_url}{self.location(row)}",
+                row[self.lastmod_field],
+                row.get('change_frequency', self.changefreq),
+                row.get('priority', self.priority),
+                self.image(row, base_url),
+            )
+
+
+class PagesSection(Section):
+    """Manually maintained SitemapURL entries"""
+    name = 'pages'
+    model = SitemapURL
+    path = '{url_path}'
+    lastmod_field = 'last_modified'
+    fields = ('url_path', 'change_frequency', 'priority')
+
+    def get_queryset(self):
+        return SitemapURL.objects.filter(is_active=True)
+
+
+class ProjectsSection(Section):
+    name = 'projects'
+    model = Project
+    path = '/projects/{slug}/'
+    priority = '0.8'
+    image_field = 'image'
+    image_url_field = 'image_url'
+
+
+class BlogSection(Section):
+    name = 'blog'
+    model = BlogPost
+    path = '/blog/{slug}/'
+    changefreq = 'weekly'
+    priority = '0.7'
+    image_field = 'featured_image'
+    image_url_field = 'featured_image_url'
+
+    def get_queryset(self):
+        return BlogPost.objects.filter(is_published=True)
+
+
+class ServicesSection(Section):
+    name = 'services'
+    model = Service
+    path = '/services/{slug}/'
+    # Services have no modification time
+    lastmod_field = 'created_at'
+    priority = '0.8'
+
+    def get_queryset(self):
+        return Service.objects.filter(is_active=True)
+
+
+class CaseStudiesSection(Section):
+    name = 'case-studies'
+    model = CaseStudy
+    path = '/case-studies/{slug}/'
+    priority = '0.7'
+    image_field = 'featured_image'
+    image_url_field = 'featured_image_url'
+
+    def get_queryset(self):
+        return CaseStudy.objects.filter(is_published=True)
+
+
+class HelpSection(Section):
+    name = 'help'
+    model = HelpArticle
+    path = '/help/{slug}/'
+    priority = '0.4'
+
+    def get_queryset(self):
+        return HelpArticle.objects.filter(is_published=True)
+
+
+class CareersSection(Section):
+    """Open positions are listed on a single careers page, last modified with the newest one"""
+    name = 'careers'
+    model = JobPosition
+    path = '/careers/'
+    changefreq = 'weekly'
+    priority = '0.6'
+
+    def get_queryset(self):
+        return JobPosition.objects.filter(is_active=True)
+
+    def count(self):
+        return 1 if self.get_queryset().exists() else 0
+
+    def summary(self):
+        last = self.shard_lastmod(1)
+        return (1 if last is not None else 0), last
+
+    def shard_lastmod(self, page):
+        return self.get_queryset().aggregate(last=Max('updated_at'))['last']
+
+    def entries(self, page, base_url):
+        lastmod = self.shard_lastmod(page)
+        if lastmod is not None:
+            yield f"{base_url}{self.path}", lastmod, self.changefreq, self.priority, None
+
+
+SECTIONS = {
+    section.name: section
+    for section in (
+        PagesSection(), ProjectsSection(), BlogSection(), ServicesSection(),
+        CaseStudiesSection(), HelpSection(), CareersSection(),
+    )
+}
+
+# Models whose changes alter some sitemap document
+SITEMAP_MODELS = [section.model for section in SECTIONS.values()]
+
+
+def get_section(name, page=1):
+    """The section called ``name`` if it has shard ``page``, else None"""
+    section = SECTIONS.get(name)
+    if section is None or page < 1 or page > section.shard_count():
+        return None
+    return section
+
+
+def index_entries(base_url):
+    """``(loc, lastmod)`` for every shard of every non-empty section"""
+    for section in SECTIONS.values():
+        count, last = section.summary()
+        if not count:
+            continue
+        shards = section.shard_count(count)
+        if shards == 1:
+            yield f"{base_url}/{section.shard_filename(1)}", last
+            continue
+        for page in range(1, shards + 1):
+            yield f"{base_url}/{section.shard_filename(page)}", section.shard_lastmod(page)
+
+
+def render_index(entries):
+    """Stream a sitemap index document"""
+    yield f'{XML_DECLARATION}<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+    for loc, lastmod in entries:
+        lastmod = f'<lastmod>{format_lastmod(lastmod)}</lastmod>' if lastmod else ''
+        yield f'<sitemap><loc>{escape(loc)}</loc>{lastmod}</sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def render_url(loc, lastmod, changefreq, priority, image):
+    parts = [f'<url><loc>{escape(loc)}</loc>']
+    if lastmod:
+        parts.append(f'<lastmod>{format_lastmod(lastmod)}</lastmod>')
+    parts.append(f'<changefreq>{changefreq}</changefreq><priority>{priority}</priority>')
+    if image:
+        image_loc, title = image
+        parts.append(
+            f'<image:image><image:loc>{escape(image_loc)}</image:loc>'
+            f'<image:title>{escape(title or "")}</image:title></image:image>'
+        )
+    parts.append('</url>\n')
+    return ''.join(parts)
+
+
+def render_urlset(entries):
+    """Stream a urlset document, a few hundred URLs per chunk"""
+    yield f'{XML_DECLARATION}<urlset xmlns="{SITEMAP_NAMESPACE}" xmlns:image="{IMAGE_NAMESPACE}">\n'
+    chunk = []
+    for entry in entries:
+        chunk.append(render_url(*entry))
+        if len(chunk) >= WRITE_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+    yield '</urlset>\n'
+
+
+def render_shard(section, page, base_url):
+    return render_urlset(section.entries(page, base_url))
+
+
+def gzip_stream(chunks):
+    """Gzip a stream of string chunks without holding the whole document"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
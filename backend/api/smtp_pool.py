@@ -0,0 +1,260 @@
+"""
+Pooled SMTP delivery.
+
+Opening an SMTP connection costs a TCP connect, a TLS handshake and an AUTH
+round trip. ``SMTPConnectionPool`` keeps up to ``SMTP_POOL_SIZE`` open,
+authenticated connections of the configured ``EMAIL_BACKEND`` and sends
+batches of messages over them with ``send_messages``:
+
+* a connection that dropped (server timeout, network blip) is reopened once
+  and the unsent rest of the batch goes out on the fresh connection;
+* connections idle for longer than ``SMTP_POOL_MAX_IDLE`` seconds are
+  recycled before use, since servers close them on their side anyway;
+* a circuit breaker opens after ``SMTP_CIRCUIT_FAILURE_THRESHOLD``
+  consecutive connection failures and fails fast for
+  ``SMTP_CIRCUIT_RESET_TIMEOUT`` seconds before letting a single trial batch
+  through; batches the server rejects (bad recipient, invalid message) do not
+  count, since the connection is fine;
+* ``stats()`` reports counters and throughput in messages per second.
+
+Backends without a network connection (console, locmem) work unchanged.
+"""
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+
+# Errors meaning the connection itself is gone, worth one reconnect
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of contacting a mail server that keeps failing"""
+
+
+class CircuitBreaker:
+    """
+    closed -> open after repeated failures -> half-open after a cool-down -> closed on success.
+    While half-open only one caller is let through; the rest are refused until it reports back.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = 'half_open'
+                self.trial_in_flight = False
+            if self.state == 'half_open':
+                if self.trial_in_flight:
+                    return False
+                self.trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """A bounded pool of open mail backend connections"""
+
+    def __init__(self, size=2, max_idle=60, backend=None, breaker=None):
+        self.size = size
+        self.max_idle = max_idle
+        self.backend = backend
+        self.breaker = breaker or CircuitBreaker()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._stats = {
+            'messages_sent': 0,
+            'messages_failed': 0,
+            'batches': 0,
+            'connections_opened': 0,
+            'reconnects': 0,
+            'send_seconds': 0.0,
+        }
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def _open(self):
+        connection = get_connection(self.backend, fail_silently=False)
+        connection.open()
+        self._count(connections_opened=1)
+        return connection
+
+    def _reopen(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        connection.open()
+        self._count(reconnects=1)
+
+    @contextmanager
+    def connection(self):
+        """Check out an open connection; it is closed instead of returned if the block fails"""
+        self._slots.acquire()
+        connection = None
+        try:
+            try:
+                connection, last_used = self._idle.get_nowait()
+                if time.monotonic() - last_used > self.max_idle:
+                    self._reopen(connection)
+            except queue.Empty:
+                connection = self._open()
+            yield connection
+        except Exception:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            connection = None
+            raise
+        finally:
+            if connection is not None:
+                self._idle.put((connection, time.monotonic()))
+            self._slots.release()
+
+    def _send(self, connection, messages):
+        # Messages go out one by one on the open connection so that after a
+        # drop only the unsent rest of the batch is retried, never a duplicate.
+        # A message that fails again right after a reconnect gives up.
+        sent = 0
+        index = 0
+        reconnected_at = None
+        while index < len(messages):
+            try:
+                sent += connection.send_messages([messages[index]])
+                index += 1
+            except RECONNECT_ERRORS:
+                if reconnected_at == index:
+                    raise
+                reconnected_at = index
+                self._reopen(connection)
+        return sent
+
+    def send_batches(self, batches):
+        """
+        Send several batches of messages over a single pooled connection.
+        Returns one ``(sent, error)`` pair per batch; ``error`` is None on success.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError('Mail server circuit is open')
+
+        results = []
+        started = time.perf_counter()
+        try:
+            with self.connection() as connection:
+                for messages in batches:
+                    try:
+                        sent = self._send(connection, messages)
+                    except RECONNECT_ERRORS:
+                        raise
+                    except Exception as e:
+                        # Rejected batch (bad recipient, ...): the connection is still usable,
+                        # so it is not held against the server
+                        self._count(messages_failed=len(messages))
+                        results.append((0, e))
+                        continue
+                    self._count(messages_sent=sent or 0)
+                    results.append((sent, None))
+            self.breaker.record_success()
+        except Exception as e:
+            # Could not connect, or the connection dropped again after reconnecting:
+            # fail the remaining batches without trying them
+            self.breaker.record_failure()
+            remaining = batches[len(results):]
+            self._count(messages_failed=sum(len(messages) for messages in remaining))
+            results += [(0, e) for _ in remaining]
+        finally:
+            self._count(batches=1, send_seconds=time.perf_counter() - started)
+        return results
+
+    def send_messages(self, messages):
+        """Send one batch; raises on failure like a backend's ``send_messages``"""
+        sent, error = self.send_batches([messages])[0]
+        if error is not None:
+            raise error
+        return sent
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['circuit_state'] = self.breaker.state
+        stats['messages_per_second'] = (
+            round(stats['messages_sent'] / stats['send_seconds'], 1) if stats['send_seconds'] else 0.0
+        )
+        return stats
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool():
+    """The shared pool for the configured EMAIL_BACKEND"""
+    backend = settings.EMAIL_BACKEND
+    with _pools_lock:
+        pool = _pools.get(backend)
+        if pool is None:
+            pool = SMTPConnectionPool(
+                size=getattr(settings, 'SMTP_POOL_SIZE', 2),
+                max_idle=getattr(settings, 'SMTP_POOL_MAX_IDLE', 60),
+                backend=backend,
+                breaker=CircuitBreaker(
+                    failure_threshold=getattr(settings, 'SMTP_CIRCUIT_FAILURE_THRESHOLD', 5),
+                    reset_timeout=getattr(settings, 'SMTP_CIRCUIT_RESET_TIMEOUT', 30),
+                ),
+            )
+            _pools[backend] = pool
+        return pool
+
+
+def reset_pools():
+    """Close and forget every pool (tests, settings changes)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,180 @@
+"""
+Materialized homepage document.
+
+The homepage payload is built once, encoded to JSON bytes and stored in the
+cache together with a version number. HomePageDataView serves those bytes
+directly; saving any of the models that feed the homepage schedules a rebuild
+on a background thread (see signals.py). With ``HOMEPAGE_SNAPSHOT_ASYNC`` off
+the rebuild runs inline instead. It is off under tests, where a background
+thread cannot share the in-memory test database.
+
+One snapshot serves every host the site answers on. File URLs are built
+against the placeholder ``SNAPSHOT_ORIGIN`` and ``snapshot_content()`` swaps in
+the origin of the request being served.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from . import caching, technologies
+from .eager_loading import eager_load
+from .singletons import get_company_info
+from .models import (
+    PageContent, SectionContent, Project, Testimonial, Service, TeamMember, CompanyInfo
+)
+from .serializers import (
+    PageContentSerializer, ProjectSerializer, TestimonialSerializer, ServiceSerializer,
+    TeamMemberListSerializer, CompanyInfoSerializer
+)
+
+
+HOMEPAGE_SNAPSHOT_KEY = 'api:snapshot:homepage'
+HOMEPAGE_VERSION_KEY = 'api:snapshot:homepage:version'
+
+# Models whose changes make the homepage snapshot stale
+HOMEPAGE_MODELS = (
+    PageContent, SectionContent, Project, Testimonial, Service, TeamMember, CompanyInfo
+)
+HOMEPAGE_TAGS = [caching.model_tag(model) for model in HOMEPAGE_MODELS]
+
+# Stands in for the scheme and host in the absolute URLs stored in a snapshot
+SNAPSHOT_ORIGIN = 'http://homepage-snapshot.invalid'
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='homepage-snapshot')
+_rebuild_lock = threading.Lock()
+_rebuild_pending = False
+
+
+class SnapshotRequest:
+    """Minimal stand-in for the request in serializer context, used to build absolute URLs"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def build_absolute_uri(self, location=None):
+        return urljoin(self.base_url, location or '/')
+
+
+def build_homepage_data(request):
+    """Query and serialize everything the homepage needs"""
+    context = {'request': request}
+
+    # Get hero content
+    try:
+        hero_content = eager_load(PageContent.objects.all(), PageContentSerializer).get(
+            page_type='home', is_published=True
+        )
+    except PageContent.DoesNotExist:
+        hero_content = None
+
+    featured_projects = ProjectSerializer(
+        Project.objects.filter(is_featured=True)[:6], many=True, context=context
+    ).data
+    featured_testimonials = TestimonialSerializer(
+        eager_load(Testimonial.objects.filter(is_featured=True), TestimonialSerializer)[:6],
+        many=True, context=context
+    ).data
+    services = ServiceSerializer(
+        Service.objects.filter(is_active=True).order_by('order')[:6], many=True, context=context
+    ).data
+    featured_team_members = TeamMemberListSerializer(
+        TeamMember.objects.filter(is_active=True, is_featured=True)[:4], many=True, context=context
+    ).data
+
+    company_info = get_company_info()
+
+    stats_data = {
+        'total_projects': Project.objects.count(),
+        'total_clients': Testimonial.objects.values('company').distinct().count(),
+        'years_experience': 5,
+        'client_satisfaction': 98.5,
+        'technologies_used': technologies.top_technologies(5),
+        'recent_projects': featured_projects[:3],
+        'featured_testimonials': featured_testimonials[:3]
+    }
+
+    return {
+        'hero_content': PageContentSerializer(hero_content, context=context).data if hero_content else None,
+        'featured_projects': featured_projects,
+        'featured_testimonials': featured_testimonials,
+        'services': services,
+        'featured_team_members': featured_team_members,
+        'company_info': CompanyInfoSerializer(company_info, context=context).data,
+        'stats': stats_data
+    }
+
+
+def _next_version():
+    try:
+        return cache.incr(HOMEPAGE_VERSION_KEY)
+    except ValueError:
+        cache.add(HOMEPAGE_VERSION_KEY, 0, timeout=None)
+        return cache.incr(HOMEPAGE_VERSION_KEY)
+
+
+def rebuild_homepage_snapshot():
+    """Build, encode and store a new homepage snapshot"""
+    # Capture tag versions before reading so a concurrent write marks the result stale
+    tags = caching.get_tag_versions(HOMEPAGE_TAGS)
+    data = build_homepage_data(SnapshotRequest(SNAPSHOT_ORIGIN + '/'))
+    snapshot = {
+        'version': _next_version(),
+        'content': JSONRenderer().render({'success': True, 'data': data}),
+        'tags': tags,
+        'built_at': time.time(),
+    }
+    cache.set(HOMEPAGE_SNAPSHOT_KEY, snapshot, timeout=None)
+    return snapshot
+
+
+def get_homepage_snapshot(request):
+    """
+    Return the current homepage snapshot.
+    A missing snapshot is built synchronously; a stale one is still served while
+    a rebuild runs in the background.
+    """
+    snapshot = cache.get(HOMEPAGE_SNAPSHOT_KEY)
+    if snapshot is None:
+        return rebuild_homepage_snapshot()
+    if not caching.tags_are_current(snapshot['tags']):
+        schedule_homepage_rebuild()
+    return snapshot
+
+
+def snapshot_content(snapshot, request):
+    """The encoded snapshot with its file URLs pointing at the host ``request`` was made to"""
+    origin = request.build_absolute_uri('/').rstrip('/')
+    return snapshot['content'].replace(SNAPSHOT_ORIGIN.encode('utf-8'), origin.encode('utf-8'))
+
+
+def schedule_homepage_rebuild():
+    """Queue a background rebuild unless one is already waiting to run"""
+    global _rebuild_pending
+    if not getattr(settings, 'HOMEPAGE_SNAPSHOT_ASYNC', True):
+        # Rebuild inline (tests, management commands)
+        rebuild_homepage_snapshot()
+        return
+    with _rebuild_lock:
+        if _rebuild_pending:
+            return
+        _rebuild_pending = True
+    _executor.submit(_run_rebuild)
+
+
+def _run_rebuild():
+    global _rebuild_pending
+    with _rebuild_lock:
+        # Changes arriving from now on need another pass
+        _rebuild_pending = False
+    try:
+        rebuild_homepage_snapshot()
+    except Exception as e:
+        print(f"Failed to rebuild homepage snapshot: {e}")
+    finally:
+        connection.close()
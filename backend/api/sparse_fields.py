@@ -0,0 +1,98 @@
+"""
+Sparse fieldsets and expansions for the read endpoints.
+
+``?fields=id,title,slug`` limits a response to the listed fields; dotted names
+reach into nested serializers (``?fields=title,testimonial_data.name``).
+``?expand=testimonial`` embeds a related object in place of its primary key,
+for the relations a serializer lists in ``Meta.expandable_fields``; dotted
+names expand further down (``?expand=testimonial.project``). Unknown names
+are ignored.
+
+EagerLoadingMixin passes the selection to the serializer through its context
+and plans the queryset for it (see eager_loading.py): relations that are not
+selected are neither joined nor prefetched, and ``.only()`` reads just the
+columns the selected fields use. Fields that read more than their own column
+(method fields, model properties) list the columns they need in
+``Meta.field_sources``.
+"""
+from collections import namedtuple
+
+from rest_framework import serializers
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+# ``fields`` is a tree of selected names, or None for every field; ``expand`` a tree of expanded relations
+Selection = namedtuple('Selection', 'fields expand')
+ALL = Selection(None, {})
+
+
+def parse_names(value):
+    """``'a,b.c,b.d'`` -> ``{'a': {}, 'b': {'c': {}, 'd': {}}}``"""
+    tree = {}
+    for name in value.split(','):
+        parts = [part.strip() for part in name.split('.')]
+        if not all(parts):
+            continue
+        node = tree
+        for part in parts:
+            node = node.setdefault(part, {})
+    return tree
+
+
+def selection_from_request(request):
+    params = getattr(request, 'query_params', request.GET)
+    fields, expand = params.get(FIELDS_PARAM), params.get(EXPAND_PARAM)
+    if not fields and not expand:
+        return ALL
+    return Selection(parse_names(fields) if fields else None, parse_names(expand) if expand else {})
+
+
+def child_selection(selection, name):
+    """The part of ``selection`` that applies to the nested field ``name``"""
+    fields = None if selection.fields is None else (selection.fields.get(name) or None)
+    return Selection(fields, selection.expand.get(name, {}))
+
+
+def selection_key(selection):
+    """A hashable form of ``selection``"""
+    def freeze(tree):
+        return None if tree is None else frozenset((name, freeze(child)) for name, child in tree.items())
+    return freeze(selection.fields), freeze(selection.expand)
+
+
+class SparseFieldsMixin:
+    """
+    Model serializer mixin applying a selection to its fields. A top-level
+    serializer takes it from ``context['selection']``; nested serializers get
+    their part of it from their parent.
+    """
+
+    def get_selection(self):
+        selection = getattr(self, '_selection', None)
+        if selection is not None:
+            return selection
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is None:
+            return self.context.get('selection', ALL)
+        return ALL
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.get_selection()
+
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name in selection.expand:
+            if name in expandable:
+                fields[name] = expandable[name](read_only=True)
+
+        if selection.fields is not None:
+            fields = {name: field for name, field in fields.items() if name in selection.fields}
+        for name, field in fields.items():
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, SparseFieldsMixin):
+                nested._selection = child_selection(selection, name)
+        return fields
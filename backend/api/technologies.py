@@ -0,0 +1,83 @@
+"""
+Technology usage index.
+
+``Project.technologies`` is a JSON list, so "which technologies do we use the
+most" used to mean loading every project. ``TechnologyUsage`` keeps one row per
+distinct technology with the number of projects listing it. The counts are
+adjusted inside the transaction of every ``Project`` save/delete (see
+signals.py), so reading the top N is a single indexed query over the distinct
+technologies.
+
+Bulk writes (``bulk_create``, ``QuerySet.update``) bypass the signals; run
+``manage.py rebuild_technology_usage`` after them.
+"""
+from collections import Counter
+
+from django.db.models import F
+
+from . import caching
+
+
+MAX_NAME_LENGTH = 100
+
+
+def normalize(technologies):
+    """The distinct, cleaned-up technology names of one project"""
+    if not isinstance(technologies, (list, tuple)):
+        return set()
+    names = set()
+    for name in technologies:
+        if isinstance(name, str) and name.strip():
+            names.add(name.strip()[:MAX_NAME_LENGTH])
+    return names
+
+
+def record_change(old, new):
+    """Apply the difference between a project's old and new technology lists"""
+    from .models import TechnologyUsage
+
+    old, new = normalize(old), normalize(new)
+    added, removed = new - old, old - new
+    if added:
+        # Create missing rows at zero first so concurrent writers never collide
+        TechnologyUsage.objects.bulk_create(
+            [TechnologyUsage(name=name, project_count=0) for name in added], ignore_conflicts=True
+        )
+        TechnologyUsage.objects.filter(name__in=added).update(project_count=F('project_count') + 1)
+    if removed:
+        # Rows that drop to zero are kept (and hidden) to avoid racing a concurrent re-add
+        TechnologyUsage.objects.filter(name__in=removed, project_count__gt=0).update(
+            project_count=F('project_count') - 1
+        )
+
+
+def top_technologies(limit=10, with_counts=False):
+    """The ``limit`` most used technologies, most used first"""
+    from .models import Project, TechnologyUsage
+
+    # The counts are kept with update(), which bumps no tag; they move with Project
+    caching.note_tags(caching.model_tag(Project))
+
+    rows = TechnologyUsage.objects.filter(project_count__gt=0).order_by('-project_count', 'name')[:limit]
+    if with_counts:
+        return [
+            {'name': name, 'project_count': count}
+            for name, count in rows.values_list('name', 'project_count')
+        ]
+    return list(rows.values_list('name', flat=True))
+
+
+def rebuild():
+    """Recount every technology from the projects and return the number of distinct technologies"""
+    from .models import Project, TechnologyUsage
+
+    counts = Counter()
+    for technologies in Project.objects.values_list('technologies', flat=True).iterator(chunk_size=2000):
+        counts.update(normalize(technologies))
+
+    TechnologyUsage.objects.all().delete()
+    TechnologyUsage.objects.bulk_create(
+        [TechnologyUsage(name=name, project_count=count) for name, count in counts.items()],
+        batch_size=1000,
+    )
+    return len(counts)
@@ -0,0 +1,15 @@
+from django import template
+
+from ..feature_flags import is_enabled
+
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def feature_enabled(context, name, default=False):
+    """
+    Evaluate a feature flag for the current request:
+    ``{% feature_enabled 'new_footer' as show_footer %}``
+    """
+    return is_enabled(name, context.get('request'), default=default)
@@ -1,3 +1,1522 @@
-from django.test import TestCase
+"""
+Endpoint benchmark suite.
 
-# Create your tests here.
+Walks every GET route in api/urls.py against seeded datasets of increasing
+size and records the SQL query count, wall time and response size of each
+request. Query counts and response sizes are compared with the budgets
+checked in at api/benchmark_baseline.json. Timings depend on the machine, so
+they are not asserted; the report showing which endpoints scale with the
+amount of data is printed on request.
+
+Environment variables:
+    BENCHMARK_SIZES            comma separated rows per model (default "10,1000";
+                               the full run is "10,1000,50000")
+    BENCHMARK_REPORT           set to 1 to time each endpoint and print the report
+    BENCHMARK_UPDATE_BASELINE  set to 1 to rewrite the budgets from this run
+"""
+import gzip
+import json
+import os
+import shutil
+import smtplib
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core import mail
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from . import (
+    analytics, caching, compression, counters, dashboard_metrics, feature_flags, notifications, query_plans, redirects, search, smtp_pool,
+    snapshots, technologies, urls as api_urls, views,
+)
+from .admin_views import admin_site
+from .cache_middleware import ResponseCacheMiddleware
+from .hyperloglog import HyperLogLog
+from .pagination import KeysetPagination
+from .seo_files import load_manifest
+from .seo_middleware import SEOMiddleware
+from .seo_views import clear_page_meta_contexts
+from .singletons import clear_singletons, get_company_info
+from .models import (
+    Project, Testimonial, ContactMessage, Service, BlogPost, MeetingRequest,
+    HelpArticle, CaseStudy, NavigationMenu, SubMenuItem, PageContent,
+    SectionContent, TeamMember, JobPosition, FeatureFlag, SitemapURL, TechnologyUsage, CompanyInfo,
+    VisitorStatistics, RedirectRule, SEOMetaTags
+)
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# Allowed growth of a response over its baseline size before the suite fails
+BYTES_TOLERANCE = 0.05
+
+# Cold requests are repeated to filter out noise when timing, within a time budget per endpoint
+TIME_SAMPLES = 3
+TIME_SAMPLE_BUDGET = 1.0
+
+# Query strings for routes that need parameters to do real work
+ROUTE_QUERY = {
+    'search': 'q=bench',
+}
+
+
+def _first(model, field):
+    return model.objects.order_by('pk').values_list(field, flat=True).first()
+
+
+# Values for the URL parameters of detail and filtered routes
+ROUTE_KWARGS = {
+    'project_detail': lambda: {'slug': _first(Project, 'slug')},
+    'service_detail': lambda: {'slug': _first(Service, 'slug')},
+    'blog_detail': lambda: {'slug': _first(BlogPost, 'slug')},
+    'help_detail': lambda: {'slug': _first(HelpArticle, 'slug')},
+    'help_category': lambda: {'category': 'general'},
+    'case_study_detail': lambda: {'slug': _first(CaseStudy, 'slug')},
+    'case_study_industry': lambda: {'industry': 'technology'},
+    'page_content': lambda: {'page_type': 'home'},
+    'team_department': lambda: {'department': 'development'},
+    'team_detail': lambda: {'id': _first(TeamMember, 'id')},
+    'jobs_department': lambda: {'department': 'Engineering'},
+    'job_detail': lambda: {'id': _first(JobPosition, 'id')},
+    'sitemap_section': lambda: {'section': 'projects'},
+    'sitemap_section_gz': lambda: {'section': 'projects'},
+}
+
+
+def get_routes():
+    """Return ``(url_name, pattern)`` for every route in api/urls.py that answers GET"""
+    routes = []
+    for pattern in api_urls.urlpatterns:
+        if not isinstance(pattern, URLPattern):
+            continue
+        view_class = getattr(pattern.callback, 'cls', None) or getattr(pattern.callback, 'view_class', None)
+        if view_class is not None and not hasattr(view_class, 'get'):
+            continue
+        routes.append((pattern.name, pattern))
+    return routes
+
+
+def build_url(name):
+    kwargs = ROUTE_KWARGS[name]() if name in ROUTE_KWARGS else {}
+    url = reverse(f'{api_urls.app_name}:{name}', kwargs=kwargs)
+    if name in ROUTE_QUERY:
+        url = f'{url}?{ROUTE_QUERY[name]}'
+    return url
+
+
+def seed_dataset(start, stop):
+    """Add rows ``start..stop-1`` to every content model (so datasets grow incrementally)"""
+    now = timezone.now()
+    indexes = range(start, stop)
+    categories = [choice for choice, _ in Project.CATEGORY_CHOICES]
+    industries = [choice for choice, _ in CaseStudy.INDUSTRY_CHOICES]
+    help_categories = [choice for choice, _ in HelpArticle.CATEGORY_CHOICES]
+    departments = [choice for choice, _ in TeamMember.DEPARTMENT_CHOICES]
+    batch_size = 2000
+
+    projects = Project.objects.bulk_create([
+        Project(
+            title=f'Bench project {i}', slug=f'bench-project-{i}', category=categories[i % len(categories)],
+            description='Benchmark project description', detailed_description='Details ' * 50,
+            technologies=['React', 'Django', f'Tech {i % 40}'], client_name=f'Client {i % 100}',
+            is_featured=i % 10 == 0,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    testimonials = Testimonial.objects.bulk_create([
+        Testimonial(
+            name=f'Client {i}', position='CTO', company=f'Company {i % 100}',
+            text='A benchmark testimonial that is long enough to satisfy the validators.',
+            project=projects[i - start], is_featured=i % 10 == 0,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    Service.objects.bulk_create([
+        Service(
+            name=f'Bench service {i}', slug=f'bench-service-{i}', short_description='Short',
+            description='Benchmark service', icon='code', features=['Fast', 'Reliable'], order=i,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    BlogPost.objects.bulk_create([
+        BlogPost(
+            title=f'Bench post {i}', slug=f'bench-post-{i}', excerpt='Benchmark excerpt',
+            content='Benchmark content ' * 100, tags=['bench'], is_published=True,
+            is_featured=i % 10 == 0, published_at=now - timedelta(minutes=i),
+        ) for i in indexes
+    ], batch_size=batch_size)
+    HelpArticle.objects.bulk_create([
+        HelpArticle(
+            title=f'Bench article {i}', slug=f'bench-article-{i}',
+            category=help_categories[i % len(help_categories)], excerpt='Benchmark excerpt',
+            content='Benchmark content ' * 50, is_featured=i % 10 == 0,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    CaseStudy.objects.bulk_create([
+        CaseStudy(
+            title=f'Bench case study {i}', slug=f'bench-case-study-{i}', client_name=f'Client {i}',
+            industry=industries[i % len(industries)], challenge='Challenge', solution='Solution',
+            results='Results', technologies_used=['Django'], project_duration='3 months',
+            testimonial=testimonials[i - start], is_featured=i % 10 == 0,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    menus = NavigationMenu.objects.bulk_create([
+        NavigationMenu(
+            name=f'Menu {i}', slug=f'bench-menu-{i}', menu_type='header' if i % 2 else 'footer',
+            url=f'/menu-{i}', order=i, has_submenu=True,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    SubMenuItem.objects.bulk_create([
+        SubMenuItem(parent_menu=menus[i - start], name=f'Item {i}', url=f'/item-{i}', order=i)
+        for i in indexes
+    ], batch_size=batch_size)
+
+    page_types = [choice for choice, _ in PageContent.PAGE_TYPES]
+    pages = PageContent.objects.bulk_create([
+        PageContent(page_type=page_type, title=f'{page_type} page')
+        for page_type in page_types[start:stop]
+    ])
+    all_pages = list(PageContent.objects.order_by('pk'))
+    SectionContent.objects.bulk_create([
+        SectionContent(section_type='hero', page=all_pages[i % len(all_pages)], title=f'Section {i}', order=i)
+        for i in indexes
+    ], batch_size=batch_size)
+
+    TeamMember.objects.bulk_create([
+        TeamMember(
+            name=f'Member {i}', position='Engineer', department=departments[i % len(departments)],
+            skills=['Python'], is_featured=i % 10 == 0, order=i,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    JobPosition.objects.bulk_create([
+        JobPosition(
+            title=f'Bench job {i}', department='Engineering', job_type='full-time',
+            experience_level='mid', description='Benchmark job', requirements=['Python'],
+            salary_min=50000, salary_max=90000, is_featured=i % 10 == 0,
+        ) for i in indexes
+    ], batch_size=batch_size)
+    FeatureFlag.objects.bulk_create([
+        FeatureFlag(name=f'bench_flag_{i}') for i in indexes
+    ], batch_size=batch_size)
+    SitemapURL.objects.bulk_create([
+        SitemapURL(url_path=f'/bench-{i}/') for i in indexes
+    ], batch_size=batch_size)
+    ContactMessage.objects.bulk_create([
+        ContactMessage(name=f'Sender {i}', email='sender@example.com', subject='Hello', message='Benchmark message')
+        for i in indexes
+    ], batch_size=batch_size)
+    MeetingRequest.objects.bulk_create([
+        MeetingRequest(
+            name=f'Requester {i}', email='requester@example.com',
+            preferred_date=date.today() + timedelta(days=7), preferred_time='09:00',
+            project_description='Benchmark meeting request description',
+        ) for i in indexes
+    ], batch_size=batch_size)
+
+    # bulk_create bypasses the signals that maintain the search index and technology usage
+    search.rebuild_index()
+    technologies.rebuild()
+
+    return pages
+
+
+def measure(client, url, samples=1):
+    """
+    Request ``url`` with cold caches and once more with the in-process caches warm.
+    Returns both query counts, the cold wall time and the response size. When
+    timing, the cold request is repeated (up to ``samples`` times within
+    TIME_SAMPLE_BUDGET seconds) and the fastest run is kept.
+    """
+    timings = []
+    while True:
+        cache.clear()
+        with CaptureQueriesContext(connection) as cold_queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            # Streamed responses do their work while being consumed
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            timings.append(time.perf_counter() - started)
+        if len(timings) >= samples or sum(timings) >= TIME_SAMPLE_BUDGET:
+            break
+    with CaptureQueriesContext(connection) as warm_queries:
+        warm = client.get(url)
+        if warm.streaming:
+            b''.join(warm.streaming_content)
+    return {
+        'status': response.status_code,
+        'queries': len(warm_queries.captured_queries),
+        'cold_queries': len(cold_queries.captured_queries),
+        'ms': round(min(timings) * 1000, 2),
+        'bytes': len(content),
+    }
+
+
+def classify(per_size):
+    """Describe how an endpoint scales between the smallest and largest dataset"""
+    sizes = sorted(per_size, key=int)
+    smallest, largest = per_size[sizes[0]], per_size[sizes[-1]]
+    if largest['cold_queries'] > smallest['cold_queries']:
+        return 'queries grow with data (N+1)'
+    data_ratio = int(sizes[-1]) / int(sizes[0])
+    time_ratio = largest['ms'] / max(smallest['ms'], 1.0)
+    if len(sizes) > 1 and time_ratio > max(data_ratio ** 0.5, 4):
+        return 'time grows with data'
+    return 'constant'
+
+
+def format_report(results):
+    sizes = sorted({size for per_size in results.values() for size in per_size}, key=int)
+    lines = ['', 'Endpoint benchmark (warm queries / cold queries / cold ms / bytes per dataset size)']
+    header = f"{'route':<26}" + ''.join(f"{size + ' rows':>30}" for size in sizes) + '  scaling'
+    lines.append(header)
+    lines.append('-' * len(header))
+    for name, per_size in sorted(results.items()):
+        cells = ''.join(
+            f"{'%d / %d / %.1f / %d' % (per_size[s]['queries'], per_size[s]['cold_queries'], per_size[s]['ms'], per_size[s]['bytes']):>30}"
+            for s in sizes
+        )
+        lines.append(f'{name:<26}{cells}  {classify(per_size)}')
+    return '\n'.join(lines)
+
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {'routes': {}}
+
+
+def write_baseline(results):
+    """Rewrite the budgets, keeping response sizes for dataset sizes that were not part of this run"""
+    previous = load_baseline()['routes']
+    routes = {
+        name: {
+            'queries': max(entry['queries'] for entry in per_size.values()),
+            'cold_queries': max(entry['cold_queries'] for entry in per_size.values()),
+            'bytes': {
+                **previous.get(name, {}).get('bytes', {}),
+                **{size: entry['bytes'] for size, entry in per_size.items()},
+            },
+        }
+        for name, per_size in sorted(results.items())
+    }
+    BASELINE_PATH.write_text(json.dumps({'routes': routes}, indent=2) + '\n')
+
+
+def check_budgets(results, baseline):
+    """Return a list of query and response size budget violations"""
+    failures = []
+    for name, per_size in sorted(results.items()):
+        budget = baseline['routes'].get(name)
+        if budget is None:
+            failures.append(f'{name}: no baseline entry (run with BENCHMARK_UPDATE_BASELINE=1)')
+            continue
+        for size, entry in sorted(per_size.items(), key=lambda item: int(item[0])):
+            for key in ('queries', 'cold_queries'):
+                if entry[key] > budget[key]:
+                    failures.append(f"{name} @ {size} rows: {entry[key]} {key} > budget {budget[key]}")
+            budget_bytes = budget.get('bytes', {}).get(size)
+            if budget_bytes is not None and entry['bytes'] > budget_bytes * (1 + BYTES_TOLERANCE):
+                failures.append(f"{name} @ {size} rows: {entry['bytes']} bytes > budget {budget_bytes} bytes")
+    return failures
+
+
+class HomepageSnapshotTests(TestCase):
+    """The homepage is served from a stored JSON snapshot, rebuilt after content changes"""
+
+    def setUp(self):
+        cache.clear()
+        clear_singletons()
+
+    @override_settings(HOMEPAGE_SNAPSHOT_ASYNC=False, RESPONSE_CACHE_ENABLED=False)
+    def test_snapshot_is_rebuilt_inline_when_not_async(self):
+        url = reverse('api:homepage_data')
+        self.assertEqual(self.client.get(url).json()['data']['services'], [])
+        version = cache.get(snapshots.HOMEPAGE_SNAPSHOT_KEY)['version']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(
+                name='Hosting', slug='hosting', short_description='Short', description='Managed hosting', icon='cloud'
+            )
+        # Rebuilt when the write committed, before the next request
+        snapshot = cache.get(snapshots.HOMEPAGE_SNAPSHOT_KEY)
+        self.assertGreater(snapshot['version'], version)
+        self.assertTrue(caching.tags_are_current(snapshot['tags']))
+        with self.assertNumQueries(0):
+            data = self.client.get(url).json()['data']
+        self.assertEqual([service['name'] for service in data['services']], ['Hosting'])
+
+
+    @override_settings(ALLOWED_HOSTS=['one.example', 'two.example'], RESPONSE_CACHE_ENABLED=False)
+    def test_file_urls_follow_the_requested_host(self):
+        Project.objects.create(
+            title='Gallery', slug='gallery', category='web', description='Images',
+            image='projects/gallery.png', is_featured=True,
+        )
+        url = reverse('api:homepage_data')
+        for host in ('one.example', 'two.example'):
+            project, = self.client.get(url, HTTP_HOST=host).json()['data']['featured_projects']
+            self.assertEqual(project['image'], f'http://{host}/media/projects/gallery.png')
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class EndpointBenchmarkTests(TestCase):
+    """Query-count and response size budgets for every GET endpoint; timings are reported with BENCHMARK_REPORT=1"""
+
+    def test_endpoints_within_budget(self):
+        # Detail views buffer view counts; write them before the test database goes away
+        self.addCleanup(counters.flush)
+        sizes = [int(size) for size in os.environ.get('BENCHMARK_SIZES', '10,1000').split(',')]
+        report = os.environ.get('BENCHMARK_REPORT') == '1'
+        routes = get_routes()
+        results = {name: {} for name, _ in routes}
+
+        seeded = 0
+        for size in sorted(sizes):
+            seed_dataset(seeded, size)
+            seeded = size
+            for name, _ in routes:
+                url = build_url(name)
+                # Warm-up request so one-off costs (imports, plan building) are not measured
+                self.client.get(url)
+                entry = measure(self.client, url, samples=TIME_SAMPLES if report else 1)
+                self.assertLess(entry['status'], 500, f'{url} failed with {entry["status"]}')
+                results[name][str(size)] = entry
+
+        if report:
+            print(format_report(results))
+
+        if os.environ.get('BENCHMARK_UPDATE_BASELINE') == '1':
+            write_baseline(results)
+            return
+
+        failures = check_budgets(results, load_baseline())
+        self.assertFalse(failures, 'Benchmark budgets exceeded:\n' + '\n'.join(failures))
+
+
+class SingletonTests(TestCase):
+    """Settings rows held in process memory"""
+
+    def setUp(self):
+        cache.clear()
+        clear_singletons()
+
+    def test_cached_responses_follow_singleton_saves(self):
+        url = reverse('api:company_info')
+        get_company_info()
+        # The row comes from memory, so no SQL records its tag
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        company = CompanyInfo.objects.get()
+        company.company_name = 'Renamed agency'
+        company.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['company_name'], 'Renamed agency')
+
+
+class FeatureFlagTests(TestCase):
+    """In-process feature flag evaluation"""
+
+    def setUp(self):
+        cache.clear()
+        feature_flags.reset()
+
+    def test_unknown_and_disabled_flags(self):
+        FeatureFlag.objects.create(name='off', is_enabled=False)
+        self.assertFalse(feature_flags.is_enabled('off'))
+        self.assertFalse(feature_flags.is_enabled('missing'))
+        self.assertTrue(feature_flags.is_enabled('missing', default=True))
+
+    def test_rollout_is_deterministic_and_proportional(self):
+        FeatureFlag.objects.create(name='half', rollout_percentage=50)
+        results = [feature_flags.is_enabled('half', key=str(i)) for i in range(2000)]
+        self.assertEqual(results, [feature_flags.is_enabled('half', key=str(i)) for i in range(2000)])
+        self.assertTrue(800 < sum(results) < 1200)
+
+    def test_evaluation_is_served_from_memory_and_refreshed_on_save(self):
+        flag = FeatureFlag.objects.create(name='beta', is_enabled=False)
+        self.assertFalse(feature_flags.is_enabled('beta'))
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                feature_flags.is_enabled('beta')
+
+        flag.is_enabled = True
+        flag.save()
+        self.assertTrue(feature_flags.is_enabled('beta'))
+
+    def test_partial_rollouts_are_not_shared_through_caches(self):
+        FeatureFlag.objects.create(name='split', rollout_percentage=50)
+        FeatureFlag.objects.create(name='everyone', rollout_percentage=100)
+
+        @api_view(['GET'])
+        def view(request):
+            return Response({'enabled': feature_flags.is_enabled(request.GET['flag'], request)})
+
+        middleware = ResponseCacheMiddleware(lambda request: view(request).render())
+        visitors = {feature_flags.rollout_bucket('split', f'visitor:{index}') < 50: str(index) for index in range(20)}
+
+        for enabled, visitor in sorted(visitors.items()):
+            response = middleware(RequestFactory().get('/api/probe/?flag=split', HTTP_X_VISITOR_ID=visitor))
+            self.assertEqual(json.loads(response.content), {'enabled': enabled})
+            self.assertNotIn('X-Cache', response)
+            self.assertIn('private', response['Cache-Control'])
+
+        # A flag that is on for everyone does not depend on the visitor
+        middleware(RequestFactory().get('/api/probe/?flag=everyone', HTTP_X_VISITOR_ID='1'))
+        response = middleware(RequestFactory().get('/api/probe/?flag=everyone', HTTP_X_VISITOR_ID='2'))
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class SearchTests(TestCase):
+    """Full-text search index and SearchView"""
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, **params):
+        return self.client.get(reverse('api:search'), params).json()
+
+    def test_index_follows_saves_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = BlogPost.objects.create(
+                title='Scaling Django', slug='scaling-django', excerpt='Caching and indexing',
+                content='How we tuned PostgreSQL for heavy traffic', is_published=True
+            )
+        data = self.search(q='postgresql')
+        self.assertEqual(data['totals']['blog_posts'], 1)
+        self.assertIn('<mark>PostgreSQL</mark>', data['results']['blog_posts'][0]['search']['snippet'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.is_published = False
+            post.save()
+        self.assertEqual(self.search(q='postgresql')['totals']['blog_posts'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.is_published = True
+            post.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(self.search(q='postgresql')['total_results'], 0)
+
+    def test_cached_results_follow_new_documents(self):
+        url = reverse('api:search')
+        with self.settings(RESPONSE_CACHE_ENABLED=True):
+            self.assertEqual(self.client.get(url, {'q': 'zzzuniq'}).json()['total_results'], 0)
+            self.assertEqual(self.client.get(url, {'q': 'zzzuniq'})['X-Cache'], 'HIT')
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Project.objects.create(
+                    title='Zzzuniq platform', slug='zzzuniq', category='web',
+                    description='Search cache test', detailed_description='Details'
+                )
+            response = self.client.get(url, {'q': 'zzzuniq'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['totals']['projects'], 1)
+
+    def test_ranking_and_pagination(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                Service.objects.create(
+                    name=f'Service {i}', slug=f'service-{i}', short_description='Short',
+                    description='Kubernetes hosting', icon='cloud'
+                )
+            Service.objects.create(
+                name='Kubernetes consulting', slug='kubernetes', short_description='Short',
+                description='Kubernetes hosting', icon='cloud'
+            )
+
+        data = self.search(q='kubernetes', type='services', page_size=3)
+        self.assertEqual(data['total_results'], 4)
+        self.assertIsNotNone(data['next_cursor'])
+        # Title matches are weighted above body-only matches
+        self.assertEqual(data['results'][0]['name'], 'Kubernetes consulting')
+
+        data = self.search(cursor=data['next_cursor'], page_size=3)
+        self.assertEqual(len(data['results']), 1)
+        self.assertEqual(data['total_results'], 4)
+        self.assertIsNone(data['next_cursor'])
+
+    def test_overview_uses_one_index_query(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(7):
+                JobPosition.objects.create(
+                    title=f'Rust engineer {i}', department='Engineering', job_type='full-time',
+                    experience_level='mid', description='Systems work in Rust'
+                )
+        with CaptureQueriesContext(connection) as queries:
+            data = self.search(q='rust')
+        index_queries = [q for q in queries.captured_queries if search.FTS_TABLE in q['sql']]
+        self.assertEqual(len(index_queries), 1)
+        self.assertEqual(data['totals']['jobs'], 7)
+        self.assertEqual(len(data['results']['jobs']), 5)
+
+        data = self.search(cursor=data['cursors']['jobs'])
+        self.assertEqual([job['title'] for job in data['results']], ['Rust engineer 5', 'Rust engineer 6'])
+
+    def test_tampered_cursor_is_rejected(self):
+        response = self.client.get(reverse('api:search'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+
+class TechnologyUsageTests(TestCase):
+    """Technology counts follow project saves and deletes"""
+
+    def create_project(self, slug, technologies):
+        return Project.objects.create(
+            title=slug, slug=slug, category='web', description='Project', technologies=technologies
+        )
+
+    def counts(self):
+        return dict(TechnologyUsage.objects.filter(project_count__gt=0).values_list('name', 'project_count'))
+
+    def test_counts_follow_project_changes(self):
+        first = self.create_project('first', ['Django', 'React', 'Django '])
+        second = self.create_project('second', ['Django', 'Vue'])
+        self.assertEqual(self.counts(), {'Django': 2, 'React': 1, 'Vue': 1})
+
+        first.technologies = ['Django', 'Svelte']
+        first.save()
+        self.assertEqual(self.counts(), {'Django': 2, 'Svelte': 1, 'Vue': 1})
+
+        first.title = 'Renamed'
+        first.save(update_fields=['title'])
+        second.delete()
+        self.assertEqual(self.counts(), {'Django': 1, 'Svelte': 1})
+
+        technologies.rebuild()
+        self.assertEqual(self.counts(), {'Django': 1, 'Svelte': 1})
+
+    def test_stats_return_most_used_technologies(self):
+        for index in range(3):
+            self.create_project(f'p{index}', ['Python', 'Go'][:index + 1] + ['Rust'] * (index == 2))
+        with self.assertNumQueries(1):
+            self.assertEqual(technologies.top_technologies(2), ['Python', 'Go'])
+
+        response = self.client.get(reverse('api:stats'))
+        self.assertEqual(response.json()['technologies_used'], ['Python', 'Go', 'Rust'])
+
+
+class DashboardMetricsTests(TestCase):
+    """Dashboard counts come from one conditional aggregate per model and are cached briefly"""
+
+    def setUp(self):
+        cache.clear()
+        old = timezone.now() - timedelta(days=45)
+        for index in range(4):
+            Project.objects.create(
+                title=f'p{index}', slug=f'p{index}', category='web', description='Project',
+                is_featured=index == 0,
+            )
+        Project.objects.filter(slug__in=['p2', 'p3']).update(created_at=old)
+        for index, status in enumerate(['new', 'new', 'in_progress', 'closed']):
+            ContactMessage.objects.create(
+                name='Ada', email='ada@example.com', subject=f's{index}', message='Hello', status=status
+            )
+
+    def test_metrics_match_individual_counts(self):
+        metrics = dashboard_metrics.compute_dashboard_metrics()
+        last_month = timezone.now() - timedelta(days=30)
+        self.assertEqual(metrics['projects']['total'], Project.objects.count())
+        self.assertEqual(metrics['projects']['featured'], 1)
+        self.assertEqual(metrics['projects']['last_30_days'], Project.objects.filter(created_at__gte=last_month).count())
+        self.assertEqual(metrics['projects']['previous_30_days'], 2)
+        self.assertEqual(metrics['messages']['new'], 2)
+        self.assertEqual(metrics['messages']['in_progress'], 1)
+        self.assertEqual(metrics['messages']['resolved'], 1)
+
+    def test_one_query_per_model_then_cached(self):
+        groups = len(dashboard_metrics.metric_definitions(timezone.now()))
+        with self.assertNumQueries(groups):
+            dashboard_metrics.get_dashboard_metrics()
+        with self.assertNumQueries(0):
+            metrics = dashboard_metrics.get_dashboard_metrics()
+
+        response = self.client.get(reverse('api:dashboard_stats'))
+        data = response.json()
+        self.assertEqual(data['overview']['projects']['total'], metrics['projects']['total'])
+        self.assertEqual(data['growth_metrics']['projects'], {'current': 2, 'previous': 2, 'growth': 0.0})
+
+
+class VisitorAnalyticsTests(TestCase):
+    """Page view beacons are buffered in memory and flushed as per-day increments"""
+
+    def setUp(self):
+        self.addCleanup(analytics.flush)
+
+    def beacon(self, **payload):
+        return self.client.post(
+            reverse('api:analytics_beacon'), json.dumps(payload), content_type='text/plain',
+            HTTP_USER_AGENT=payload.pop('user_agent', 'Mozilla/5.0 (X11; Linux x86_64)'),
+        )
+
+    def test_classification(self):
+        self.assertEqual(analytics.page_field('/blog/some-post'), 'blog_views')
+        self.assertEqual(analytics.page_field('/'), 'home_views')
+        self.assertIsNone(analytics.page_field('/careers'))
+        self.assertEqual(analytics.classify_device('Mozilla/5.0 (iPhone; CPU iPhone OS 17_0) Mobile'), 'mobile')
+        self.assertEqual(analytics.classify_device('Mozilla/5.0 (Linux; Android 14; SM-X710)'), 'tablet')
+        self.assertEqual(analytics.classify_source('https://www.google.co.uk/'), 'search')
+        self.assertEqual(analytics.classify_source('https://t.co/abc'), 'social')
+        self.assertEqual(analytics.classify_source('https://example.org/post'), 'referral')
+        self.assertEqual(analytics.classify_source('https://site.test/about', 'site.test'), 'direct')
+
+    def test_beacons_are_buffered_then_flushed_as_increments(self):
+        with self.assertNumQueries(0):
+            for index in range(50):
+                response = self.beacon(path='/blog/' if index % 2 else '/', referrer='https://www.bing.com/',
+                                       visitor_id=f'v{index % 10}')
+                self.assertEqual(response.status_code, 204)
+        self.beacon(path='/services', user_agent='Mozilla/5.0 (iPhone) Mobile')
+
+        with self.assertNumQueries(4):  # savepoint, insert-or-ignore, update, release
+            analytics.visitor_buffer.flush()
+        self.beacon(path='/services')
+        analytics.flush()
+
+        stats = VisitorStatistics.objects.get(date=timezone.localdate())
+        self.assertEqual(stats.page_views, 52)
+        # Ten visitor ids, plus two beacons without one that fall back to address and user agent
+        self.assertEqual(stats.unique_visitors, 12)
+        self.assertEqual((stats.home_views, stats.blog_views, stats.services_views), (25, 25, 2))
+        self.assertEqual((stats.desktop_views, stats.mobile_views), (51, 1))
+        self.assertEqual((stats.search_traffic, stats.direct_traffic), (50, 2))
+
+        data = self.client.get(reverse('api:dashboard_stats')).json()['visitor_analytics']
+        self.assertEqual(data['page_views'][-1], 52)
+        self.assertEqual(data['mobile_percentage'], round(1 / 52 * 100, 1))
+
+    def test_unique_visitors_merge_across_days(self):
+        today = timezone.localdate()
+        for offset, visitors in [(0, range(0, 300)), (1, range(200, 500)), (10, range(400, 1000))]:
+            day = today - timedelta(days=offset)
+            for visitor in visitors:
+                analytics.sketch_buffer.add((day, 'all'), f'visitor:{visitor}')
+                analytics.sketch_buffer.add((day, 'blog' if visitor % 2 else 'home'), f'visitor:{visitor}')
+        analytics.flush()
+
+        # The daily unique count comes from the sketch and is accurate to a few percent
+        self.assertAlmostEqual(VisitorStatistics.objects.get(date=today).unique_visitors, 300, delta=15)
+        self.assertAlmostEqual(analytics.unique_visitors(today - timedelta(days=6), today), 500, delta=25)
+
+        stats = admin_site.get_visitor_statistics()
+        self.assertAlmostEqual(stats['week']['total_visitors'], 500, delta=25)
+        self.assertAlmostEqual(stats['month']['total_visitors'], 1000, delta=50)
+        self.assertAlmostEqual(stats['month']['visitors_by_page']['blog'], 500, delta=25)
+
+    def test_hyperloglog_sketch(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        for index in range(20000):
+            first.add(f'a{index}')
+            second.add(f'a{index + 10000}')
+        self.assertAlmostEqual(first.count(), 20000, delta=20000 * 0.05)
+        restored = HyperLogLog.from_bytes(first.to_bytes())
+        self.assertEqual(restored.registers, first.registers)
+        self.assertAlmostEqual(restored.merge(second).count(), 30000, delta=30000 * 0.05)
+        self.assertLess(len(HyperLogLog().to_bytes()), 100)
+
+    def test_invalid_beacons_are_rejected(self):
+        url = reverse('api:analytics_beacon')
+        self.assertEqual(self.client.post(url, 'not json', content_type='text/plain').status_code, 400)
+        self.assertEqual(self.client.post(url, 'x' * 4096, content_type='text/plain').status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertEqual(analytics.visitor_buffer.pending(), {})
+
+
+class CounterTests(TestCase):
+    """View and vote counters are buffered and added with batched F() updates"""
+
+    def setUp(self):
+        self.addCleanup(counters.flush)
+        self.articles = [
+            HelpArticle.objects.create(
+                title=f'Article {index}', slug=f'article-{index}', category='general',
+                content='How to do things', excerpt='How to', is_published=True,
+            ) for index in range(3)
+        ]
+
+    def test_increments_are_coalesced(self):
+        with self.assertNumQueries(0):
+            for index in range(100):
+                counters.increment(HelpArticle, 'view_count', slug=f'article-{0 if index < 50 else index % 2 + 1}')
+        self.assertEqual(counters.pending_count(HelpArticle, 'view_count', slug='article-0'), 50)
+
+        with CaptureQueriesContext(connection) as queries:
+            counters.flush()
+        updates = [query for query in queries if query['sql'].startswith('UPDATE')]
+        # article-1 and article-2 got the same increment and share one statement
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(
+            list(HelpArticle.objects.order_by('slug').values_list('view_count', flat=True)), [50, 25, 25]
+        )
+
+    def test_help_article_views_and_votes_do_not_write_on_read(self):
+        url = reverse('api:help_detail', kwargs={'slug': 'article-0'})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            self.client.get(url)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+        self.assertEqual(response.json()['view_count'], 0)
+
+        # A revalidated (304) view is still counted
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        vote = self.client.post(reverse('api:help_helpful', kwargs={'slug': 'article-0'}))
+        self.assertEqual(vote.json()['helpful_votes'], 1)
+        self.assertEqual(self.client.post(reverse('api:help_helpful', kwargs={'slug': 'missing'})).status_code, 404)
+
+        counters.flush()
+        article = HelpArticle.objects.get(slug='article-0')
+        self.assertEqual((article.view_count, article.helpful_votes), (3, 1))
+
+        # The flushed count moves the ETag
+        refreshed = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(refreshed.json()['view_count'], 3)
+
+    def test_list_etags_follow_flushed_counters(self):
+        cache.clear()
+        counters.increment(HelpArticle, 'helpful_votes', slug='article-0', amount=10)
+        counters.flush()
+        urls = [reverse('api:help_list'), reverse('api:help_category', kwargs={'category': 'general'})]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        self.assertEqual(
+            [self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code for url, etag in zip(urls, etags)], [304, 304]
+        )
+
+        # A vote on an article that does not hold the highest count still moves the lists
+        counters.increment(HelpArticle, 'helpful_votes', slug='article-2', amount=5)
+        counters.flush()
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            data = response.json()
+            rows = data['results'] if isinstance(data, dict) else data
+            self.assertEqual({row['slug']: row['helpful_votes'] for row in rows}['article-2'], 5)
+
+    def test_helpful_votes_are_deduplicated_and_throttled(self):
+        cache.clear()
+        url = reverse('api:help_helpful', kwargs={'slug': 'article-1'})
+        first, repeat = self.client.post(url).json(), self.client.post(url).json()
+        self.assertEqual((first['counted'], first['helpful_votes']), (True, 1))
+        self.assertEqual((repeat['counted'], repeat['helpful_votes']), (False, 1))
+        other = self.client.post(url, REMOTE_ADDR='10.0.0.2').json()
+        self.assertEqual((other['counted'], other['helpful_votes']), (True, 2))
+
+        limit = int(settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['help_votes'].split('/')[0])
+        statuses = [self.client.post(url).status_code for _ in range(limit)]
+        self.assertEqual(statuses[-1], 429)
+
+
+class RedirectTests(TestCase):
+    """Redirect rules are compiled in memory and applied to requests that would 404"""
+
+    def setUp(self):
+        cache.clear()
+        redirects.reset()
+        self.addCleanup(counters.flush)
+
+    def test_exact_and_prefix_rules_resolve_without_queries(self):
+        RedirectRule.objects.create(source_url='/old-page/', destination_url='/new-page/')
+        RedirectRule.objects.create(source_url='/old-blog/*', destination_url='/blog/*', redirect_type='308')
+        RedirectRule.objects.create(source_url='/old-blog/archive/*', destination_url='/blog/')
+        RedirectRule.objects.create(source_url='/retired/', destination_url='/nowhere/', is_active=False)
+
+        self.client.get('/old-page/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/old-page?ref=mail')
+        self.assertEqual((response.status_code, response['Location']), (301, '/new-page/?ref=mail'))
+
+        response = self.client.get('/old-blog/2023/launch/')
+        self.assertEqual((response.status_code, response['Location']), (308, '/blog/2023/launch'))
+        # The longest prefix wins
+        self.assertEqual(self.client.get('/old-blog/archive/2019/')['Location'], '/blog/')
+        self.assertEqual(self.client.get('/retired/').status_code, 404)
+        # Existing pages are never redirected
+        RedirectRule.objects.create(source_url='/api/health/', destination_url='/elsewhere/')
+        self.assertEqual(self.client.get('/api/health/').status_code, 200)
+
+    def test_chains_are_flattened_on_save(self):
+        first = RedirectRule.objects.create(source_url='/a/', destination_url='/b/')
+        second = RedirectRule.objects.create(source_url='/b/', destination_url='/c/')
+        first.refresh_from_db()
+        self.assertEqual(first.destination_url, '/c/')
+
+        third = RedirectRule.objects.create(source_url='/z/', destination_url='/a/')
+        self.assertEqual(third.destination_url, '/c/')
+        self.assertEqual(self.client.get('/a/')['Location'], '/c/')
+
+        # A rule pointing back at the start of its chain is a loop
+        loop = RedirectRule(source_url='/c/', destination_url='/a/')
+        with self.assertRaises(ValidationError):
+            loop.full_clean()
+        loop.save()
+        self.assertIsNone(redirects.resolve('/c/'))
+        self.assertEqual(self.client.get('/c/').status_code, 404)
+        # ...and does not drag the rules ending at its source into it
+        second.refresh_from_db()
+        self.assertEqual(second.destination_url, '/c/')
+
+    def test_hits_are_buffered(self):
+        rule = RedirectRule.objects.create(source_url='/old-page/', destination_url='/new-page/')
+        self.client.get('/old-page/')
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(4):
+                self.client.get('/old-page/')
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+
+        counters.flush()
+        rule.refresh_from_db()
+        self.assertEqual(rule.hit_count, 5)
+        self.assertIsNotNone(rule.last_used)
+
+
+# No rendered files, so the views answer
+@override_settings(SITEMAP_SHARD_SIZE=2, SEO_FILES_ROOT=Path(tempfile.gettempdir()) / 'api-tests-no-seo-files')
+class SitemapTests(TestCase):
+    """The sitemap is an index of streamed per-type shards"""
+
+    def setUp(self):
+        cache.clear()
+        seed_dataset(0, 3)
+        BlogPost.objects.filter(slug='bench-post-2').update(is_published=False)
+        HelpArticle.objects.filter(slug='bench-article-2').update(is_published=False)
+
+    def get_text(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_index_lists_every_shard(self):
+        index = self.get_text('/sitemap.xml')
+        self.assertIn('<sitemapindex', index)
+        for name in (
+            'pages', 'pages-2', 'projects', 'projects-2', 'blog', 'services', 'services-2',
+            'case-studies', 'case-studies-2', 'help', 'careers',
+        ):
+            self.assertIn(f'<loc>https://testserver/sitemap-{name}.xml</loc>', index)
+        self.assertNotIn('sitemap-blog-2.xml', index)
+
+        newest = Project.objects.order_by('pk')[2].updated_at
+        self.assertIn(
+            f'<loc>https://testserver/sitemap-projects-2.xml</loc><lastmod>{newest.isoformat(timespec="seconds")}</lastmod>',
+            index,
+        )
+
+    def test_shards_are_split_and_gzipped(self):
+        first = self.get_text('/sitemap-projects.xml')
+        second = self.get_text('/sitemap-projects-2.xml')
+        self.assertEqual((first.count('<url>'), second.count('<url>')), (2, 1))
+        self.assertIn('/projects/bench-project-2/', second)
+        self.assertIn(Project.objects.get(slug='bench-project-2').updated_at.isoformat(timespec='seconds'), second)
+
+        self.assertEqual(self.get_text('/sitemap-blog.xml').count('<url>'), 2)
+        self.assertIn('https://testserver/case-studies/bench-case-study-0/', self.get_text('/sitemap-case-studies.xml'))
+        self.assertIn('https://testserver/careers/', self.get_text('/sitemap-careers.xml'))
+
+        response = self.client.get('/sitemap-projects-2.xml.gz')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)).decode('utf-8'), second)
+
+        self.assertEqual(self.client.get('/sitemap-projects-3.xml').status_code, 404)
+        self.assertEqual(self.client.get('/sitemap-unknown.xml').status_code, 404)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class KeysetPaginationTests(TestCase):
+    """?cursor= pages on the list ordering with a WHERE clause instead of OFFSET"""
+
+    def setUp(self):
+        seed_dataset(0, 45)
+        # Ties on the ordering columns are broken by the primary key
+        Project.objects.filter(pk__in=Project.objects.order_by('pk').values('pk')[:10]).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+        BlogPost.objects.filter(slug__endswith='7').update(published_at=None)
+
+    def walk(self, url):
+        """Follow next links from ``url``; returns the ids of every page and the last page"""
+        pages = []
+        while url:
+            body = self.client.get(url).json()
+            self.assertNotIn('count', body)
+            pages.append([row['id'] for row in body['results']])
+            last, url = body, body['next']
+        return pages, last
+
+    def test_cursor_pages_match_page_numbers(self):
+        for name, model in (('project_list', Project), ('blog_list', BlogPost), ('help_list', HelpArticle)):
+            url = reverse(f'api:{name}')
+            expected = []
+            for page in range(1, 4):
+                expected += [row['id'] for row in self.client.get(url, {'page': page}).json()['results']]
+
+            pages, last = self.walk(f'{url}?cursor=')
+            self.assertEqual([len(page) for page in pages], [20, 20, len(expected) - 40])
+            self.assertEqual(sum(pages, []), expected, name)
+
+            # Walking back from the last page visits the same pages
+            back, url = [], last['previous']
+            while url:
+                body = self.client.get(url).json()
+                back.insert(0, [row['id'] for row in body['results']])
+                url = body['previous']
+            self.assertEqual(back, pages[:-1], name)
+
+    def test_deep_pages_cost_the_same_and_skip_count(self):
+        url = reverse('api:project_list')
+        first = self.client.get(url, {'cursor': ''}).json()
+        second_url = first['next']
+
+        with CaptureQueriesContext(connection) as page_one:
+            self.client.get(url, {'cursor': ''})
+        with CaptureQueriesContext(connection) as page_two:
+            self.client.get(second_url)
+        self.assertEqual(len(page_one), len(page_two))
+        self.assertFalse([query for query in page_two if '__count' in query['sql']])
+        self.assertFalse([query for query in page_two if 'OFFSET' in query['sql']])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(reverse('api:project_list'), {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class SparseFieldsTests(TestCase):
+    """?fields= and ?expand= shape the response and the columns read"""
+
+    def setUp(self):
+        seed_dataset(0, 30)
+
+    def get(self, name, **params):
+        with CaptureQueriesContext(connection) as queries:
+            body = self.client.get(reverse(f'api:{name}'), params).json()
+        return body, queries
+
+    def test_fields_limit_response_and_columns(self):
+        full, _ = self.get('project_list')
+        self.assertIn('detailed_description', full['results'][0])
+
+        body, queries = self.get('project_list', fields='id,title,slug,unknown')
+        self.assertEqual([set(row) for row in body['results']], [{'id', 'title', 'slug'}] * 20)
+        rows = [query['sql'] for query in queries if 'LIMIT' in query['sql']]
+        self.assertEqual(len(rows), 1)
+        self.assertNotIn('detailed_description', rows[0])
+        self.assertNotIn('"technologies"', rows[0])
+
+    def test_default_lists_skip_unused_columns(self):
+        _, queries = self.get('blog_list')
+        self.assertFalse([query for query in queries if '"content"' in query['sql']])
+
+    def test_expand_embeds_related_object(self):
+        default, _ = self.get('case_study_list')
+        self.assertNotIn('testimonial', default['results'][0])
+
+        body, queries = self.get('case_study_list', expand='testimonial', fields='title,testimonial.name')
+        self.assertEqual(body['results'][0], {
+            'title': body['results'][0]['title'],
+            'testimonial': {'name': body['results'][0]['testimonial']['name']},
+        })
+        # Joined, not fetched row by row
+        self.assertEqual(len(queries), len(self.get('case_study_list')[1]))
+
+        detail, _ = self.get('case_study_list', expand='testimonial.project', fields='testimonial.project.title')
+        self.assertEqual(set(detail['results'][0]['testimonial']), {'project'})
+
+    def test_method_fields_read_their_sources(self):
+        _, default = self.get('careers_list')
+        body, queries = self.get('careers_list', fields='title,salary_range,is_expired')
+        self.assertEqual(set(body['results'][0]), {'title', 'salary_range', 'is_expired'})
+        self.assertEqual(len(queries), len(default))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class FragmentCacheTests(TestCase):
+    """List responses are spliced from per-row rendered JSON"""
+
+    def setUp(self):
+        cache.clear()
+        seed_dataset(0, 30)
+
+    def test_spliced_output_matches_serializer(self):
+        requests = [
+            ('project_list', {}), ('blog_list', {'cursor': ''}), ('careers_list', {'fields': 'title,salary_range'}),
+            ('case_study_list', {'expand': 'testimonial.project'}), ('service_list', {}),
+        ]
+        for name, params in requests:
+            url = reverse(f'api:{name}')
+            with self.settings(FRAGMENT_CACHE_ENABLED=False):
+                expected = self.client.get(url, params).content
+            self.assertEqual(self.client.get(url, params).content, expected, name)
+            self.assertEqual(self.client.get(url, params).content, expected, name)
+
+    def test_only_changed_rows_are_rendered_again(self):
+        url = reverse('api:project_list')
+        first = self.client.get(url).json()['results']
+        changed, unchanged = first[0]['id'], first[1]['id']
+
+        # update() leaves updated_at alone, so the stored fragments are reused
+        Project.objects.filter(pk__in=[changed, unchanged]).update(title='Renamed')
+        project = Project.objects.get(pk=changed)
+        project.save()
+
+        rows = {row['id']: row for row in self.client.get(url).json()['results']}
+        self.assertEqual(rows[changed]['title'], 'Renamed')
+        self.assertEqual(rows[unchanged]['title'], first[1]['title'])
+
+    def test_related_changes_refresh_embedded_rows(self):
+        url = reverse('api:testimonial_list')
+        first = self.client.get(url).json()['results'][0]
+        project = Project.objects.get(pk=first['project'])
+        project.title = 'New project title'
+        project.save()
+        self.assertEqual(self.client.get(url).json()['results'][0]['project_title'], 'New project title')
+
+
+class CompressionTests(TestCase):
+    """API JSON is brotli/gzip-encoded, once per cached content version"""
+
+    def setUp(self):
+        cache.clear()
+        seed_dataset(0, 30)
+
+    def test_negotiation(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='br;q=1.0, gzip;q=0.8, *;q=0.1')
+        self.assertEqual(compression.negotiate(request), 'br' if compression.brotli else 'gzip')
+        for header, expected in (('gzip;q=0, deflate', None), ('*', compression.available_encodings()[0]), ('', None)):
+            request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)
+            self.assertEqual(compression.negotiate(request), expected, header)
+
+    def test_cached_responses_are_compressed_once(self):
+        url = reverse('api:blog_list')
+        identity = self.client.get(url)
+        self.assertNotIn('Content-Encoding', identity)
+        self.assertIn('Accept-Encoding', identity['Vary'])
+
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(first.content), identity.content)
+        self.assertTrue(first['ETag'].startswith('W/'))
+
+        key = caching.response_cache_key(first.wsgi_request)
+        stored = caching.get_cached_response(key)['variants']['gzip']
+        second = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, stored)
+
+    def test_small_and_uncached_responses(self):
+        small = self.client.get(reverse('api:service_detail', kwargs={'slug': Service.objects.first().slug}),
+                                HTTP_ACCEPT_ENCODING='gzip')
+        self.assertLess(len(small.content), settings.COMPRESSION_MIN_SIZE)
+        self.assertNotIn('Content-Encoding', small)
+
+        with self.settings(RESPONSE_CACHE_ENABLED=False):
+            response = self.client.get(reverse('api:frontend_content'), HTTP_ACCEPT_ENCODING='gzip')
+            identity = self.client.get(reverse('api:frontend_content'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), identity.content)
+
+
+class QueryPlanTests(TestCase):
+    """The listing indexes cover the filters and orderings of the content views (plans checked on SQLite)"""
+
+    INDEXED_MODELS = (Project, BlogPost, HelpArticle, CaseStudy, TeamMember, JobPosition)
+
+    def test_content_views_use_indexes(self):
+        tables = {f'FROM "{model._meta.db_table}"' for model in self.INDEXED_MODELS}
+        plans = [plan for plan in query_plans.explain_views() if any(table in plan.sql for table in tables)]
+        self.assertGreaterEqual(len(plans), 20)
+        for plan in plans:
+            self.assertEqual(plan.problems, [], f'{plan.name}: {plan.plan}')
+
+    def test_keyset_orderings_match_an_index(self):
+        # The plans above are SQLite's; this checks the declared column order, NULLS LAST included
+        def index_columns(model, index):
+            if index.fields_orders:
+                return [
+                    (model._meta.get_field(name).column, order == 'DESC', False) for name, order in index.fields_orders
+                ]
+            columns = []
+            for expression in index.expressions:
+                descending = getattr(expression, 'descending', False)
+                nulls_last = bool(getattr(expression, 'nulls_last', False)) and descending
+                field = model._meta.get_field(getattr(expression, 'expression', expression).name)
+                columns.append((field.column, descending, nulls_last))
+            return columns
+
+        list_views = (views.ProjectListView, views.BlogPostListView, views.HelpArticleListView, views.CaseStudyListView)
+        for view_class in list_views:
+            queryset = view_class.queryset.order_by(*view_class.ordering)
+            model = queryset.model
+            keys = KeysetPagination().get_keys(queryset)
+            expected = [(key.field.column, key.descending, key.field.null and key.descending) for key in keys]
+            indexed = [index_columns(model, index) for index in model._meta.indexes]
+            self.assertIn(expected, [columns[-len(expected):] for columns in indexed], view_class.__name__)
+
+    def test_postgres_plans(self):
+        plan = (
+            'Limit  (cost=12.1..12.2 rows=20 width=64)\n'
+            '  ->  Sort  (cost=12.1..12.4 rows=100 width=64)\n'
+            '        Sort Key: is_featured DESC, created_at DESC\n'
+            '        ->  Seq Scan on api_project  (cost=0.00..9.00 rows=100 width=64)'
+        )
+        self.assertEqual(
+            query_plans.find_problems(plan, 'postgresql'), ['Sort outside an index', 'sequential scan of api_project']
+        )
+
+    def test_command_reports_flagged_views(self):
+        output = StringIO()
+        call_command('explain_queries', stdout=output)
+        self.assertIn('views need attention', output.getvalue())
+        self.assertNotIn('blog_list', output.getvalue())
+
+
+class SEOFilesTests(TestCase):
+    """Pre-rendered sitemap and robots.txt files, served without touching the views"""
+
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        overrides = override_settings(SEO_FILES_ROOT=Path(self.root), SEO_FILES_ASYNC=False, SITEMAP_SHARD_SIZE=2)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        seed_dataset(0, 3)
+
+    def get(self, url, **headers):
+        response = self.client.get(url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def test_rendered_files_are_served_with_etags(self):
+        # Nothing rendered yet: the view answers
+        self.assertEqual(self.get('/sitemap-projects.xml')[0]['Content-Type'], 'application/xml')
+        call_command('render_seo_files', base_url='https://example.com', stdout=StringIO())
+        manifest = load_manifest()
+
+        with self.assertNumQueries(0):
+            response, body = self.get('/sitemap-projects-2.xml')
+        self.assertEqual(response['ETag'], f'"{manifest["files"]["sitemap-projects-2.xml"]["hash"][:32]}"')
+        self.assertIn(b'<loc>https://example.com/projects/bench-project-2/</loc>', body)
+        self.assertIn(b'https://example.com/sitemap-projects-2.xml', self.get('/sitemap.xml')[1])
+        self.assertIn(b'Sitemap: https://example.com/sitemap.xml', self.get('/robots.txt')[1])
+
+        self.assertEqual(self.get('/sitemap-projects-2.xml', HTTP_IF_NONE_MATCH=response['ETag'])[0].status_code, 304)
+        compressed, data = self.get('/sitemap-projects-2.xml', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(data), body)
+        self.assertEqual(gzip.decompress(self.get('/sitemap-projects-2.xml.gz')[1]), body)
+
+    def test_only_changed_shards_are_rewritten(self):
+        call_command('render_seo_files', base_url='https://example.com', stdout=StringIO())
+        before = load_manifest()['files']
+        output = StringIO()
+        call_command('render_seo_files', stdout=output)
+        self.assertIn('Wrote 0 of', output.getvalue())
+
+        post = BlogPost.objects.get(slug='bench-post-2')
+        with self.captureOnCommitCallbacks(execute=True):
+            post.slug = 'renamed-post'
+            post.save()
+        after = load_manifest()['files']
+
+        changed = {name for name in after if after[name] != before.get(name)}
+        # The index changes too when the shard's lastmod moved on to the next second
+        self.assertEqual(changed - {'sitemap.xml'}, {'sitemap-blog-2.xml'})
+        # Files of the replaced versions are removed
+        stored = set(os.listdir(self.root))
+        self.assertNotIn(before['sitemap-blog-2.xml']['path'], stored)
+        self.assertIn(after['sitemap-blog-2.xml']['path'], stored)
+
+
+class SEOContextTests(TestCase):
+    """request.seo_context is lazy and built from a memoized per-page context"""
+
+    def setUp(self):
+        cache.clear()
+        clear_page_meta_contexts()
+        self.middleware = SEOMiddleware(lambda request: None)
+        self.factory = RequestFactory()
+
+    def get_request(self, path):
+        request = self.factory.get(path)
+        self.middleware.process_request(request)
+        return request
+
+    def test_api_and_static_paths_are_skipped(self):
+        for path in ('/api/projects/', '/static/app.css', '/media/seo/og.png'):
+            self.assertFalse(hasattr(self.get_request(path), 'seo_context'))
+
+    def test_context_is_lazy_memoized_and_invalidated(self):
+        meta = SEOMetaTags.objects.create(
+            page_type='services', meta_title='Our services', meta_description='What we do',
+        )
+        with self.assertNumQueries(0):
+            request = self.get_request('/services/web/')
+        self.assertEqual(request.page_type, 'services')
+
+        self.assertEqual(request.seo_context['meta_title'], 'Our services')
+        self.assertEqual(request.seo_context['canonical_url'], 'https://testserver/services/web/')
+
+        # Another URL of the same page type reuses the memoized context
+        with self.assertNumQueries(0):
+            other = self.get_request('/services/design/')
+            self.assertEqual(other.seo_context['og_url'], 'https://testserver/services/design/')
+            self.assertEqual(other.seo_context['og_title'], 'Our services')
+
+        meta.meta_title = 'Services'
+        meta.save()
+        self.assertEqual(self.get_request('/services/').seo_context['meta_title'], 'Services')
+
+
+class FailingEmailBackend(LocmemEmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP server unavailable')
+
+
+class SlowEmailBackend(LocmemEmailBackend):
+    def send_messages(self, messages):
+        time.sleep(0.5)
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', NOTIFICATIONS_ASYNC=False)
+class NotificationTests(TestCase):
+    """Form notifications are sent after commit and their delivery is recorded"""
+
+    contact = {
+        'name': 'Ada', 'email': 'ada@example.com', 'subject': 'Hello',
+        'message': 'We would like a new website.'
+    }
+
+    def setUp(self):
+        smtp_pool.reset_pools()
+        self.addCleanup(smtp_pool.reset_pools)
+
+    def test_contact_form_records_delivery(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('api:contact_create'), self.contact, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 1)
+
+        message = ContactMessage.objects.get()
+        self.assertEqual(message.notification_status, 'sent')
+        self.assertEqual(message.notification_attempts, 1)
+        self.assertIsNotNone(message.notified_at)
+
+    @override_settings(EMAIL_BACKEND='api.tests.FailingEmailBackend', NOTIFICATIONS_MAX_ATTEMPTS=2)
+    def test_failed_delivery_is_retried_and_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('api:quick_contact'), self.contact, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+        message = ContactMessage.objects.get()
+        self.assertEqual(message.notification_status, 'failed')
+        self.assertEqual(message.notification_attempts, 2)
+        self.assertIn('SMTP server unavailable', message.notification_error)
+
+    def test_retried_notifications_keep_their_form(self):
+        with self.settings(EMAIL_BACKEND='api.tests.FailingEmailBackend', NOTIFICATIONS_MAX_ATTEMPTS=1):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('api:quick_contact'), self.contact, content_type='application/json')
+        self.assertEqual(ContactMessage.objects.get().notification_status, 'failed')
+
+        smtp_pool.reset_pools()
+        call_command('send_pending_notifications', '--include-failed', '--older-than=0', stdout=StringIO())
+        message, = mail.outbox
+        self.assertEqual(message.subject, 'New Quick Contact: Hello')
+        self.assertIn('quick contact form', message.body)
+
+    @override_settings(EMAIL_BACKEND='api.tests.SlowEmailBackend', NOTIFICATIONS_ASYNC=True)
+    def test_async_delivery_does_not_block_the_request(self):
+        dispatcher = notifications.NotificationDispatcher(workers=1, queue_size=10)
+        original, notifications._dispatcher = notifications._dispatcher, dispatcher
+        try:
+            started = time.perf_counter()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('api:newsletter_subscribe'), {'email': 'bob@example.com'},
+                                 content_type='application/json')
+            self.assertLess(time.perf_counter() - started, 0.5)
+            dispatcher.queue.join()
+            self.assertEqual(len(mail.outbox), 2)
+        finally:
+            notifications._dispatcher = original
+
+    def test_full_queue_defers_delivery(self):
+        dispatcher = notifications.NotificationDispatcher(workers=0, queue_size=1)
+        self.assertTrue(dispatcher.enqueue(notifications.Notification([])))
+        self.assertFalse(dispatcher.enqueue(notifications.Notification([])))
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP to accept mail; hangs up after ``drop_after`` messages per
+    connection and refuses recipients at invalid.example.
+    """
+
+    def reply(self, line):
+        self.wfile.write(line + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        received = 0
+        self.reply(b'220 localhost SMTP stand-in')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b'EHLO', b'HELO'):
+                self.reply(b'250 localhost')
+            elif command == b'DATA':
+                self.reply(b'354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                server.messages += 1
+                received += 1
+                self.reply(b'250 OK')
+                if server.drop_after and received >= server.drop_after:
+                    return
+            elif command == b'RCPT' and b'@invalid.example' in line:
+                self.reply(b'550 No such user')
+            elif command == b'QUIT':
+                self.reply(b'221 Bye')
+                return
+            else:
+                self.reply(b'250 OK')
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_after=0):
+        super().__init__(('127.0.0.1', 0), SMTPStandInHandler)
+        self.drop_after = drop_after
+        self.connections = 0
+        self.messages = 0
+
+
+class SMTPPoolTests(TestCase):
+    """The SMTP pool reuses connections, reconnects after drops and trips its circuit breaker"""
+
+    def start_server(self, drop_after=0):
+        server = SMTPStandIn(drop_after=drop_after)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.use_port(server.server_address[1])
+        return server
+
+    def use_port(self, port):
+        override = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=port, EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='', EMAIL_TIMEOUT=2,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def make_pool(self, **breaker):
+        pool = smtp_pool.SMTPConnectionPool(size=1, breaker=smtp_pool.CircuitBreaker(**breaker))
+        self.addCleanup(pool.close)
+        return pool
+
+    def messages(self, count):
+        return [EmailMessage(f'Message {i}', 'Body', 'from@example.com', ['to@example.com']) for i in range(count)]
+
+    def test_batches_reuse_one_connection(self):
+        server = self.start_server()
+        pool = self.make_pool()
+        for _ in range(3):
+            self.assertEqual(pool.send_messages(self.messages(5)), 5)
+
+        stats = pool.stats()
+        self.assertEqual(server.messages, 15)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(stats['messages_sent'], 15)
+        self.assertEqual(stats['batches'], 3)
+        self.assertGreater(stats['messages_per_second'], 0)
+
+    def test_reconnects_after_server_drops_connection(self):
+        server = self.start_server(drop_after=2)
+        pool = self.make_pool()
+        self.assertEqual(pool.send_messages(self.messages(5)), 5)
+
+        self.assertEqual(server.messages, 5)
+        self.assertEqual(server.connections, 3)
+        self.assertEqual(pool.stats()['reconnects'], 2)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        self.use_port(port)
+
+        pool = self.make_pool(failure_threshold=2, reset_timeout=60)
+        for _ in range(2):
+            with self.assertRaises(ConnectionRefusedError):
+                pool.send_messages(self.messages(1))
+        self.assertEqual(pool.stats()['circuit_state'], 'open')
+        with self.assertRaises(smtp_pool.CircuitOpenError):
+            pool.send_messages(self.messages(1))
+
+        # After the cool-down one trial batch is let through and closes the circuit
+        server = self.start_server()
+        pool.breaker.reset_timeout = 0
+        self.assertEqual(pool.send_messages(self.messages(1)), 1)
+        self.assertEqual(pool.stats()['circuit_state'], 'closed')
+        self.assertEqual(server.messages, 1)
+
+    def test_rejected_batches_do_not_open_the_circuit(self):
+        server = self.start_server()
+        pool = self.make_pool(failure_threshold=2, reset_timeout=60)
+        rejected = [EmailMessage('Hello', 'Body', 'from@example.com', ['nobody@invalid.example'])]
+        for _ in range(3):
+            with self.assertRaises(smtplib.SMTPRecipientsRefused):
+                pool.send_messages(rejected)
+
+        self.assertEqual(pool.stats()['circuit_state'], 'closed')
+        self.assertEqual(pool.send_messages(self.messages(2)), 2)
+        self.assertEqual(server.messages, 2)
+
+    def test_half_open_circuit_lets_one_trial_through(self):
+        breaker = smtp_pool.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'open')
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def test_queued_notifications_share_a_connection(self):
+        server = self.start_server()
+        smtp_pool.reset_pools()
+        self.addCleanup(smtp_pool.reset_pools)
+        batch = [notifications.Notification(self.messages(2)) for _ in range(4)]
+        notifications.deliver_batch(batch)
+
+        self.assertEqual(server.messages, 8)
+        self.assertEqual(server.connections, 1)
@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 from . import seo_views
 
@@ -52,6 +52,7 @@ urlpatterns = [
     path('help/', views.HelpArticleListView.as_view(), name='help_list'),
     path('help/category/<str:category>/', views.HelpArticleCategoryView.as_view(), name='help_category'),
     path('help/<slug:slug>/', views.HelpArticleDetailView.as_view(), name='help_detail'),
+    path('help/<slug:slug>/helpful/', views.HelpArticleHelpfulView.as_view(), name='help_helpful'),
     
     # Case Study endpoints
     path('case-studies/', views.CaseStudyListView.as_view(), name='case_study_list'),
@@ -116,12 +117,21 @@ urlpatterns = [
     # Dashboard statistics API
     path('dashboard/stats/', views.dashboard_statistics_api, name='dashboard_stats'),
     
+    # Page view beacon (buffered, see api/analytics.py)
+    path('analytics/beacon/', views.AnalyticsBeaconView.as_view(), name='analytics_beacon'),
+    
     # =============================================================================
     # SEO OPTIMIZATION ENDPOINTS
     # =============================================================================
     
     # SEO files
     path('sitemap.xml', seo_views.sitemap_xml, name='sitemap_xml'),
+    path('sitemap.xml.gz', seo_views.sitemap_xml, {'compress': True}, name='sitemap_xml_gz'),
+    re_path(r'^sitemap-(?P<section>[a-z-]+?)(?:-(?P<page>[0-9]+))?\.xml$', seo_views.sitemap_section, name='sitemap_section'),
+    re_path(
+        r'^sitemap-(?P<section>[a-z-]+?)(?:-(?P<page>[0-9]+))?\.xml\.gz$', seo_views.sitemap_section,
+        {'compress': True}, name='sitemap_section_gz',
+    ),
     path('robots.txt', seo_views.robots_txt, name='robots_txt'),
     
     # SEO health check
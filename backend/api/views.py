@@ -1,6 +1,9 @@
+import hashlib
+
 from rest_framework import generics, status, filters
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import login
@@ -8,8 +11,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count, Avg
 from django.utils import timezone
 from datetime import datetime, timedelta
-from django.core.mail import send_mail
 from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
 from django.template.loader import render_to_string
 
 from .models import (
@@ -17,7 +21,7 @@ from .models import (
     MeetingRequest, HelpArticle, CaseStudy,
     # New content management models
     NavigationMenu, SubMenuItem, PageContent, SectionContent, CompanyInfo,
-    TeamMember, JobPosition, FeatureFlag, SiteSettings
+    TeamMember, JobPosition, FeatureFlag, SiteSettings, SearchDocument, VisitorStatistics
 )
 from .serializers import (
     ProjectSerializer, TestimonialSerializer, ContactMessageSerializer,
@@ -34,7 +38,19 @@ from .serializers import (
     SiteSettingsSerializer, FrontendContentSerializer, HomePageDataSerializer,
     FooterDataSerializer
 )
+from .snapshots import get_homepage_snapshot, snapshot_content
+from .dashboard_metrics import get_dashboard_metrics, growth
+from . import analytics, counters
+from .conditional import ConditionalGetMixin, make_etag
+from .eager_loading import EagerLoadingMixin, eager_load
+from .fragments import FragmentCacheMixin
+from .pagination import KeysetPagination
+from .singletons import get_company_info, get_site_settings
+from . import notifications, search, technologies
 from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import render
 
 
@@ -116,7 +132,7 @@ def home_view(request):
     return HttpResponse(html_content)
 
 
-class ProjectListView(generics.ListAPIView):
+class ProjectListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List all projects with filtering and searching capabilities"""
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
@@ -125,22 +141,23 @@ class ProjectListView(generics.ListAPIView):
     search_fields = ['title', 'description', 'technologies', 'client_name']
     ordering_fields = ['created_at', 'year', 'title']
     ordering = ['-is_featured', '-created_at']
+    pagination_class = KeysetPagination
 
 
-class ProjectDetailView(generics.RetrieveAPIView):
+class ProjectDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Retrieve a single project by slug"""
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     lookup_field = 'slug'
 
 
-class FeaturedProjectsView(generics.ListAPIView):
+class FeaturedProjectsView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List featured projects only"""
     queryset = Project.objects.filter(is_featured=True)
     serializer_class = ProjectSerializer
 
 
-class TestimonialListView(generics.ListAPIView):
+class TestimonialListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List all testimonials"""
     queryset = Testimonial.objects.all()
     serializer_class = TestimonialSerializer
@@ -148,35 +165,36 @@ class TestimonialListView(generics.ListAPIView):
     ordering = ['-is_featured', '-created_at']
 
 
-class FeaturedTestimonialsView(generics.ListAPIView):
+class FeaturedTestimonialsView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List featured testimonials only"""
     queryset = Testimonial.objects.filter(is_featured=True)
     serializer_class = TestimonialSerializer
 
 
-class ServiceListView(generics.ListAPIView):
+class ServiceListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List all active services"""
     queryset = Service.objects.filter(is_active=True)
     serializer_class = ServiceSerializer
 
 
-class ServiceDetailView(generics.RetrieveAPIView):
+class ServiceDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Retrieve a single service by slug"""
     queryset = Service.objects.filter(is_active=True)
     serializer_class = ServiceSerializer
     lookup_field = 'slug'
 
 
-class BlogPostListView(generics.ListAPIView):
+class BlogPostListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List published blog posts"""
     queryset = BlogPost.objects.filter(is_published=True)
     serializer_class = BlogPostListSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'excerpt', 'content', 'tags']
     ordering = ['-is_featured', '-published_at']
+    pagination_class = KeysetPagination
 
 
-class BlogPostDetailView(generics.RetrieveAPIView):
+class BlogPostDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Retrieve a single blog post by slug"""
     queryset = BlogPost.objects.filter(is_published=True)
     serializer_class = BlogPostSerializer
@@ -194,39 +212,8 @@ class ContactMessageCreateView(generics.CreateAPIView):
             # Save the contact message
             contact_message = serializer.save()
             
-            # Send email notification
-            try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                from django.template.loader import render_to_string
-                
-                # Prepare email content
-                subject = f"New Contact Message: {contact_message.subject}"
-                message = f"""
-New contact message received:
-
-Name: {contact_message.name}
-Email: {contact_message.email}
-Phone: {contact_message.phone or 'Not provided'}
-Subject: {contact_message.subject}
-Message Type: {contact_message.get_message_type_display()}
-Message:
-{contact_message.message}
-
-This message was sent from the contact form on your website.
-                """
-                
-                # Send email to site admin
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [settings.ADMIN_EMAIL],  # To email (sitegenit@gmail.com)
-                    fail_silently=False,
-                )
-            except Exception as e:
-                # Log the error but don't fail the request
-                print(f"Failed to send email notification: {e}")
+            # Notify the site admin once the message is committed (sent off the request path)
+            notifications.notify(notifications.contact_message_emails(contact_message), record=contact_message)
             
             return Response({
                 'success': True,
@@ -247,40 +234,10 @@ class QuickContactView(APIView):
         serializer = ContactFormSerializer(data=request.data)
         if serializer.is_valid():
             # Save the contact message
-            contact_message = serializer.save()
+            contact_message = serializer.save(source='quick_contact')
             
-            # Send email notification
-            try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                
-                # Prepare email content
-                subject = f"New Quick Contact: {contact_message.subject}"
-                message = f"""
-New quick contact received:
-
-Name: {contact_message.name}
-Email: {contact_message.email}
-Phone: {contact_message.phone or 'Not provided'}
-Subject: {contact_message.subject}
-Message Type: {contact_message.get_message_type_display()}
-Message:
-{contact_message.message}
-
-This message was sent from the quick contact form on your website.
-                """
-                
-                # Send email to site admin
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [settings.ADMIN_EMAIL],  # To email (sitegenit@gmail.com)
-                    fail_silently=False,
-                )
-            except Exception as e:
-                # Log the error but don't fail the request
-                print(f"Failed to send email notification: {e}")
+            # Notify the site admin once the message is committed (sent off the request path)
+            notifications.notify(notifications.contact_message_emails(contact_message), record=contact_message)
             
             return Response({
                 'success': True,
@@ -305,53 +262,8 @@ class NewsletterSubscribeView(generics.CreateAPIView):
             # Save the subscriber
             subscriber = serializer.save()
             
-            # Send email notification
-            try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                
-                # Prepare email content for admin notification
-                subject = f"New Newsletter Subscriber: {subscriber.email}"
-                message = f"""
-New newsletter subscription:
-
-Email: {subscriber.email}
-Name: {subscriber.name or 'Not provided'}
-Subscription Date: {subscriber.subscribed_at}
-
-This subscription was made through the website newsletter form.
-                """
-                
-                # Send email to site admin
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [settings.ADMIN_EMAIL],  # To email (sitegenit@gmail.com)
-                    fail_silently=False,
-                )
-                
-                # Send welcome email to subscriber
-                welcome_subject = "Welcome to Our Newsletter!"
-                welcome_message = f"""
-Thank you for subscribing to our newsletter, {subscriber.name or 'there'}!
-
-You'll now receive updates about our latest projects, industry insights, and special offers.
-
-Best regards,
-The Team
-                """
-                
-                send_mail(
-                    welcome_subject,
-                    welcome_message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [subscriber.email],  # To subscriber's email
-                    fail_silently=False,
-                )
-            except Exception as e:
-                # Log the error but don't fail the request
-                print(f"Failed to send email notification: {e}")
+            # Notify the site admin and welcome the subscriber (sent off the request path)
+            notifications.notify(notifications.newsletter_emails(subscriber))
             
             return Response({
                 'success': True,
@@ -364,8 +276,9 @@ The Team
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
-class StatsView(APIView):
+class StatsView(ConditionalGetMixin, APIView):
     """Get website statistics"""
+    conditional_models = (Project, Testimonial)
     
     def get(self, request):
         # Calculate statistics
@@ -377,20 +290,15 @@ class StatsView(APIView):
         avg_rating = Testimonial.objects.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 5.0
         client_satisfaction = round((avg_rating / 5.0) * 100, 1)
         
-        # Get unique technologies
-        all_projects = Project.objects.all()
-        technologies_set = set()
-        for project in all_projects:
-            if project.technologies:
-                technologies_set.update(project.technologies)
-        technologies_used = list(technologies_set)[:10]  # Top 10 technologies
+        # Top 10 technologies by number of projects, from the maintained usage index
+        technologies_used = technologies.top_technologies(10)
         
         # Recent projects (last 6)
         recent_projects = Project.objects.all()[:6]
         recent_projects_data = ProjectSerializer(recent_projects, many=True, context={'request': request}).data
         
         # Featured testimonials
-        featured_testimonials = Testimonial.objects.filter(is_featured=True)[:3]
+        featured_testimonials = eager_load(Testimonial.objects.filter(is_featured=True), TestimonialSerializer)[:3]
         featured_testimonials_data = TestimonialSerializer(featured_testimonials, many=True, context={'request': request}).data
         
         stats_data = {
@@ -406,8 +314,9 @@ class StatsView(APIView):
         return Response(stats_data)
 
 
-class ProjectCategoriesView(APIView):
+class ProjectCategoriesView(ConditionalGetMixin, APIView):
     """Get project categories with counts"""
+    conditional_models = (Project,)
     
     def get(self, request):
         categories = Project.objects.values('category').annotate(
@@ -461,46 +370,76 @@ def api_info(request):
     })
 
 
-class SearchView(APIView):
-    """Global search across projects, blog posts, and services"""
+class SearchView(ConditionalGetMixin, APIView):
+    """
+    Global full-text search across projects, blog posts, services, help articles,
+    case studies and jobs. Returns the best matches and the total of each type,
+    plus a cursor per type to load more. Pass ``cursor`` (or ``type`` with ``page``)
+    to page through one type; cursors carry the total so it is not counted again.
+    """
+    conditional_models = (Project, BlogPost, Service, HelpArticle, CaseStudy, JobPosition, SearchDocument)
+    preview_size = 5
+    max_page_size = 50
     
     def get(self, request):
+        try:
+            page_size = min(max(int(request.query_params.get('page_size', 10)), 1), self.max_page_size)
+            page = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                query, content_type, offset, total = search.decode_cursor(cursor)
+            except (signing.BadSignature, KeyError, TypeError, ValueError):
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            hits, _ = search.search(query, content_type, limit=page_size, offset=offset, with_total=False)
+            return self.type_response(request, query, content_type, hits, offset, total)
+        
         query = request.query_params.get('q', '').strip()
         if not query or len(query) < 3:
             return Response({
                 'error': 'Search query must be at least 3 characters long'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Search projects
-        projects = Project.objects.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query) |
-            Q(technologies__icontains=query)
-        )[:5]
+        content_type = request.query_params.get('type')
+        if content_type and content_type not in search.SEARCH_TYPES:
+            return Response({
+                'error': f"Unknown search type. Choose from: {', '.join(search.SEARCH_TYPES)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Search blog posts
-        blog_posts = BlogPost.objects.filter(
-            Q(title__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(content__icontains=query),
-            is_published=True
-        )[:5]
+        if content_type:
+            offset = (page - 1) * page_size
+            hits, total = search.search(query, content_type, limit=page_size, offset=offset)
+            return self.type_response(request, query, content_type, hits, offset, total)
         
-        # Search services
-        services = Service.objects.filter(
-            Q(name__icontains=query) |
-            Q(description__icontains=query),
-            is_active=True
-        )[:5]
+        # Top hits and totals of every type in a single statement
+        matches = search.search_many(query, list(search.SEARCH_TYPES), limit=self.preview_size)
+        context = {'request': request}
+        results, totals, cursors = {}, {}, {}
+        for key, (hits, total) in matches.items():
+            results[key] = search.serialize_hits(search.SEARCH_TYPES[key], hits, context)
+            totals[key] = total
+            cursors[key] = search.next_cursor(query, key, 0, len(hits), total)
         
         return Response({
             'query': query,
-            'results': {
-                'projects': ProjectSerializer(projects, many=True, context={'request': request}).data,
-                'blog_posts': BlogPostListSerializer(blog_posts, many=True, context={'request': request}).data,
-                'services': ServiceSerializer(services, many=True, context={'request': request}).data,
-            },
-            'total_results': projects.count() + blog_posts.count() + services.count()
+            'results': results,
+            'totals': totals,
+            'cursors': cursors,
+            'total_results': sum(totals.values())
+        })
+    
+    def type_response(self, request, query, content_type, hits, offset, total):
+        """One page of a single type"""
+        return Response({
+            'query': query,
+            'type': content_type,
+            'results': search.serialize_hits(search.SEARCH_TYPES[content_type], hits, {'request': request}),
+            'total_results': total,
+            'offset': offset,
+            'next_cursor': search.next_cursor(query, content_type, offset, len(hits), total)
         })
 
 
@@ -514,55 +453,8 @@ class UserRegistrationView(APIView):
             user = serializer.save()
             token, created = Token.objects.get_or_create(user=user)
             
-            # Send email notification
-            try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                
-                # Prepare email content for admin notification
-                subject = f"New User Registration: {user.email}"
-                message = f"""
-New user registration:
-
-Name: {user.get_full_name()}
-Email: {user.email}
-Registration Date: {user.date_joined}
-
-This user registered through the website.
-                """
-                
-                # Send email to site admin
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [settings.ADMIN_EMAIL],  # To email (sitegenit@gmail.com)
-                    fail_silently=False,
-                )
-                
-                # Send welcome email to user
-                welcome_subject = "Welcome to Our Platform!"
-                welcome_message = f"""
-Dear {user.get_full_name()},
-
-Welcome to our platform! Thank you for registering.
-
-You can now access all our features and services.
-
-Best regards,
-The Team
-                """
-                
-                send_mail(
-                    welcome_subject,
-                    welcome_message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [user.email],  # To user's email
-                    fail_silently=False,
-                )
-            except Exception as e:
-                # Log the error but don't fail the request
-                print(f"Failed to send email notification: {e}")
+            # Notify the site admin and welcome the user (sent off the request path)
+            notifications.notify(notifications.registration_emails(user))
             
             return Response({
                 'success': True,
@@ -620,74 +512,8 @@ class MeetingRequestCreateView(generics.CreateAPIView):
             # Save the meeting request
             meeting_request = serializer.save()
             
-            # Send email notification
-            try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                
-                # Prepare email content
-                subject = f"New Meeting Request from {meeting_request.name}"
-                message = f"""
-New meeting request received:
-
-Contact Information:
-- Name: {meeting_request.name}
-- Email: {meeting_request.email}
-- Phone: {meeting_request.phone or 'Not provided'}
-- Company: {meeting_request.company or 'Not provided'}
-
-Meeting Details:
-- Type: {meeting_request.get_meeting_type_display()}
-- Preferred Date: {meeting_request.preferred_date}
-- Preferred Time: {meeting_request.get_preferred_time_display()}
-
-Project Description:
-{meeting_request.project_description}
-
-Request ID: {meeting_request.id}
-Submitted: {meeting_request.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-
-Please log in to the admin panel to manage this request:
-http://localhost:8000/admin/api/meetingrequest/{meeting_request.id}/
-                """
-                
-                # Send email to site admin
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [settings.MEETING_REQUEST_EMAIL],  # To email (sitegenit@gmail.com)
-                    fail_silently=False,
-                )
-                
-                # Send confirmation email to requester
-                confirmation_subject = "Meeting Request Confirmation"
-                confirmation_message = f"""
-Dear {meeting_request.name},
-
-Thank you for your meeting request. We've received your request and will contact you within 24 hours to confirm the details.
-
-Meeting Request Details:
-- Meeting Type: {meeting_request.get_meeting_type_display()}
-- Preferred Date: {meeting_request.preferred_date}
-- Preferred Time: {meeting_request.get_preferred_time_display()}
-
-If you have any questions, please contact us at {settings.MEETING_REQUEST_EMAIL}.
-
-Best regards,
-The Team
-                """
-                
-                send_mail(
-                    confirmation_subject,
-                    confirmation_message,
-                    settings.DEFAULT_FROM_EMAIL,  # From email
-                    [meeting_request.email],  # To requester's email
-                    fail_silently=False,
-                )
-            except Exception as e:
-                # Log the error but don't fail the request
-                print(f"Failed to send email notification: {e}")
+            # Notify the team and confirm to the requester (sent off the request path)
+            notifications.notify(notifications.meeting_request_emails(meeting_request), record=meeting_request)
             
             return Response({
                 'success': True,
@@ -710,17 +536,18 @@ The Team
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
-class MeetingRequestListView(generics.ListAPIView):
+class MeetingRequestListView(EagerLoadingMixin, generics.ListAPIView):
     """List meeting requests (admin only)"""
     queryset = MeetingRequest.objects.all()
     serializer_class = MeetingRequestListSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status', 'meeting_type']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
 
 
 # Help Center Views
-class HelpArticleListView(generics.ListAPIView):
+class HelpArticleListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List published help articles"""
     queryset = HelpArticle.objects.filter(is_published=True)
     serializer_class = HelpArticleListSerializer
@@ -728,26 +555,66 @@ class HelpArticleListView(generics.ListAPIView):
     filterset_fields = ['category', 'is_featured']
     search_fields = ['title', 'excerpt', 'content']
     ordering = ['-is_featured', '-helpful_votes', '-created_at']
+    pagination_class = KeysetPagination
+    counter_fields = ('view_count', 'helpful_votes')
 
 
-class HelpArticleDetailView(generics.RetrieveAPIView):
+class HelpArticleDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Retrieve a single help article by slug"""
     queryset = HelpArticle.objects.filter(is_published=True)
     serializer_class = HelpArticleSerializer
     lookup_field = 'slug'
+    # Every view is counted, so the view must run (a 304 still counts) rather than be replayed from the cache
+    response_cache = False
+    # The counts shown are the last flushed ones, and the ETag moves with them
+    counter_fields = ('view_count', 'helpful_votes')
     
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        # Increment view count
-        instance.view_count += 1
-        instance.save(update_fields=['view_count'])
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method == 'GET' and response.status_code in (200, 304):
+            counters.increment(HelpArticle, 'view_count', slug=self.kwargs['slug'])
+        return response
 
 
-class HelpArticleCategoryView(generics.ListAPIView):
+class HelpArticleHelpfulView(APIView):
+    """
+    Record a "this article was helpful" vote (buffered, see api/counters.py).
+    Votes are rate limited, and each visitor counts once per article for
+    ``HELP_VOTE_DEDUP_TIMEOUT`` seconds; a repeated vote is answered with ``counted: false``.
+    """
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'help_votes'
+
+    def post(self, request, slug):
+        helpful_votes = HelpArticle.objects.filter(slug=slug, is_published=True).values_list(
+            'helpful_votes', flat=True
+        ).first()
+        if helpful_votes is None:
+            return Response({'success': False, 'message': 'Article not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        counted = cache.add(
+            self.vote_key(request, slug), True, getattr(settings, 'HELP_VOTE_DEDUP_TIMEOUT', 60 * 60 * 24)
+        )
+        if counted:
+            counters.increment(HelpArticle, 'helpful_votes', slug=slug)
+        return Response({
+            'success': True,
+            'counted': counted,
+            'helpful_votes': helpful_votes + counters.pending_count(HelpArticle, 'helpful_votes', slug=slug)
+        })
+
+    def vote_key(self, request, slug):
+        # The user, else the client address the throttle uses: ids sent by the client could be rotated
+        user = request.user
+        voter = f'user:{user.pk}' if user.is_authenticated else f'ip:{self.get_throttles()[0].get_ident(request)}'
+        digest = hashlib.sha1(f'{slug}|{voter}'.encode('utf-8')).hexdigest()
+        return f'api:help-vote:{digest}'
+
+
+class HelpArticleCategoryView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List help articles by category"""
     serializer_class = HelpArticleListSerializer
+    counter_fields = ('view_count', 'helpful_votes')
     
     def get_queryset(self):
         category = self.kwargs['category']
@@ -758,7 +625,7 @@ class HelpArticleCategoryView(generics.ListAPIView):
 
 
 # Case Study Views
-class CaseStudyListView(generics.ListAPIView):
+class CaseStudyListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List published case studies"""
     queryset = CaseStudy.objects.filter(is_published=True)
     serializer_class = CaseStudyListSerializer
@@ -766,22 +633,23 @@ class CaseStudyListView(generics.ListAPIView):
     filterset_fields = ['industry', 'is_featured']
     search_fields = ['title', 'client_name', 'challenge', 'solution']
     ordering = ['-is_featured', '-created_at']
+    pagination_class = KeysetPagination
 
 
-class CaseStudyDetailView(generics.RetrieveAPIView):
+class CaseStudyDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Retrieve a single case study by slug"""
     queryset = CaseStudy.objects.filter(is_published=True)
     serializer_class = CaseStudySerializer
     lookup_field = 'slug'
 
 
-class FeaturedCaseStudiesView(generics.ListAPIView):
+class FeaturedCaseStudiesView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List featured case studies only"""
     queryset = CaseStudy.objects.filter(is_featured=True, is_published=True)
     serializer_class = CaseStudyListSerializer
 
 
-class CaseStudyByIndustryView(generics.ListAPIView):
+class CaseStudyByIndustryView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List case studies by industry"""
     serializer_class = CaseStudyListSerializer
     
@@ -797,7 +665,7 @@ class CaseStudyByIndustryView(generics.ListAPIView):
 # CONTENT MANAGEMENT VIEWS
 # =============================================================================
 
-class NavigationMenuListView(generics.ListAPIView):
+class NavigationMenuListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """List navigation menus by type"""
     serializer_class = NavigationMenuSerializer
     filter_backends = [DjangoFilterBackend]
@@ -807,32 +675,32 @@ class NavigationMenuListView(generics.ListAPIView):
         return NavigationMenu.objects.filter(is_active=True).order_by('order')
 
 
-class HeaderMenuView(generics.ListAPIView):
+class HeaderMenuView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """Get header menu items"""
     queryset = NavigationMenu.objects.filter(menu_type='header', is_active=True).order_by('order')
     serializer_class = NavigationMenuSerializer
 
 
-class FooterMenuView(generics.ListAPIView):
+class FooterMenuView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """Get footer menu items"""
     queryset = NavigationMenu.objects.filter(menu_type='footer', is_active=True).order_by('order')
     serializer_class = NavigationMenuSerializer
 
 
-class PageContentView(generics.RetrieveAPIView):
+class PageContentView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Get page content by page type"""
     queryset = PageContent.objects.filter(is_published=True)
     serializer_class = PageContentSerializer
     lookup_field = 'page_type'
 
 
-class PageContentListView(generics.ListAPIView):
+class PageContentListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """List all published page contents"""
     queryset = PageContent.objects.filter(is_published=True)
     serializer_class = PageContentSerializer
 
 
-class SectionContentView(generics.ListAPIView):
+class SectionContentView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """Get section content by section type"""
     serializer_class = SectionContentSerializer
     filter_backends = [DjangoFilterBackend]
@@ -842,25 +710,17 @@ class SectionContentView(generics.ListAPIView):
         return SectionContent.objects.filter(is_active=True).order_by('order')
 
 
-class CompanyInfoView(generics.RetrieveAPIView):
+class CompanyInfoView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Get company information"""
+    conditional_models = (CompanyInfo,)
     serializer_class = CompanyInfoSerializer
     
     def get_object(self):
-        # Get or create company info (there should only be one instance)
-        company_info, created = CompanyInfo.objects.get_or_create(
-            id=1,
-            defaults={
-                'company_name': 'site gen it',
-                'email': 'info@agency.com',
-                'tagline': 'Your Creative Digital Partner',
-                'description': 'We create innovative digital solutions that drive business growth.'
-            }
-        )
-        return company_info
+        # There is only one instance, held in process memory
+        return get_company_info()
 
 
-class TeamMemberListView(generics.ListAPIView):
+class TeamMemberListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List active team members"""
     queryset = TeamMember.objects.filter(is_active=True).order_by('department', 'order')
     serializer_class = TeamMemberListSerializer
@@ -868,20 +728,20 @@ class TeamMemberListView(generics.ListAPIView):
     filterset_fields = ['department', 'is_featured']
 
 
-class TeamMemberDetailView(generics.RetrieveAPIView):
+class TeamMemberDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Get team member details"""
     queryset = TeamMember.objects.filter(is_active=True)
     serializer_class = TeamMemberSerializer
     lookup_field = 'id'
 
 
-class FeaturedTeamMembersView(generics.ListAPIView):
+class FeaturedTeamMembersView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List featured team members"""
     queryset = TeamMember.objects.filter(is_active=True, is_featured=True).order_by('order')
     serializer_class = TeamMemberListSerializer
 
 
-class TeamByDepartmentView(generics.ListAPIView):
+class TeamByDepartmentView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List team members by department"""
     serializer_class = TeamMemberListSerializer
     
@@ -893,7 +753,7 @@ class TeamByDepartmentView(generics.ListAPIView):
         ).order_by('order')
 
 
-class JobPositionListView(generics.ListAPIView):
+class JobPositionListView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List active job positions"""
     queryset = JobPosition.objects.filter(is_active=True).order_by('-is_featured', '-created_at')
     serializer_class = JobPositionListSerializer
@@ -902,20 +762,20 @@ class JobPositionListView(generics.ListAPIView):
     search_fields = ['title', 'description']
 
 
-class JobPositionDetailView(generics.RetrieveAPIView):
+class JobPositionDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Get job position details"""
     queryset = JobPosition.objects.filter(is_active=True)
     serializer_class = JobPositionSerializer
     lookup_field = 'id'
 
 
-class FeaturedJobsView(generics.ListAPIView):
+class FeaturedJobsView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List featured job positions"""
     queryset = JobPosition.objects.filter(is_active=True, is_featured=True).order_by('-created_at')
     serializer_class = JobPositionListSerializer
 
 
-class JobsByDepartmentView(generics.ListAPIView):
+class JobsByDepartmentView(ConditionalGetMixin, FragmentCacheMixin, EagerLoadingMixin, generics.ListAPIView):
     """List jobs by department"""
     serializer_class = JobPositionListSerializer
     
@@ -927,51 +787,45 @@ class JobsByDepartmentView(generics.ListAPIView):
         ).order_by('-is_featured', '-created_at')
 
 
-class FeatureFlagListView(generics.ListAPIView):
+class FeatureFlagListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """List all feature flags"""
     queryset = FeatureFlag.objects.all().order_by('name')
     serializer_class = FeatureFlagSerializer
 
 
-class SiteSettingsView(generics.RetrieveAPIView):
+class SiteSettingsView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """Get site settings"""
+    conditional_models = (SiteSettings,)
     serializer_class = SiteSettingsSerializer
     
     def get_object(self):
-        # Get or create site settings (there should only be one instance)
-        settings_obj, created = SiteSettings.objects.get_or_create(
-            id=1,
-            defaults={
-                'site_name': 'site gen it',
-                'site_description': 'Your Creative Digital Partner',
-                'contact_email': 'contact@agency.com',
-                'support_email': 'support@agency.com',
-                'primary_color': '#00f5ff',
-                'secondary_color': '#9966ff'
-            }
-        )
-        return settings_obj
+        # There is only one instance, held in process memory
+        return get_site_settings()
 
 
 # =============================================================================
 # AGGREGATED CONTENT VIEWS
 # =============================================================================
 
-class FrontendContentView(APIView):
+class FrontendContentView(ConditionalGetMixin, APIView):
     """Get all frontend content in one request"""
+    conditional_models = (NavigationMenu, SubMenuItem, PageContent, SectionContent, CompanyInfo, SiteSettings, FeatureFlag)
     
     def get(self, request):
         # Get all navigation menus
-        navigation_menus = NavigationMenu.objects.filter(is_active=True).order_by('menu_type', 'order')
+        navigation_menus = eager_load(
+            NavigationMenu.objects.filter(is_active=True).order_by('menu_type', 'order'),
+            NavigationMenuSerializer
+        )
         
         # Get all page contents
-        page_contents = PageContent.objects.filter(is_published=True)
+        page_contents = eager_load(PageContent.objects.filter(is_published=True), PageContentSerializer)
         
         # Get company info
-        company_info, _ = CompanyInfo.objects.get_or_create(id=1)
+        company_info = get_company_info()
         
         # Get site settings
-        site_settings, _ = SiteSettings.objects.get_or_create(id=1)
+        site_settings = get_site_settings()
         
         # Get feature flags
         feature_flags = FeatureFlag.objects.all()
@@ -991,74 +845,45 @@ class FrontendContentView(APIView):
         })
 
 
-class HomePageDataView(APIView):
-    """Get all data needed for homepage"""
+class HomePageDataView(ConditionalGetMixin, APIView):
+    """Get all data needed for homepage (served from the materialized snapshot)"""
+    # The snapshot is already a pre-encoded cache entry with its own invalidation
+    response_cache = False
+    
+    def get_validators(self):
+        # The snapshot version is the validator: no queries and no serialization
+        self.snapshot = get_homepage_snapshot(self.request)
+        return make_etag('homepage', self.snapshot['version']), int(self.snapshot['built_at'])
     
     def get(self, request):
-        # Get hero content
-        try:
-            hero_content = PageContent.objects.get(page_type='home', is_published=True)
-        except PageContent.DoesNotExist:
-            hero_content = None
-        
-        # Get featured projects
-        featured_projects = Project.objects.filter(is_featured=True)[:6]
-        
-        # Get featured testimonials
-        featured_testimonials = Testimonial.objects.filter(is_featured=True)[:6]
-        
-        # Get services
-        services = Service.objects.filter(is_active=True).order_by('order')[:6]
-        
-        # Get featured team members
-        featured_team_members = TeamMember.objects.filter(is_active=True, is_featured=True)[:4]
-        
-        # Get company info
-        company_info, _ = CompanyInfo.objects.get_or_create(id=1)
-        
-        # Calculate stats
-        stats_data = {
-            'total_projects': Project.objects.count(),
-            'total_clients': Testimonial.objects.values('company').distinct().count(),
-            'years_experience': 5,
-            'client_satisfaction': 98.5,
-            'technologies_used': ['React', 'Django', 'Node.js', 'Python', 'JavaScript'],
-            'recent_projects': featured_projects[:3],
-            'featured_testimonials': featured_testimonials[:3]
-        }
-        
-        # Serialize all data
-        data = {
-            'hero_content': PageContentSerializer(hero_content, context={'request': request}).data if hero_content else None,
-            'featured_projects': ProjectSerializer(featured_projects, many=True, context={'request': request}).data,
-            'featured_testimonials': TestimonialSerializer(featured_testimonials, many=True, context={'request': request}).data,
-            'services': ServiceSerializer(services, many=True, context={'request': request}).data,
-            'featured_team_members': TeamMemberListSerializer(featured_team_members, many=True, context={'request': request}).data,
-            'company_info': CompanyInfoSerializer(company_info, context={'request': request}).data,
-            'stats': stats_data
-        }
-        
-        return Response({
-            'success': True,
-            'data': data
-        })
+        snapshot = self.snapshot
+        response = HttpResponse(snapshot_content(snapshot, request), content_type='application/json')
+        response['X-Content-Version'] = str(snapshot['version'])
+        return response
 
 
-class FooterDataView(APIView):
+class FooterDataView(ConditionalGetMixin, APIView):
     """Get footer data"""
+    conditional_models = (CompanyInfo, NavigationMenu, SubMenuItem, BlogPost)
     
     def get(self, request):
         # Get company info
-        company_info, _ = CompanyInfo.objects.get_or_create(id=1)
+        company_info = get_company_info()
         
         # Get footer menus
-        footer_menus = NavigationMenu.objects.filter(menu_type='footer', is_active=True).order_by('order')
+        footer_menus = eager_load(
+            NavigationMenu.objects.filter(menu_type='footer', is_active=True).order_by('order'),
+            NavigationMenuSerializer
+        )
         
         # Get quick links (can be header menu items too)
-        quick_links = NavigationMenu.objects.filter(
-            Q(menu_type='footer') | Q(menu_type='header'),
-            is_active=True
-        ).order_by('order')[:6]
+        quick_links = eager_load(
+            NavigationMenu.objects.filter(
+                Q(menu_type='footer') | Q(menu_type='header'),
+                is_active=True
+            ).order_by('order'),
+            NavigationMenuSerializer
+        )[:6]
         
         # Get recent blog posts
         recent_blog_posts = BlogPost.objects.filter(is_published=True).order_by('-published_at')[:3]
@@ -1077,6 +902,25 @@ class FooterDataView(APIView):
         })
 
 
+# =============================================================================
+# VISITOR ANALYTICS
+# =============================================================================
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AnalyticsBeaconView(View):
+    """
+    Page view beacon sent by the frontend (navigator.sendBeacon).
+    The hit is only buffered in memory; see api/analytics.py.
+    """
+    
+    def post(self, request):
+        payload = analytics.parse_beacon(request.body)
+        if payload is None:
+            return HttpResponse(status=400)
+        analytics.record_beacon(payload, request)
+        return HttpResponse(status=204)
+
+
 # =============================================================================
 # DASHBOARD STATISTICS API
 # =============================================================================
@@ -1086,43 +930,37 @@ def dashboard_statistics_api(request):
     """
     API endpoint for dashboard statistics (for real-time updates)
     """
-    from datetime import datetime, timedelta
-    from django.db.models import Sum, Avg
+    metrics = get_dashboard_metrics()
     
-    # Calculate statistics
-    today = datetime.now().date()
-    last_week = today - timedelta(days=7)
-    last_month = today - timedelta(days=30)
-    
-    # Basic counts
     stats = {
         'overview': {
             'projects': {
-                'total': Project.objects.count(),
-                'featured': Project.objects.filter(is_featured=True).count(),
-                'recent': Project.objects.filter(created_at__gte=datetime.now() - timedelta(days=30)).count()
+                'total': metrics['projects']['total'],
+                'featured': metrics['projects']['featured'],
+                'recent': metrics['projects']['last_30_days'],
+                'top_technologies': technologies.top_technologies(10, with_counts=True)
             },
             'testimonials': {
-                'total': Testimonial.objects.count(),
-                'featured': Testimonial.objects.filter(is_featured=True).count(),
-                'recent': Testimonial.objects.filter(created_at__gte=datetime.now() - timedelta(days=30)).count()
+                'total': metrics['testimonials']['total'],
+                'featured': metrics['testimonials']['featured'],
+                'recent': metrics['testimonials']['last_30_days']
             },
             'messages': {
-                'total': ContactMessage.objects.count(),
-                'new': ContactMessage.objects.filter(status='new').count(),
-                'recent': ContactMessage.objects.filter(created_at__gte=datetime.now() - timedelta(days=7)).count()
+                'total': metrics['messages']['total'],
+                'new': metrics['messages']['new'],
+                'recent': metrics['messages']['last_7_days']
             },
             'content': {
-                'blog_posts': BlogPost.objects.filter(is_published=True).count(),
-                'services': Service.objects.filter(is_active=True).count(),
-                'team_members': TeamMember.objects.filter(is_active=True).count(),
-                'job_positions': JobPosition.objects.filter(is_active=True).count()
+                'blog_posts': metrics['blog_posts']['published'],
+                'services': metrics['services']['active'],
+                'team_members': metrics['team_members']['active'],
+                'job_positions': metrics['jobs']['active']
             }
         },
         'visitor_analytics': get_visitor_analytics(),
-        'content_distribution': get_content_distribution(),
+        'content_distribution': get_content_distribution(metrics),
         'recent_activity': get_recent_activity(),
-        'growth_metrics': get_growth_metrics()
+        'growth_metrics': get_growth_metrics(metrics)
     }
     
     return Response(stats)
@@ -1130,54 +968,42 @@ def dashboard_statistics_api(request):
 
 def get_visitor_analytics():
     """
-    Get visitor analytics data for charts
+    Get visitor analytics data for charts (last 7 days of VisitorStatistics)
     """
-    from datetime import datetime, timedelta
-    import random
-    
-    # Get last 7 days
-    today = datetime.now().date()
+    today = timezone.localdate()
     last_7_days = [(today - timedelta(days=i)) for i in range(6, -1, -1)]
+    rows = {
+        row.date: row for row in VisitorStatistics.objects.filter(date__gte=last_7_days[0], date__lte=today)
+    }
     
-    # Simulate data - generate realistic visitor analytics
-    analytics = {
+    analytics_data = {
         'labels': [day.strftime('%a') for day in last_7_days],
-        'page_views': [],
-        'unique_visitors': [],
-        'mobile_percentage': 65.2,
-        'bounce_rate': 35.8
+        'page_views': [rows[day].page_views if day in rows else 0 for day in last_7_days],
+        'unique_visitors': [rows[day].unique_visitors if day in rows else 0 for day in last_7_days],
     }
     
-    # Generate sample data with realistic patterns
-    for i, day in enumerate(last_7_days):
-        base_views = 1200 + (i * 50)
-        base_visitors = 800 + (i * 30)
-        
-        # Weekend dip
-        weekend_factor = 0.7 if day.weekday() in [5, 6] else 1.0
-        
-        # Add some randomness
-        daily_views = int(base_views * weekend_factor * (0.8 + random.random() * 0.4))
-        daily_visitors = int(base_visitors * weekend_factor * (0.8 + random.random() * 0.4))
-        
-        analytics['page_views'].append(daily_views)
-        analytics['unique_visitors'].append(daily_visitors)
+    device_views = sum(row.mobile_views + row.desktop_views + row.tablet_views for row in rows.values())
+    mobile_views = sum(row.mobile_views for row in rows.values())
+    analytics_data['mobile_percentage'] = round(mobile_views / device_views * 100, 1) if device_views else 0
+    bounce_rates = [row.bounce_rate for row in rows.values() if row.page_views]
+    analytics_data['bounce_rate'] = round(sum(bounce_rates) / len(bounce_rates), 1) if bounce_rates else 0
     
-    return analytics
+    return analytics_data
 
 
-def get_content_distribution():
+def get_content_distribution(metrics=None):
     """
     Get content distribution for pie chart
     """
+    metrics = metrics or get_dashboard_metrics()
     return {
         'labels': ['Projects', 'Blog Posts', 'Services', 'Team Members', 'Testimonials'],
         'data': [
-            Project.objects.count(),
-            BlogPost.objects.filter(is_published=True).count(),
-            Service.objects.filter(is_active=True).count(),
-            TeamMember.objects.filter(is_active=True).count(),
-            Testimonial.objects.count()
+            metrics['projects']['total'],
+            metrics['blog_posts']['published'],
+            metrics['services']['active'],
+            metrics['team_members']['active'],
+            metrics['testimonials']['total']
         ],
         'colors': ['#00f5ff', '#9966ff', '#ff6b6b', '#4ecdc4', '#ffd93d']
     }
@@ -1230,54 +1056,23 @@ def get_recent_activity():
     return activities[:10]
 
 
-def get_growth_metrics():
+def get_growth_metrics(metrics=None):
     """
-    Calculate growth metrics for dashboard
+    Calculate growth metrics for dashboard (last 30 days against the 30 before)
     """
-    from datetime import datetime, timedelta
-    
-    now = datetime.now()
-    last_month = now - timedelta(days=30)
-    previous_month = last_month - timedelta(days=30)
-    
-    # Current period stats
-    current_projects = Project.objects.filter(created_at__gte=last_month).count()
-    current_messages = ContactMessage.objects.filter(created_at__gte=last_month).count()
-    current_testimonials = Testimonial.objects.filter(created_at__gte=last_month).count()
+    metrics = metrics or get_dashboard_metrics()
     
-    # Previous period stats
-    prev_projects = Project.objects.filter(
-        created_at__gte=previous_month,
-        created_at__lt=last_month
-    ).count()
-    prev_messages = ContactMessage.objects.filter(
-        created_at__gte=previous_month,
-        created_at__lt=last_month
-    ).count()
-    prev_testimonials = Testimonial.objects.filter(
-        created_at__gte=previous_month,
-        created_at__lt=last_month
-    ).count()
-    
-    def calculate_growth(current, previous):
-        if previous == 0:
-            return 100 if current > 0 else 0
-        return round(((current - previous) / previous) * 100, 1)
+    def period(group):
+        current = metrics[group]['last_30_days']
+        previous = metrics[group]['previous_30_days']
+        return {
+            'current': current,
+            'previous': previous,
+            'growth': growth(current, previous)
+        }
     
     return {
-        'projects': {
-            'current': current_projects,
-            'previous': prev_projects,
-            'growth': calculate_growth(current_projects, prev_projects)
-        },
-        'messages': {
-            'current': current_messages,
-            'previous': prev_messages,
-            'growth': calculate_growth(current_messages, prev_messages)
-        },
-        'testimonials': {
-            'current': current_testimonials,
-            'previous': prev_testimonials,
-            'growth': calculate_growth(current_testimonials, prev_testimonials)
-        }
+        'projects': period('projects'),
+        'messages': period('messages'),
+        'testimonials': period('testimonials')
     }
\ No newline at end of file
@@ -18,6 +18,7 @@ import SEO from './components/SEO';
 import Breadcrumbs from './components/Breadcrumbs';
 import SEOAuditReport from './components/SEOAuditReport';
 import ScrollToTop from './components/ScrollToTop';
+import PageViewTracker from './components/PageViewTracker';
 
 // Import page components
 import BlogPage from './pages/BlogPage';
@@ -131,6 +132,7 @@ function App() {
     <AuthProvider>
       <Router>
         <ScrollToTop />
+        <PageViewTracker />
         <div className="App">
           <Header3D />
 
@@ -0,0 +1,16 @@
+import { useEffect } from 'react';
+import { useLocation } from 'react-router-dom';
+import { analyticsAPI } from '../services/api';
+
+const PageViewTracker = () => {
+  const { pathname } = useLocation();
+
+  useEffect(() => {
+    // Report every route change to the visitor analytics beacon
+    analyticsAPI.trackPageView(pathname);
+  }, [pathname]);
+
+  return null;
+};
+
+export default PageViewTracker;
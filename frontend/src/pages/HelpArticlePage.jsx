@@ -9,6 +9,7 @@ const HelpArticlePage = () => {
   const [article, setArticle] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [voted, setVoted] = useState(false);
 
   // Sample help articles with full content
   const sampleArticles = {
@@ -162,6 +163,15 @@ const HelpArticlePage = () => {
     }
   };
 
+  const markHelpful = async () => {
+    if (voted) return;
+    setVoted(true);
+    const response = await api.help.markHelpful(slug);
+    if (response.success) {
+      setArticle((current) => ({ ...current, helpful_votes: response.helpful_votes }));
+    }
+  };
+
   if (loading) return <div className="help-article-page"><div className="container"><div className="loading-spinner"><div className="spinner"></div><p>Loading...</p></div></div></div>;
   if (error) return <div className="help-article-page"><div className="container"><div className="error-message"><h2>Article not found</h2><Link to="/help" className="back-btn"><ArrowLeft size={20} />Back to Help Center</Link></div></div></div>;
   if (!article) return null;
@@ -179,7 +189,9 @@ const HelpArticlePage = () => {
           <p className="article-excerpt">{article.excerpt}</p>
           <div className="article-stats">
             <span><Eye size={16} />{article.view_count} views</span>
-            <span><ThumbsUp size={16} />{article.helpful_votes} helpful</span>
+            <button type="button" className="helpful-btn" onClick={markHelpful} disabled={voted}>
+              <ThumbsUp size={16} />{article.helpful_votes} helpful
+            </button>
           </div>
         </motion.header>
 
@@ -197,6 +209,9 @@ const HelpArticlePage = () => {
         .article-excerpt { font-size: 1.2rem; color: #b0b0b0; margin-bottom: 30px; }
         .article-stats { display: flex; justify-content: center; gap: 30px; color: #666; }
         .article-stats span { display: flex; align-items: center; gap: 6px; }
+        .helpful-btn { display: flex; align-items: center; gap: 6px; background: none; border: none; color: inherit; font: inherit; cursor: pointer; }
+        .helpful-btn:hover:not(:disabled) { color: #00f5ff; }
+        .helpful-btn:disabled { cursor: default; color: #00f5ff; }
         .article-content { max-width: 800px; margin: 0 auto; }
         .content-body { line-height: 1.8; font-size: 1.1rem; }
         .content-body h2 { color: #00f5ff; font-size: 2rem; margin: 40px 0 20px; }
@@ -123,6 +123,13 @@ export const helpAPI = {
   getByCategory: async (category) => {
     return apiCall(`/help/category/${category}/`);
   },
+
+  // Vote an article helpful
+  markHelpful: async (slug) => {
+    return apiCall(`/help/${slug}/helpful/`, {
+      method: 'POST',
+    });
+  },
 };
 
 // Case Studies API
@@ -239,6 +246,58 @@ export const meetingAPI = {
   },
 };
 
+// document.referrer keeps the external referrer for the whole SPA visit, so it is
+// only reported with the first page view of the session
+let referrerReported = false;
+
+const takeReferrer = () => {
+  try {
+    if (sessionStorage.getItem('referrerReported')) {
+      referrerReported = true;
+    } else {
+      sessionStorage.setItem('referrerReported', '1');
+    }
+  } catch {
+    // Storage unavailable: remember it for this page load only
+  }
+  if (referrerReported) {
+    return '';
+  }
+  referrerReported = true;
+  return document.referrer;
+};
+
+// Analytics API
+export const analyticsAPI = {
+  // Record a page view; fire-and-forget, never blocks navigation
+  trackPageView: (path) => {
+    // Random id kept in local storage; the backend only folds it into unique-visitor sketches
+    let visitorId = null;
+    try {
+      visitorId = localStorage.getItem('visitorId');
+      if (!visitorId) {
+        visitorId = Math.random().toString(36).slice(2) + Date.now().toString(36);
+        localStorage.setItem('visitorId', visitorId);
+      }
+    } catch {
+      // Storage unavailable (private mode): the backend falls back to address and user agent
+    }
+
+    const body = JSON.stringify({
+      path,
+      url: window.location.href,
+      referrer: takeReferrer(),
+      visitor_id: visitorId,
+    });
+    const url = `${API_BASE_URL}/analytics/beacon/`;
+
+    if (navigator.sendBeacon && navigator.sendBeacon(url, body)) {
+      return;
+    }
+    fetch(url, { method: 'POST', body, keepalive: true }).catch(() => {});
+  },
+};
+
 // Hook for using API data with loading and error states
 export const useAPI = () => {
   const [loading, setLoading] = useState(false);